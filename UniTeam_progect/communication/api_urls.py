@@ -13,6 +13,7 @@ from .api_views import (
     TaskCommentReactionViewSet,
     TaskCommentThreadStateViewSet,
 )
+from .views import event_stream
 
 router = DefaultRouter()
 router.register(r'channels', ChannelViewSet, basename='communication-channel')
@@ -27,5 +28,6 @@ router.register(r'task-comment-reactions', TaskCommentReactionViewSet, basename=
 router.register(r'task-comment-thread-states', TaskCommentThreadStateViewSet, basename='communication-task-comment-thread-state')
 
 urlpatterns = [
+    path('stream/', event_stream, name='communication-event-stream'),
     path('', include(router.urls)),
 ]
@@ -1,19 +1,22 @@
 import re
 from datetime import timedelta
 
-from django.conf import settings
-from django.core.mail import send_mail
 from django.db import transaction
+from django.db.models import Q
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.pagination import CursorPagination
 from rest_framework.parsers import FormParser, JSONParser, MultiPartParser
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
 from projects.models import FileFolder, Project, ProjectFile, ProjectFileVersion, Task, TaskComment, Team, TeamMembership
+from projects.memberships import membership_resolver
+from projects.jobs import enqueue_job
+from projects.notifications import queue_communication_batches, send_notification_emails
 from users.models import CustomUser
 
 from .models import (
@@ -35,7 +38,9 @@ from .models import (
     TaskCommentReaction,
     TaskCommentThreadState,
 )
+from .realtime import direct_message_event_data, message_event_data, publish_event
 from .serializers import (
+    AnnouncementReactionSerializer,
     AnnouncementSerializer,
     ChannelNotificationPreferenceSerializer,
     ChannelSerializer,
@@ -44,23 +49,25 @@ from .serializers import (
     MeetingPollSerializer,
     MeetingResponseSerializer,
     MeetingSlotSerializer,
+    MessageReactionSerializer,
     MessageSerializer,
     NotificationPreferenceSerializer,
     NotificationSerializer,
     TaskCommentReactionSerializer,
     TaskCommentThreadStateSerializer,
 )
+from .sync import sync_params, sync_payload
+from .threads import remove_thread_reply, thread_participant_ids
 
 
 def _membership(project, user):
-    return TeamMembership.objects.filter(team=project.team, user=user).first()
+    return membership_resolver(user).membership(project)
 
 
 def _is_leadership(project, user):
     if user.role == CustomUser.Role.ADMIN:
         return True
-    membership = _membership(project, user)
-    return bool(membership and membership.role in [Team.Role.LEADER, Team.Role.CO_LEADER])
+    return membership_resolver(user).is_leadership(project)
 
 
 def _is_project_owner(project, user):
@@ -75,13 +82,13 @@ def _can_read_project(project, user):
         return True
     if user.role == CustomUser.Role.LECTURER:
         return project.supervisor_id == user.id
-    return TeamMembership.objects.filter(team=project.team, user=user).exists()
+    return membership_resolver(user).is_member(project)
 
 
 def _can_post_project_messages(project, user):
     if user.role in [CustomUser.Role.ADMIN, CustomUser.Role.LECTURER]:
         return False
-    return TeamMembership.objects.filter(team=project.team, user=user).exists()
+    return membership_resolver(user).is_member(project)
 
 
 def _project_members(project):
@@ -89,52 +96,20 @@ def _project_members(project):
 
 
 def _send_email_if_enabled(*, subject, message, recipient_list):
-    if not getattr(settings, 'ENABLE_EMAIL_NOTIFICATIONS', False):
-        return
-    if not recipient_list:
-        return
-    send_mail(
-        subject=subject,
-        message=message,
-        from_email=getattr(settings, 'DEFAULT_FROM_EMAIL', 'noreply@uniteam.local'),
-        recipient_list=recipient_list,
-        fail_silently=True,
-    )
-
-
-def _notification_prefers(user, notification_type):
-    pref = NotificationPreference.objects.filter(user=user, notification_type=notification_type).first()
-    if not pref:
-        return True, False, NotificationPreference.EmailFrequency.DIGEST
-    return pref.in_app_enabled, pref.email_enabled, pref.email_frequency
+    send_notification_emails(subject, message, recipient_list)
 
 
 def _create_notification(*, recipients, notification_type, title, message, project=None, related_type='', related_id=None):
-    rows = []
-    immediate_email_recipients = []
-    for user in recipients:
-        in_app_enabled, email_enabled, email_frequency = _notification_prefers(user, notification_type)
-        if not in_app_enabled and notification_type != Notification.Type.ANNOUNCEMENT:
-            continue
-        rows.append(
-            Notification(
-                recipient=user,
-                type=notification_type,
-                title=title,
-                message_body=message,
-                project=project,
-                related_object_type=related_type,
-                related_object_id=related_id,
-            )
-        )
-        if email_enabled and email_frequency == NotificationPreference.EmailFrequency.IMMEDIATE:
-            immediate_email_recipients.append(user.email)
-    Notification.objects.bulk_create(rows)
-    _send_email_if_enabled(
-        subject=title,
-        message=message,
-        recipient_list=[email for email in immediate_email_recipients if email],
-    )
+    queue_communication_batches([{
+        'recipients': recipients,
+        'notification_type': notification_type,
+        'title': title,
+        'message': message,
+        'project': project,
+        'related_type': related_type,
+        'related_id': related_id,
+        'always_in_app': notification_type == Notification.Type.ANNOUNCEMENT,
+    }])
 
 
 def _extract_mention_tokens(content):
@@ -145,12 +120,12 @@ def _extract_mention_tokens(content):
     return tokens | short_tokens
 
 
-def _resolve_mentions(project, content):
+def _resolve_mentions(project, content, members=None):
     mention_tokens = _extract_mention_tokens(content)
     if not mention_tokens:
         return []
 
-    members = list(_project_members(project))
+    members = list(_project_members(project)) if members is None else members
     resolved = {}
     normalized_index = {}
 
@@ -234,15 +209,78 @@ def _mirror_message_attachment(project, sender, attachment):
         attachment.save(update_fields=['mirrored_project_file'])
 
 
-def _channel_mentions_notification_mode(channel, user):
-    pref = ChannelNotificationPreference.objects.filter(channel=channel, user=user).first()
-    if pref:
-        return pref.mode
+def _channel_default_notification_mode(channel):
     if channel.slug == 'general':
         return ChannelNotificationPreference.Mode.ALL
     return ChannelNotificationPreference.Mode.MENTIONS
 
 
+def _channel_notification_modes(channel, user_ids):
+    """Map user id -> channel notification mode for ``user_ids`` in one query."""
+    modes = dict.fromkeys(user_ids, _channel_default_notification_mode(channel))
+    modes.update(
+        ChannelNotificationPreference.objects.filter(channel=channel, user_id__in=user_ids).values_list('user_id', 'mode')
+    )
+    return modes
+
+
+def _message_notification_batches(message, sender, members):
+    """Notification batches for a new channel message: mentions, thread replies and ALL-mode members."""
+    channel = message.channel
+    project = channel.project
+    related = {'project': project, 'related_type': 'message', 'related_id': message.id}
+    batches = []
+
+    mentioned = [
+        user for user in _resolve_mentions(project, message.content or '', members)
+        if user.id != sender.id and (user.role != CustomUser.Role.LECTURER or project.supervisor_id == user.id)
+    ]
+    batches.append({
+        'recipients': mentioned,
+        'notification_type': Notification.Type.CHANNEL_MENTION,
+        'title': 'You were mentioned',
+        'message': f'{sender.username} mentioned you in #{channel.slug}',
+        **related,
+    })
+
+    if message.parent_message_id:
+        # The post_save hook has already added this reply's sender to the root's participant set.
+        participant_ids = set(thread_participant_ids(message.parent_message_id)) - {sender.id}
+        # Participants include the root's author, but only people who replied hear about new replies.
+        root_sender_id = message.parent_message.sender_id
+        if root_sender_id in participant_ids and not Message.objects.filter(
+            parent_message_id=message.parent_message_id, sender_id=root_sender_id,
+        ).exists():
+            participant_ids.discard(root_sender_id)
+        batches.append({
+            'recipients': list(participant_ids),
+            'notification_type': Notification.Type.CHANNEL_REPLY,
+            'title': 'New thread reply',
+            'message': f'{sender.username} replied in a thread in #{channel.slug}',
+            **related,
+        })
+
+    modes = _channel_notification_modes(channel, [member.id for member in members if member.id != sender.id])
+    batches.append({
+        'recipients': [user_id for user_id, mode in modes.items() if mode == ChannelNotificationPreference.Mode.ALL],
+        'notification_type': Notification.Type.CHANNEL_REPLY,
+        'title': f'New message in #{channel.slug}',
+        'message': (message.content or '')[:140],
+        **related,
+    })
+    return batches
+
+
+def _reactor_page(view, reactions, serializer_class):
+    """One page of the individual reactions behind a reaction summary, optionally for one ``?emoji=``."""
+    emoji = view.request.query_params.get('emoji')
+    if emoji:
+        reactions = reactions.filter(emoji=emoji)
+    reactions = reactions.select_related('user')
+    page = view.paginate_queryset(reactions)
+    return view.get_paginated_response(serializer_class(page, many=True, context=view.get_serializer_context()).data)
+
+
 class ChannelViewSet(viewsets.ModelViewSet):
     serializer_class = ChannelSerializer
     permission_classes = [IsAuthenticated]
@@ -297,7 +335,7 @@ class AnnouncementViewSet(viewsets.ModelViewSet):
     parser_classes = [MultiPartParser, FormParser, JSONParser]
 
     def get_queryset(self):
-        qs = Announcement.objects.select_related('project', 'author').prefetch_related('reactions')
+        qs = Announcement.objects.select_related('project', 'author')
         project_id = self.request.query_params.get('project')
         if project_id:
             qs = qs.filter(project_id=project_id)
@@ -353,6 +391,11 @@ class AnnouncementViewSet(viewsets.ModelViewSet):
             return Response({'removed': True})
         return Response({'created': True})
 
+    @action(detail=True, methods=['get'])
+    def reactions(self, request, pk=None):
+        announcement = self.get_object()
+        return _reactor_page(self, announcement.reactions.all(), AnnouncementReactionSerializer)
+
     @action(detail=True, methods=['post'])
     def convert_to_task(self, request, pk=None):
         announcement = self.get_object()
@@ -376,13 +419,28 @@ class AnnouncementViewSet(viewsets.ModelViewSet):
         return Response({'task_id': task.id}, status=status.HTTP_201_CREATED)
 
 
+class MessageCursorPagination(CursorPagination):
+    """Newest-first keyset pages with no OFFSET scans or COUNT(*).
+
+    ``?parent=`` listings walk message_history_idx; whole-channel listings
+    walk message_channel_created_idx.
+    """
+    ordering = ('-created_at', '-id')
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+
+
 class MessageViewSet(viewsets.ModelViewSet):
     serializer_class = MessageSerializer
     permission_classes = [IsAuthenticated]
     parser_classes = [MultiPartParser, FormParser, JSONParser]
+    pagination_class = MessageCursorPagination
 
     def get_queryset(self):
-        qs = Message.objects.select_related('channel', 'sender', 'parent_message').prefetch_related('attachments', 'reactions', 'task_references')
+        qs = Message.objects.select_related('channel', 'sender', 'parent_message').prefetch_related(
+            'attachments', 'task_references', 'thread_participants'
+        )
         channel_id = self.request.query_params.get('channel')
         project_id = self.request.query_params.get('project')
         parent_id = self.request.query_params.get('parent')
@@ -401,7 +459,7 @@ class MessageViewSet(viewsets.ModelViewSet):
             return qs
         if user.role == CustomUser.Role.LECTURER:
             return qs.filter(channel__project__supervisor=user)
-        return qs.filter(channel__project__team__teammembership__user=user).distinct()
+        return qs.filter(channel__project_id__in=TeamMembership.objects.filter(user=user).values('team__project_id'))
 
     def perform_create(self, serializer):
         channel = serializer.validated_data['channel']
@@ -421,64 +479,32 @@ class MessageViewSet(viewsets.ModelViewSet):
                 file_name=uploaded_file.name,
                 file_size=uploaded_file.size,
             )
-            _mirror_message_attachment(project, self.request.user, attachment)
+            enqueue_job(
+                'communication.mirror_attachment',
+                {'attachment': attachment.id, 'sender': self.request.user.id},
+                idempotency_key=f'mirror-attachment:{attachment.id}',
+            )
 
         task_ids = self.request.data.getlist('task_ids') if hasattr(self.request.data, 'getlist') else self.request.data.get('task_ids', [])
         if isinstance(task_ids, str):
             task_ids = [task_ids]
-        for task_id in task_ids:
-            task = Task.objects.filter(id=task_id, project=project).first()
-            if task:
-                MessageTaskReference.objects.get_or_create(message=message, task=task)
-
-        mentioned_users = _resolve_mentions(project, message.content or '')
-        for user in mentioned_users:
-            if user.id == self.request.user.id:
-                continue
-            if not _can_read_project(project, user):
-                continue
-            _create_notification(
-                recipients=[user],
-                notification_type=Notification.Type.CHANNEL_MENTION,
-                title='You were mentioned',
-                message=f'{self.request.user.username} mentioned you in #{channel.slug}',
-                project=project,
-                related_type='message',
-                related_id=message.id,
-            )
-
-        if message.parent_message_id:
-            participants = CustomUser.objects.filter(
-                channel_messages__channel=channel,
-                channel_messages__parent_message=message.parent_message,
-            ).distinct()
-            participants = [u for u in participants if u.id != self.request.user.id]
-            _create_notification(
-                recipients=participants,
-                notification_type=Notification.Type.CHANNEL_REPLY,
-                title='New thread reply',
-                message=f'{self.request.user.username} replied in a thread in #{channel.slug}',
-                project=project,
-                related_type='message',
-                related_id=message.id,
+        if task_ids:
+            tasks = Task.objects.filter(id__in=task_ids, project=project)
+            MessageTaskReference.objects.bulk_create(
+                [MessageTaskReference(message=message, task=task) for task in tasks],
+                ignore_conflicts=True,
             )
 
-        recipients = []
-        for member in _project_members(project):
-            if member.id == self.request.user.id:
-                continue
-            mode = _channel_mentions_notification_mode(channel, member)
-            if mode == ChannelNotificationPreference.Mode.ALL:
-                recipients.append(member)
-        _create_notification(
-            recipients=recipients,
-            notification_type=Notification.Type.CHANNEL_REPLY,
-            title=f'New message in #{channel.slug}',
-            message=(message.content or '')[:140],
-            project=project,
-            related_type='message',
-            related_id=message.id,
+        enqueue_job(
+            'communication.message_fanout',
+            {'message': message.id, 'sender': self.request.user.id},
+            idempotency_key=f'message-fanout:{message.id}',
         )
+        # Supervising lecturers can read every channel, so they get the push as well.
+        recipient_ids = set(_project_members(project).values_list('id', flat=True))
+        if project.supervisor_id:
+            recipient_ids.add(project.supervisor_id)
+        publish_event(list(recipient_ids), 'message.created', message_event_data(message))
 
     def perform_update(self, serializer):
         message = self.get_object()
@@ -490,12 +516,40 @@ class MessageViewSet(viewsets.ModelViewSet):
         message = self.get_object()
         if message.sender_id != request.user.id and not _is_leadership(message.channel.project, request.user):
             raise PermissionDenied('You do not have permission to delete this message')
+        was_deleted = message.is_deleted
         message.is_deleted = True
         message.content = 'This message was deleted.'
         message.deleted_at = timezone.now()
-        message.save(update_fields=['is_deleted', 'content', 'deleted_at'])
+        with transaction.atomic():
+            message.save(update_fields=['is_deleted', 'content', 'deleted_at', 'updated_at'])
+            if not was_deleted:
+                remove_thread_reply(message)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
+    @action(detail=False, methods=['get'])
+    def sync(self, request):
+        channel_id = request.query_params.get('channel')
+        if not channel_id:
+            raise ValidationError({'channel': 'channel is required.'})
+        channel = get_object_or_404(Channel.objects.select_related('project'), id=channel_id)
+        if not _can_read_project(channel.project, request.user):
+            raise PermissionDenied('You cannot read this channel')
+
+        after_id, since = sync_params(request.query_params)
+        messages = (
+            Message.objects.filter(channel=channel)
+            .select_related('channel', 'sender', 'parent_message')
+            .prefetch_related('attachments', 'task_references', 'thread_participants')
+        )
+        context = self.get_serializer_context()
+        return Response(sync_payload(
+            messages,
+            lambda messages: MessageSerializer(messages, many=True, context=context).data,
+            after_id,
+            since,
+            changed_field='updated_at',
+        ))
+
     @action(detail=True, methods=['post'])
     def react(self, request, pk=None):
         message = self.get_object()
@@ -523,6 +577,11 @@ class MessageViewSet(viewsets.ModelViewSet):
         )
         return Response({'created': True})
 
+    @action(detail=True, methods=['get'])
+    def reactions(self, request, pk=None):
+        message = self.get_object()
+        return _reactor_page(self, message.reactions.all(), MessageReactionSerializer)
+
 
 class DirectMessageViewSet(viewsets.ModelViewSet):
     serializer_class = DirectMessageSerializer
@@ -534,15 +593,44 @@ class DirectMessageViewSet(viewsets.ModelViewSet):
         with_user = self.request.query_params.get('with_user')
 
         user = self.request.user
-        qs = qs.filter(project__team__teammembership__user=user)
+        qs = qs.filter(project_id__in=TeamMembership.objects.filter(user=user).values('team__project_id'))
         if project_id:
             qs = qs.filter(project_id=project_id)
         if with_user:
             qs = qs.filter(sender_id__in=[user.id, with_user], recipient_id__in=[user.id, with_user])
         else:
-            qs = qs.filter(sender=user) | qs.filter(recipient=user)
+            qs = qs.filter(Q(sender=user) | Q(recipient=user))
         return qs.order_by('created_at')
 
+    def perform_update(self, serializer):
+        if 'content' not in serializer.validated_data:
+            serializer.save()
+            return
+        if serializer.instance.sender_id != self.request.user.id:
+            raise PermissionDenied('Direct messages can only be edited by their sender')
+        serializer.save(edited_at=timezone.now())
+
+    def destroy(self, request, *args, **kwargs):
+        message = self.get_object()
+        message.is_deleted = True
+        message.content = 'This message was deleted.'
+        message.deleted_at = timezone.now()
+        message.save(update_fields=['is_deleted', 'content', 'deleted_at', 'updated_at'])
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @action(detail=False, methods=['get'])
+    def sync(self, request):
+        after_id, since = sync_params(request.query_params)
+        messages = self.get_queryset()
+        context = self.get_serializer_context()
+        return Response(sync_payload(
+            messages,
+            lambda messages: DirectMessageSerializer(messages, many=True, context=context).data,
+            after_id,
+            since,
+            changed_field='updated_at',
+        ))
+
     def perform_create(self, serializer):
         project = serializer.validated_data['project']
         recipient = serializer.validated_data['recipient']
@@ -550,12 +638,13 @@ class DirectMessageViewSet(viewsets.ModelViewSet):
         if self.request.user.role == CustomUser.Role.LECTURER or recipient.role == CustomUser.Role.LECTURER:
             raise PermissionDenied('Direct messages are only available for student project members')
 
-        if not TeamMembership.objects.filter(team=project.team, user=self.request.user).exists():
+        if not membership_resolver(self.request.user).is_member(project):
             raise PermissionDenied('You are not a member of this project')
         if not TeamMembership.objects.filter(team=project.team, user=recipient).exists():
             raise PermissionDenied('Recipient is not a member of this project')
 
         message = serializer.save(sender=self.request.user)
+        publish_event([self.request.user.id, recipient.id], 'direct_message.created', direct_message_event_data(message))
         _create_notification(
             recipients=[recipient],
             notification_type=Notification.Type.DIRECT_MESSAGE,
@@ -641,7 +730,7 @@ class MeetingPollViewSet(viewsets.ModelViewSet):
         slot.confirmed = True
         slot.save(update_fields=['confirmed'])
         poll.confirmed_slot = slot
-        poll.save(update_fields=['confirmed_slot'])
+        poll.save(update_fields=['confirmed_slot', 'updated_at'])
 
         _create_notification(
             recipients=[u for u in _project_members(poll.project) if u.id != request.user.id],
@@ -678,6 +767,16 @@ class CommunicationNotificationViewSet(viewsets.ModelViewSet):
         self.get_queryset().filter(is_read=False).update(is_read=True)
         return Response({'message': 'All notifications marked as read'})
 
+    @action(detail=False, methods=['get'])
+    def sync(self, request):
+        after_id, _ = sync_params(request.query_params)
+        context = self.get_serializer_context()
+        return Response(sync_payload(
+            self.get_queryset(),
+            lambda notifications: NotificationSerializer(notifications, many=True, context=context).data,
+            after_id,
+        ))
+
 
 class NotificationPreferenceViewSet(viewsets.ModelViewSet):
     serializer_class = NotificationPreferenceSerializer
@@ -6,4 +6,4 @@ class CommunicationConfig(AppConfig):
     name = 'communication'
 
     def ready(self):
-        from . import signals  # noqa: F401
+        from . import side_effects, signals  # noqa: F401
@@ -0,0 +1,96 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from communication.api_views import MessageViewSet
+from communication.models import Channel, ChannelNotificationPreference, Message
+from projects.models import Project, Team, TeamMembership
+from users.models import CustomUser
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Post messages into a throwaway channel and report database queries per message. Nothing is kept.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--messages', type=int, default=1000, help='Number of messages to post.')
+        parser.add_argument('--members', type=int, default=30, help='Team size of the benchmark project.')
+
+    def _setup(self, member_count):
+        stamp = timezone.now().strftime('%Y%m%d%H%M%S%f')
+        users = [
+            CustomUser.objects.create_user(
+                username=f'fanout-bench-{stamp}-{index}',
+                email=f'fanout-bench-{index}@uniteam.local',
+                password=None,
+                role=CustomUser.Role.STUDENT,
+            )
+            for index in range(member_count)
+        ]
+        project = Project.objects.create(
+            title='Fan-out benchmark',
+            description='Temporary project for benchmark_message_fanout',
+            deadline=timezone.localdate() + timedelta(days=30),
+        )
+        team = Team.objects.create(project=project)
+        TeamMembership.objects.bulk_create([
+            TeamMembership(user=user, team=team, role=Team.Role.LEADER if index == 0 else Team.Role.MEMBER)
+            for index, user in enumerate(users)
+        ])
+        channel = Channel.objects.get(project=project, slug='general')
+        # A third of the team narrows the channel to mentions so both preference paths are exercised.
+        ChannelNotificationPreference.objects.bulk_create([
+            ChannelNotificationPreference(user=user, channel=channel, mode=ChannelNotificationPreference.Mode.MENTIONS)
+            for user in users[::3]
+        ])
+        return users, channel
+
+    def handle(self, *args, **options):
+        message_count = options['messages']
+        member_count = options['members']
+        if message_count < 1 or member_count < 2:
+            raise CommandError('--messages must be at least 1 and --members at least 2.')
+
+        factory = APIRequestFactory()
+        view = MessageViewSet.as_view({'post': 'create'})
+        query_counts = []
+        started = time.perf_counter()
+        try:
+            with transaction.atomic():
+                users, channel = self._setup(member_count)
+                root = None
+                for index in range(message_count):
+                    sender = users[index % member_count]
+                    mentioned = users[(index + 1) % member_count]
+                    payload = {'channel': channel.id, 'content': f'Update {index} for @{mentioned.username}'}
+                    if root and index % 4 == 0:
+                        payload['parent_message'] = root.id
+                    request = factory.post('/api/communication/channel-messages/', payload, format='json')
+                    force_authenticate(request, user=sender)
+                    with CaptureQueriesContext(connection) as queries:
+                        response = view(request)
+                    if response.status_code != 201:
+                        raise CommandError(f'Posting message {index} failed with {response.status_code}: {response.data}')
+                    query_counts.append(len(queries.captured_queries))
+                    if root is None:
+                        root = Message.objects.get(id=response.data['id'])
+                raise _Rollback
+        except _Rollback:
+            pass
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Posted {message_count} messages to a {member_count}-member channel in {elapsed:.2f}s. '
+                f'Queries per message: avg {sum(query_counts) / len(query_counts):.1f}, '
+                f'min {min(query_counts)}, max {max(query_counts)}.'
+            )
+        )
@@ -1,62 +1,23 @@
 from datetime import timedelta
 
-from django.conf import settings
-from django.core.management.base import BaseCommand
-from django.core.mail import send_mail
-from django.utils import timezone
+from django.core.management.base import BaseCommand, CommandError
 
-from communication.models import MeetingSlot, Notification
-from users.models import CustomUser
+from communication.reminders import MEETING_REMINDER_CATCH_UP, MEETING_REMINDER_LEAD, send_due_meeting_reminders
 
 
 class Command(BaseCommand):
-    help = 'Send meeting reminder notifications 1 hour before confirmed meeting slot.'
+    help = 'Send meeting reminder notifications for confirmed meeting slots starting within the lead time.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lead-minutes', type=int, default=int(MEETING_REMINDER_LEAD.total_seconds() // 60), help='Remind this many minutes before a slot starts.')
+        parser.add_argument('--catch-up-minutes', type=int, default=int(MEETING_REMINDER_CATCH_UP.total_seconds() // 60), help='Still remind slots that started up to this many minutes ago.')
 
     def handle(self, *args, **options):
-        now = timezone.now()
-        window_end = now + timedelta(hours=1)
+        if options['lead_minutes'] < 1 or options['catch_up_minutes'] < 0:
+            raise CommandError('--lead-minutes must be positive and --catch-up-minutes cannot be negative.')
 
-        slots = MeetingSlot.objects.select_related('poll', 'poll__project').filter(
-            confirmed=True,
-            reminder_sent_at__isnull=True,
-            start_datetime__gt=now,
-            start_datetime__lte=window_end,
+        sent = send_due_meeting_reminders(
+            lead=timedelta(minutes=options['lead_minutes']),
+            catch_up=timedelta(minutes=options['catch_up_minutes']),
         )
-
-        sent = 0
-        for slot in slots:
-            project = slot.poll.project
-            members = CustomUser.objects.filter(teammembership__team=project.team).distinct()
-            notifications = []
-            emails = []
-            for user in members:
-                notifications.append(
-                    Notification(
-                        recipient=user,
-                        type=Notification.Type.MEETING_REMINDER,
-                        title=f'Meeting starts in 1 hour: {slot.poll.title}',
-                        message_body=f'{slot.poll.title} starts at {slot.start_datetime}.',
-                        project=project,
-                        related_object_type='meeting_poll',
-                        related_object_id=slot.poll_id,
-                    )
-                )
-                if user.email:
-                    emails.append(user.email)
-
-            Notification.objects.bulk_create(notifications)
-
-            if getattr(settings, 'ENABLE_EMAIL_NOTIFICATIONS', False) and emails:
-                send_mail(
-                    subject=f'[UniTeam] Meeting reminder: {slot.poll.title}',
-                    message=f'{slot.poll.title} starts in 1 hour at {slot.start_datetime}.',
-                    from_email=getattr(settings, 'DEFAULT_FROM_EMAIL', 'noreply@uniteam.local'),
-                    recipient_list=emails,
-                    fail_silently=True,
-                )
-
-            slot.reminder_sent_at = now
-            slot.save(update_fields=['reminder_sent_at'])
-            sent += 1
-
         self.stdout.write(self.style.SUCCESS(f'Sent reminders for {sent} meeting slot(s).'))
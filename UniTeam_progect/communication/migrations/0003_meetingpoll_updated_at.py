@@ -0,0 +1,20 @@
+# Generated by Django 5.2.5 on 2026-10-17 18:05
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('communication', '0002_meetingslot_reminder_sent_at_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='meetingpoll',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+    ]
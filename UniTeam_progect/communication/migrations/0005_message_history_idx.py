@@ -0,0 +1,17 @@
+# Generated by Django 5.2.5 on 2026-10-17 19:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('communication', '0004_message_sync_fields_and_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['channel', 'parent_message', 'created_at', 'id'], name='message_history_idx'),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.5 on 2026-10-17 20:15
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_thread_summaries(apps, schema_editor):
+    Message = apps.get_model('communication', 'Message')
+    ThreadParticipant = Message.thread_participants.through
+    replies = Message.objects.filter(parent_message__isnull=False, is_deleted=False).order_by()
+
+    summaries = replies.values('parent_message_id').annotate(replies=models.Count('id'), latest=models.Max('created_at'))
+    roots = Message.objects.in_bulk([row['parent_message_id'] for row in summaries])
+    for row in summaries:
+        root = roots[row['parent_message_id']]
+        root.reply_count = row['replies']
+        root.last_reply_at = row['latest']
+    Message.objects.bulk_update(roots.values(), ['reply_count', 'last_reply_at'], batch_size=500)
+
+    participants = set(replies.values_list('parent_message_id', 'sender_id').distinct())
+    participants |= {(root.id, root.sender_id) for root in roots.values()}
+    ThreadParticipant.objects.bulk_create(
+        [
+            ThreadParticipant(message_id=root_id, customuser_id=user_id)
+            for root_id, user_id in participants
+            if user_id is not None
+        ],
+        batch_size=500,
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('communication', '0005_message_history_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='message',
+            name='reply_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='message',
+            name='last_reply_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='message',
+            name='thread_participants',
+            field=models.ManyToManyField(blank=True, related_name='participating_threads', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.RunPython(backfill_thread_summaries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.5 on 2026-10-17 22:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('communication', '0006_message_thread_summary'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='meetingslot',
+            index=models.Index(fields=['confirmed', 'reminder_sent_at', 'start_datetime'], name='meeting_slot_reminder_idx'),
+        ),
+    ]
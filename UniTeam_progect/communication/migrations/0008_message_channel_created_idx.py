@@ -0,0 +1,17 @@
+# Generated by Django 5.2.5 on 2026-10-17 23:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('communication', '0007_meetingslot_reminder_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['channel', 'created_at', 'id'], name='message_channel_created_idx'),
+        ),
+    ]
@@ -88,9 +88,20 @@ class Message(models.Model):
 	edited_at = models.DateTimeField(null=True, blank=True)
 	is_deleted = models.BooleanField(default=False)
 	deleted_at = models.DateTimeField(null=True, blank=True)
+	updated_at = models.DateTimeField(auto_now=True)
+	# Thread summary kept on root messages by communication.threads.
+	reply_count = models.PositiveIntegerField(default=0)
+	last_reply_at = models.DateTimeField(null=True, blank=True)
+	thread_participants = models.ManyToManyField(settings.AUTH_USER_MODEL, blank=True, related_name='participating_threads')
 
 	class Meta:
 		ordering = ['created_at']
+		indexes = [
+			models.Index(fields=['channel', 'id'], name='message_channel_id_idx'),
+			models.Index(fields=['channel', 'updated_at'], name='message_channel_updated_idx'),
+			models.Index(fields=['channel', 'parent_message', 'created_at', 'id'], name='message_history_idx'),
+			models.Index(fields=['channel', 'created_at', 'id'], name='message_channel_created_idx'),
+		]
 
 	def can_edit(self, user):
 		if user.id != self.sender_id:
@@ -161,9 +172,17 @@ class DirectMessage(models.Model):
 	edited_at = models.DateTimeField(null=True, blank=True)
 	is_read = models.BooleanField(default=False)
 	is_deleted = models.BooleanField(default=False)
+	deleted_at = models.DateTimeField(null=True, blank=True)
+	updated_at = models.DateTimeField(auto_now=True)
 
 	class Meta:
 		ordering = ['created_at']
+		indexes = [
+			models.Index(fields=['recipient', 'id'], name='dm_recipient_id_idx'),
+			models.Index(fields=['sender', 'id'], name='dm_sender_id_idx'),
+			models.Index(fields=['recipient', 'updated_at'], name='dm_recipient_updated_idx'),
+			models.Index(fields=['sender', 'updated_at'], name='dm_sender_updated_idx'),
+		]
 
 
 class MeetingPoll(models.Model):
@@ -180,6 +199,7 @@ class MeetingPoll(models.Model):
 	response_deadline = models.DateTimeField()
 	confirmed_slot = models.ForeignKey('MeetingSlot', on_delete=models.SET_NULL, null=True, blank=True, related_name='confirmed_for_polls')
 	created_at = models.DateTimeField(auto_now_add=True)
+	updated_at = models.DateTimeField(auto_now=True)
 
 	class Meta:
 		ordering = ['-created_at']
@@ -194,6 +214,9 @@ class MeetingSlot(models.Model):
 
 	class Meta:
 		ordering = ['start_datetime']
+		indexes = [
+			models.Index(fields=['confirmed', 'reminder_sent_at', 'start_datetime'], name='meeting_slot_reminder_idx'),
+		]
 
 
 class MeetingResponse(models.Model):
@@ -246,6 +269,9 @@ class Notification(models.Model):
 
 	class Meta:
 		ordering = ['-created_at']
+		indexes = [
+			models.Index(fields=['recipient', 'id'], name='comm_notif_recipient_id_idx'),
+		]
 
 
 class NotificationPreference(models.Model):
@@ -0,0 +1,171 @@
+import asyncio
+import json
+import threading
+from contextlib import asynccontextmanager
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.signals import setting_changed
+from django.db import transaction
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+
+SUBSCRIBER_QUEUE_SIZE = 100
+
+
+class InProcessBroker:
+    """Delivers events to subscribers connected to this process.
+
+    ``publish`` may be called from any thread; each subscriber owns a bounded
+    asyncio queue on its event loop. A subscriber that falls behind loses its
+    oldest events and is expected to catch up through the REST endpoints.
+    """
+
+    def __init__(self, queue_size=SUBSCRIBER_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._lock = threading.Lock()
+        self._subscribers = {}
+
+    @staticmethod
+    def _offer(queue, event):
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(event)
+
+    def publish(self, user_ids, event):
+        with self._lock:
+            targets = [subscriber for user_id in user_ids for subscriber in self._subscribers.get(user_id, ())]
+        for loop, queue in targets:
+            try:
+                loop.call_soon_threadsafe(self._offer, queue, event)
+            except RuntimeError:
+                # The subscriber's loop closed between lookup and delivery.
+                pass
+
+    @asynccontextmanager
+    async def subscription(self, user_id):
+        subscriber = (asyncio.get_running_loop(), asyncio.Queue(maxsize=self.queue_size))
+        with self._lock:
+            self._subscribers.setdefault(user_id, set()).add(subscriber)
+        try:
+            yield subscriber[1].get
+        finally:
+            with self._lock:
+                subscribers = self._subscribers.get(user_id, set())
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    self._subscribers.pop(user_id, None)
+
+
+class RedisBroker:
+    """Publishes events on per-user channels of a Redis-compatible server.
+
+    Needs the optional ``redis`` package; every ASGI process subscribed to
+    the same server receives the events.
+    """
+
+    def __init__(self, url, prefix='uniteam:events'):
+        try:
+            import redis
+            import redis.asyncio
+        except ImportError:
+            raise ImproperlyConfigured('RedisBroker requires the "redis" package.')
+        self.url = url
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url)
+        self._async_redis = redis.asyncio
+
+    def _channel(self, user_id):
+        return f'{self.prefix}:{user_id}'
+
+    def publish(self, user_ids, event):
+        payload = json.dumps(event)
+        with self._client.pipeline(transaction=False) as pipe:
+            for user_id in user_ids:
+                pipe.publish(self._channel(user_id), payload)
+            pipe.execute()
+
+    @asynccontextmanager
+    async def subscription(self, user_id):
+        client = self._async_redis.Redis.from_url(self.url)
+        pubsub = client.pubsub(ignore_subscribe_messages=True)
+        await pubsub.subscribe(self._channel(user_id))
+
+        async def next_event():
+            while True:
+                message = await pubsub.get_message(timeout=None)
+                if message and message['type'] == 'message':
+                    return json.loads(message['data'])
+
+        try:
+            yield next_event
+        finally:
+            await pubsub.unsubscribe()
+            await pubsub.aclose()
+            await client.aclose()
+
+
+_broker = None
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        config = settings.REALTIME_BROKER
+        _broker = import_string(config['BACKEND'])(**config.get('OPTIONS', {}))
+    return _broker
+
+
+@receiver(setting_changed)
+def _reset_broker(setting, **kwargs):
+    global _broker
+    if setting == 'REALTIME_BROKER':
+        _broker = None
+
+
+def publish_event(user_ids, event_type, data):
+    """Push ``data`` to ``user_ids`` once the current transaction commits."""
+    user_ids = list(dict.fromkeys(user_id for user_id in user_ids if user_id))
+    if not user_ids:
+        return
+    event = {'event': event_type, 'data': json.dumps(data, cls=DjangoJSONEncoder)}
+    transaction.on_commit(lambda: get_broker().publish(user_ids, event))
+
+
+def message_event_data(message):
+    return {
+        'id': message.id,
+        'channel': message.channel_id,
+        'project': message.channel.project_id,
+        'sender': message.sender_id,
+        'parent_message': message.parent_message_id,
+        'content': message.content,
+        'created_at': message.created_at,
+    }
+
+
+def direct_message_event_data(message):
+    return {
+        'id': message.id,
+        'project': message.project_id,
+        'sender': message.sender_id,
+        'recipient': message.recipient_id,
+        'content': message.content,
+        'created_at': message.created_at,
+    }
+
+
+def publish_notifications(notifications, source, message_field):
+    """Push each freshly created notification row to its recipient."""
+    for notification in notifications:
+        publish_event([notification.recipient_id], 'notification.created', {
+            'id': notification.id,
+            'source': source,
+            'type': notification.type,
+            'title': notification.title,
+            'message': getattr(notification, message_field),
+            'project': notification.project_id,
+            'created_at': notification.created_at,
+        })
@@ -0,0 +1,89 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from projects.models import TeamMembership
+from projects.notifications import send_notification_email_batch
+
+from .models import MeetingSlot, Notification
+from .realtime import publish_notifications
+
+
+MEETING_REMINDER_LEAD = timedelta(hours=1)
+MEETING_REMINDER_CATCH_UP = timedelta(minutes=15)
+
+
+def _project_members(project_ids):
+    """Map project id -> {user id: email} for every team member of ``project_ids`` in one query."""
+    members = defaultdict(dict)
+    rows = TeamMembership.objects.filter(team__project_id__in=project_ids).values_list('team__project_id', 'user_id', 'user__email')
+    for project_id, user_id, email in rows:
+        members[project_id][user_id] = email
+    return members
+
+
+def _starts_in(slot, now):
+    minutes = round((slot.start_datetime - now).total_seconds() / 60)
+    if minutes <= 0:
+        return 'has started'
+    if minutes == 60:
+        return 'starts in 1 hour'
+    return f'starts in {minutes} minute{"s" if minutes != 1 else ""}'
+
+
+def send_due_meeting_reminders(now=None, *, lead=MEETING_REMINDER_LEAD, catch_up=MEETING_REMINDER_CATCH_UP):
+    """Remind project members of every confirmed slot starting within ``lead`` in one pass.
+
+    Slots that started less than ``catch_up`` ago still get their reminder,
+    so a missed run does not drop it. Members of all due projects are loaded
+    with one query, notifications and emails are inserted once across slots
+    and ``reminder_sent_at`` is set with one UPDATE. Returns the number of
+    slots reminded.
+    """
+    now = now or timezone.now()
+    with transaction.atomic():
+        slots = list(
+            MeetingSlot.objects.select_for_update(skip_locked=True, of=('self',))
+            .select_related('poll')
+            .filter(
+                confirmed=True,
+                reminder_sent_at__isnull=True,
+                start_datetime__gt=now - catch_up,
+                start_datetime__lte=now + lead,
+            )
+        )
+        if not slots:
+            return 0
+
+        members = _project_members({slot.poll.project_id for slot in slots})
+        rows = []
+        emails = []
+        for slot in slots:
+            poll = slot.poll
+            starts_in = _starts_in(slot, now)
+            recipients = members.get(poll.project_id, {})
+            rows.extend(
+                Notification(
+                    recipient_id=user_id,
+                    type=Notification.Type.MEETING_REMINDER,
+                    title=f'Meeting {starts_in}: {poll.title}',
+                    message_body=f'{poll.title} starts at {slot.start_datetime}.',
+                    project_id=poll.project_id,
+                    related_object_type='meeting_poll',
+                    related_object_id=poll.id,
+                )
+                for user_id in recipients
+            )
+            emails.append((
+                f'[UniTeam] Meeting reminder: {poll.title}',
+                f'{poll.title} {starts_in} at {slot.start_datetime}.',
+                list(recipients.values()),
+            ))
+
+        notifications = Notification.objects.bulk_create(rows)
+        send_notification_email_batch(emails)
+        MeetingSlot.objects.filter(id__in=[slot.id for slot in slots]).update(reminder_sent_at=now)
+    publish_notifications(notifications, 'communication', 'message_body')
+    return len(slots)
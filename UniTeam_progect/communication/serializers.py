@@ -1,8 +1,10 @@
+from django.db.models import Count, Q
+from django.db.models.manager import BaseManager
 from django.utils import timezone
 from rest_framework import serializers
 
 from users.models import CustomUser
-from users.serializers import UserSerializer
+from users.serializers import UserSummarySerializer
 
 from .models import (
     Announcement,
@@ -26,7 +28,7 @@ from .models import (
 
 
 class ChannelSerializer(serializers.ModelSerializer):
-    created_by = UserSerializer(read_only=True)
+    created_by = UserSummarySerializer(read_only=True)
 
     class Meta:
         model = Channel
@@ -34,8 +36,54 @@ class ChannelSerializer(serializers.ModelSerializer):
         read_only_fields = ('slug', 'created_by', 'created_at', 'is_default', 'deleted_at', 'archived_until')
 
 
+def reaction_summaries(reaction_model, target_field, target_ids, user):
+    """Grouped ``{emoji, count, reacted_by_me}`` rows for each target id, from one GROUP BY query."""
+    summaries = {target_id: [] for target_id in target_ids}
+    if not summaries:
+        return summaries
+    target_key = f'{target_field}_id'
+    rows = (
+        reaction_model.objects.filter(**{f'{target_key}__in': list(summaries)})
+        .order_by()
+        .values(target_key, 'emoji')
+        .annotate(count=Count('id'), mine=Count('id', filter=Q(user_id=getattr(user, 'id', None))))
+        .order_by(target_key, '-count', 'emoji')
+    )
+    for row in rows:
+        summaries[row[target_key]].append({'emoji': row['emoji'], 'count': row['count'], 'reacted_by_me': row['mine'] > 0})
+    return summaries
+
+
+class ReactionSummaryListSerializer(serializers.ListSerializer):
+    """Summarizes the reactions of every item in the list before serializing it."""
+
+    def to_representation(self, data):
+        items = list(data.all() if isinstance(data, BaseManager) else data)
+        self.child.reaction_summaries = self.child.summarize_reactions([item.id for item in items])
+        return super().to_representation(items)
+
+
+class ReactionSummaryMixin(serializers.Serializer):
+    """``reactions`` as grouped emoji counts; the reactors themselves are listed by the ``reactions`` action."""
+
+    reaction_model = None
+    reaction_target_field = None
+
+    reactions = serializers.SerializerMethodField()
+
+    def summarize_reactions(self, target_ids):
+        request = self.context.get('request')
+        return reaction_summaries(self.reaction_model, self.reaction_target_field, target_ids, getattr(request, 'user', None))
+
+    def get_reactions(self, obj):
+        summaries = getattr(self, 'reaction_summaries', None)
+        if summaries is None or obj.id not in summaries:
+            summaries = self.summarize_reactions([obj.id])
+        return summaries[obj.id]
+
+
 class AnnouncementReactionSerializer(serializers.ModelSerializer):
-    user = UserSerializer(read_only=True)
+    user = UserSummarySerializer(read_only=True)
 
     class Meta:
         model = AnnouncementReaction
@@ -43,12 +91,15 @@ class AnnouncementReactionSerializer(serializers.ModelSerializer):
         read_only_fields = ('user', 'created_at')
 
 
-class AnnouncementSerializer(serializers.ModelSerializer):
-    author = UserSerializer(read_only=True)
-    reactions = AnnouncementReactionSerializer(many=True, read_only=True)
+class AnnouncementSerializer(ReactionSummaryMixin, serializers.ModelSerializer):
+    reaction_model = AnnouncementReaction
+    reaction_target_field = 'announcement'
+
+    author = UserSummarySerializer(read_only=True)
 
     class Meta:
         model = Announcement
+        list_serializer_class = ReactionSummaryListSerializer
         fields = '__all__'
         read_only_fields = ('author', 'created_at')
 
@@ -61,7 +112,7 @@ class MessageAttachmentSerializer(serializers.ModelSerializer):
 
 
 class MessageReactionSerializer(serializers.ModelSerializer):
-    user = UserSerializer(read_only=True)
+    user = UserSummarySerializer(read_only=True)
 
     class Meta:
         model = MessageReaction
@@ -75,21 +126,27 @@ class MessageTaskReferenceSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 
-class MessageSerializer(serializers.ModelSerializer):
-    sender = UserSerializer(read_only=True)
+class MessageSerializer(ReactionSummaryMixin, serializers.ModelSerializer):
+    reaction_model = MessageReaction
+    reaction_target_field = 'message'
+
+    sender = UserSummarySerializer(read_only=True)
     attachments = MessageAttachmentSerializer(many=True, read_only=True)
-    reactions = MessageReactionSerializer(many=True, read_only=True)
     task_references = MessageTaskReferenceSerializer(many=True, read_only=True)
 
     class Meta:
         model = Message
+        list_serializer_class = ReactionSummaryListSerializer
         fields = '__all__'
-        read_only_fields = ('sender', 'created_at', 'edited_at', 'deleted_at')
+        read_only_fields = (
+            'sender', 'created_at', 'edited_at', 'deleted_at',
+            'reply_count', 'last_reply_at', 'thread_participants',
+        )
 
 
 class DirectMessageSerializer(serializers.ModelSerializer):
-    sender = UserSerializer(read_only=True)
-    recipient = UserSerializer(read_only=True)
+    sender = UserSummarySerializer(read_only=True)
+    recipient = UserSummarySerializer(read_only=True)
     recipient_id = serializers.PrimaryKeyRelatedField(
         source='recipient',
         queryset=CustomUser.objects.all(),
@@ -121,7 +178,7 @@ class MeetingSlotSerializer(serializers.ModelSerializer):
 
 
 class MeetingResponseSerializer(serializers.ModelSerializer):
-    user = UserSerializer(read_only=True)
+    user = UserSummarySerializer(read_only=True)
 
     class Meta:
         model = MeetingResponse
@@ -130,7 +187,7 @@ class MeetingResponseSerializer(serializers.ModelSerializer):
 
 
 class MeetingNotesSerializer(serializers.ModelSerializer):
-    author = UserSerializer(read_only=True)
+    author = UserSummarySerializer(read_only=True)
 
     class Meta:
         model = MeetingNotes
@@ -139,7 +196,7 @@ class MeetingNotesSerializer(serializers.ModelSerializer):
 
 
 class MeetingPollSerializer(serializers.ModelSerializer):
-    created_by = UserSerializer(read_only=True)
+    created_by = UserSummarySerializer(read_only=True)
     slots = MeetingSlotSerializer(many=True, read_only=True)
     responses = MeetingResponseSerializer(many=True, read_only=True)
     notes = MeetingNotesSerializer(many=True, read_only=True)
@@ -172,7 +229,7 @@ class ChannelNotificationPreferenceSerializer(serializers.ModelSerializer):
 
 
 class TaskCommentReactionSerializer(serializers.ModelSerializer):
-    user = UserSerializer(read_only=True)
+    user = UserSummarySerializer(read_only=True)
 
     class Meta:
         model = TaskCommentReaction
@@ -181,7 +238,7 @@ class TaskCommentReactionSerializer(serializers.ModelSerializer):
 
 
 class TaskCommentThreadStateSerializer(serializers.ModelSerializer):
-    resolved_by = UserSerializer(read_only=True)
+    resolved_by = UserSummarySerializer(read_only=True)
 
     class Meta:
         model = TaskCommentThreadState
@@ -0,0 +1,30 @@
+from projects.jobs import job
+from projects.notifications import dispatch_communication_batches
+from users.models import CustomUser
+
+from .api_views import _message_notification_batches, _mirror_message_attachment, _project_members
+from .models import Message, MessageAttachment
+
+
+@job('communication.notify')
+def notify(*, batches):
+    dispatch_communication_batches(batches)
+
+
+@job('communication.message_fanout')
+def message_fanout(*, message, sender):
+    """Mention, thread reply and channel notifications for a newly posted message."""
+    message = Message.objects.select_related('channel__project').get(id=message)
+    sender = CustomUser.objects.get(id=sender)
+    members = list(_project_members(message.channel.project))
+    dispatch_communication_batches(_message_notification_batches(message, sender, members))
+
+
+@job('communication.mirror_attachment')
+def mirror_attachment(*, attachment, sender):
+    """Copy a channel attachment into the project's Chat Attachments folder."""
+    attachment = MessageAttachment.objects.select_related('message__channel__project').get(id=attachment)
+    if attachment.mirrored_project_file_id:
+        return
+    sender = CustomUser.objects.get(id=sender)
+    _mirror_message_attachment(attachment.message.channel.project, sender, attachment)
@@ -1,9 +1,10 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
 from projects.models import Project
 
-from .models import Channel
+from .models import Channel, Message
+from .threads import record_thread_reply, remove_thread_reply
 
 
 @receiver(post_save, sender=Project)
@@ -28,3 +29,16 @@ def ensure_default_communication_channels(sender, instance, created, **kwargs):
                 'is_default': True,
             },
         )
+
+
+@receiver(post_save, sender=Message)
+def count_thread_reply(sender, instance, created, **kwargs):
+    if created and instance.parent_message_id and not kwargs.get('raw'):
+        record_thread_reply(instance)
+
+
+@receiver(post_delete, sender=Message)
+def uncount_thread_reply(sender, instance, **kwargs):
+    # Soft-deleted replies were already taken off the summary by MessageViewSet.destroy.
+    if instance.parent_message_id and not instance.is_deleted:
+        remove_thread_reply(instance)
@@ -0,0 +1,77 @@
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import ValidationError
+
+
+SYNC_PAGE_SIZE = 200
+
+
+def sync_params(query_params):
+    """Parse ``after_id`` (default 0) and the optional ``since`` timestamp of a sync request."""
+    try:
+        after_id = max(int(query_params.get('after_id') or 0), 0)
+    except ValueError:
+        raise ValidationError({'after_id': 'after_id must be an integer.'})
+
+    since = None
+    raw_since = query_params.get('since')
+    if raw_since:
+        try:
+            since = parse_datetime(raw_since)
+        except ValueError:
+            since = None
+        if since is None:
+            raise ValidationError({'since': 'since must be an ISO 8601 datetime.'})
+        if timezone.is_naive(since):
+            since = timezone.make_aware(since)
+    return after_id, since
+
+
+def sync_payload(queryset, serialize, after_id, since=None, changed_field=None, limit=SYNC_PAGE_SIZE):
+    """Delta of ``queryset`` for a client that has every row up to ``after_id`` as of ``since``.
+
+    New rows come from one keyset query on id. When ``changed_field`` and
+    ``since`` are given, a second query returns already-synced rows whose
+    ``changed_field`` moved past ``since``; soft-deleted rows are reported by
+    id in ``deleted`` and the rest are passed to ``serialize`` as one list.
+    Each query returns at most ``limit`` rows; changed rows come oldest
+    change first, and when they are cut short ``since`` is the last change
+    returned rather than the sync time. Clients send the returned
+    ``after_id`` and ``since`` back, straight away while ``has_more`` is set.
+    """
+    synced_at = timezone.now()
+    new_rows = list(queryset.filter(id__gt=after_id).order_by('id')[:limit + 1])
+    has_more = len(new_rows) > limit
+    new_rows = new_rows[:limit]
+
+    changed_rows = []
+    next_since = synced_at
+    if changed_field and since:
+        changed = queryset.filter(id__lte=after_id, **{f'{changed_field}__gt': since}).order_by(changed_field, 'id')
+        changed_rows = list(changed[:limit + 1])
+        if len(changed_rows) > limit:
+            has_more = True
+            # Stop before the first row left out so the next ``> since`` query
+            # cannot skip rows that share its timestamp.
+            cutoff = getattr(changed_rows[limit], changed_field)
+            changed_rows = [row for row in changed_rows[:limit] if getattr(row, changed_field) < cutoff]
+            if not changed_rows:
+                changed_rows = list(changed.filter(**{changed_field: cutoff}))
+            next_since = getattr(changed_rows[-1], changed_field)
+
+    live_rows = []
+    deleted = []
+    for row in changed_rows + new_rows:
+        if getattr(row, 'is_deleted', False):
+            deleted.append(row.id)
+        else:
+            live_rows.append(row)
+    results = serialize(live_rows)
+
+    return {
+        'results': results,
+        'deleted': deleted,
+        'after_id': new_rows[-1].id if new_rows else after_id,
+        'since': next_since,
+        'has_more': has_more,
+    }
@@ -1,15 +1,38 @@
+import asyncio
+import json
 from datetime import date, timedelta
+from io import StringIO
 
+from django.core import mail
 from django.core.management import call_command
+from django.db import connection
 from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APITestCase
 
-from projects.models import Project, TeamMembership
+from projects.models import OutboundEmail, Project, Team, TeamMembership
+from projects.notifications import dispatch_communication_notifications
+from projects.outbox import drain_outbox
 from users.models import CustomUser
 
-from .models import Channel, ChannelNotificationPreference, MeetingSlot, Notification, NotificationPreference
+from .models import (
+    Announcement,
+    AnnouncementReaction,
+    Channel,
+    ChannelNotificationPreference,
+    MeetingPoll,
+    MeetingSlot,
+    Message,
+    MessageReaction,
+    Notification,
+    NotificationPreference,
+)
+from .digests import DIGEST_MAX_LINES, build_digests
+from .realtime import InProcessBroker
+from .reminders import send_due_meeting_reminders
+from .sync import sync_payload
 
 
 class CommunicationAPITests(APITestCase):
@@ -331,7 +354,7 @@ class CommunicationAPITests(APITestCase):
             'project': self.project.id,
         })
         self.assertEqual(scoped_list_resp.status_code, status.HTTP_200_OK)
-        scoped_count = scoped_list_resp.data['count'] if isinstance(scoped_list_resp.data, dict) else len(scoped_list_resp.data)
+        scoped_count = len(scoped_list_resp.data['results'])
         self.assertEqual(scoped_count, 0)
 
         matching_list_resp = self.client.get('/api/communication/channel-messages/', {
@@ -339,7 +362,7 @@ class CommunicationAPITests(APITestCase):
             'project': other_project.id,
         })
         self.assertEqual(matching_list_resp.status_code, status.HTTP_200_OK)
-        matching_count = matching_list_resp.data['count'] if isinstance(matching_list_resp.data, dict) else len(matching_list_resp.data)
+        matching_count = len(matching_list_resp.data['results'])
         self.assertEqual(matching_count, 1)
 
     def test_channel_notification_preference_create_uses_authenticated_user(self):
@@ -393,3 +416,592 @@ class CommunicationAPITests(APITestCase):
         )
         call_command('purge_archived_channels')
         self.assertFalse(Channel.objects.filter(id=custom_channel.id).exists())
+
+
+class NotificationFanOutTests(APITestCase):
+    def setUp(self):
+        self.users = [
+            CustomUser.objects.create_user(
+                username=f'fanout{index}',
+                email=f'fanout{index}@uni.local',
+                password='pass12345',
+                role=CustomUser.Role.STUDENT,
+            )
+            for index in range(12)
+        ]
+        NotificationPreference.objects.create(
+            user=self.users[0],
+            notification_type=Notification.Type.MEETING_POLL,
+            in_app_enabled=False,
+        )
+        for user in self.users[1:3]:
+            NotificationPreference.objects.create(
+                user=user,
+                notification_type=Notification.Type.MEETING_POLL,
+                email_enabled=True,
+                email_frequency=NotificationPreference.EmailFrequency.IMMEDIATE,
+            )
+
+    def _dispatch(self, recipients, notification_type=Notification.Type.MEETING_POLL):
+        with CaptureQueriesContext(connection) as queries:
+            dispatch_communication_notifications(
+                recipients=recipients,
+                notification_type=notification_type,
+                title='New poll',
+                message='Pick a slot',
+            )
+        return len(queries.captured_queries)
+
+    @override_settings(ENABLE_EMAIL_NOTIFICATIONS=True)
+    def test_preferences_loaded_once_for_whole_team(self):
+        small = self._dispatch(self.users[:4])
+        Notification.objects.all().delete()
+        OutboundEmail.objects.all().delete()
+
+        self.assertEqual(self._dispatch(self.users), small)
+        self.assertEqual(Notification.objects.count(), 11)
+        self.assertFalse(Notification.objects.filter(recipient=self.users[0]).exists())
+        self.assertEqual(len(mail.outbox), 0)
+        drain_outbox()
+        self.assertEqual(sorted(message.to[0] for message in mail.outbox), ['fanout1@uni.local', 'fanout2@uni.local'])
+
+    def test_announcements_ignore_in_app_opt_out(self):
+        NotificationPreference.objects.create(
+            user=self.users[0],
+            notification_type=Notification.Type.ANNOUNCEMENT,
+            in_app_enabled=False,
+        )
+        dispatch_communication_notifications(
+            recipients=[self.users[0].id],
+            notification_type=Notification.Type.ANNOUNCEMENT,
+            title='Heads up',
+            message='Announcement',
+            always_in_app=True,
+        )
+        self.assertTrue(Notification.objects.filter(recipient=self.users[0]).exists())
+
+
+class ChannelMessageFanOutTests(APITestCase):
+    def setUp(self):
+        self.project = Project.objects.create(
+            title='Fan-out project',
+            description='Channel fan-out',
+            deadline=date.today() + timedelta(days=20),
+        )
+        self.team = Team.objects.create(project=self.project)
+        self.channel = Channel.objects.get(project=self.project, slug='general')
+        self.members = []
+        self._add_members(4)
+        self.sender = self.members[0]
+
+    def _add_members(self, count):
+        for _ in range(count):
+            index = len(self.members)
+            user = CustomUser.objects.create_user(
+                username=f'channelfan{index}',
+                email=f'channelfan{index}@uni.local',
+                password='pass12345',
+                role=CustomUser.Role.STUDENT,
+            )
+            TeamMembership.objects.create(user=user, team=self.team, role=Team.Role.LEADER if index == 0 else Team.Role.MEMBER)
+            self.members.append(user)
+
+    def _post(self, content, parent=None):
+        self.client.force_authenticate(user=self.sender)
+        payload = {'channel': self.channel.id, 'content': content}
+        if parent:
+            payload['parent_message'] = parent
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post('/api/communication/channel-messages/', payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return response.data['id'], len(queries.captured_queries)
+
+    def test_queries_per_message_do_not_grow_with_team(self):
+        root_id, _ = self._post('Kick-off')
+        self.client.force_authenticate(user=self.members[1])
+        self.client.post('/api/communication/channel-messages/', {'channel': self.channel.id, 'content': 'Reply', 'parent_message': root_id}, format='json')
+        _, small = self._post('Hello @channelfan2', parent=root_id)
+
+        self._add_members(26)
+        ChannelNotificationPreference.objects.create(user=self.members[3], channel=self.channel, mode=ChannelNotificationPreference.Mode.MUTED)
+        message_id, large = self._post('Hello again @channelfan2', parent=root_id)
+        self.assertEqual(large, small)
+
+        notifications = Notification.objects.filter(related_object_type='message', related_object_id=message_id)
+        self.assertTrue(notifications.filter(recipient=self.members[2], type=Notification.Type.CHANNEL_MENTION).exists())
+        self.assertTrue(notifications.filter(recipient=self.members[1], title='New thread reply').exists())
+        self.assertEqual(notifications.filter(title='New message in #general').count(), 28)
+        self.assertFalse(notifications.filter(recipient=self.members[3]).exists())
+        self.assertFalse(notifications.filter(recipient=self.sender).exists())
+
+    def test_benchmark_command_rolls_back(self):
+        users_before = CustomUser.objects.count()
+        output = StringIO()
+        call_command('benchmark_message_fanout', messages=8, members=5, stdout=output)
+        self.assertIn('Queries per message', output.getvalue())
+        self.assertEqual(CustomUser.objects.count(), users_before)
+
+
+class RecordingBroker:
+    published = []
+
+    def publish(self, user_ids, event):
+        self.published.append((list(user_ids), event))
+
+
+@override_settings(REALTIME_BROKER={'BACKEND': 'communication.tests.RecordingBroker', 'OPTIONS': {}})
+class RealtimePushTests(APITestCase):
+    def setUp(self):
+        RecordingBroker.published = []
+        self.sender, self.recipient = [
+            CustomUser.objects.create_user(
+                username=f'push{index}',
+                email=f'push{index}@uni.local',
+                password='pass12345',
+                role=CustomUser.Role.STUDENT,
+            )
+            for index in range(2)
+        ]
+        self.project = Project.objects.create(title='Push', description='Push project', deadline=date.today() + timedelta(days=20))
+        team = Team.objects.create(project=self.project)
+        TeamMembership.objects.create(user=self.sender, team=team, role=Team.Role.LEADER)
+        TeamMembership.objects.create(user=self.recipient, team=team, role=Team.Role.MEMBER)
+        self.client.force_authenticate(user=self.sender)
+
+    def _events(self, event_type):
+        return [(user_ids, json.loads(event['data'])) for user_ids, event in RecordingBroker.published if event['event'] == event_type]
+
+    def test_direct_message_and_notification_pushed_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                '/api/communication/direct-messages/',
+                {'project': self.project.id, 'recipient_id': self.recipient.id, 'content': 'Ping'},
+                format='json',
+            )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        [(user_ids, data)] = self._events('direct_message.created')
+        self.assertEqual(sorted(user_ids), sorted([self.sender.id, self.recipient.id]))
+        self.assertEqual(data['content'], 'Ping')
+        [(user_ids, data)] = self._events('notification.created')
+        self.assertEqual(user_ids, [self.recipient.id])
+        self.assertEqual(data['type'], Notification.Type.DIRECT_MESSAGE)
+
+    def test_channel_message_pushed_to_members(self):
+        channel = Channel.objects.get(project=self.project, slug='general')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/api/communication/channel-messages/', {'channel': channel.id, 'content': 'Hello'}, format='json')
+        [(user_ids, data)] = self._events('message.created')
+        self.assertEqual(sorted(user_ids), sorted([self.sender.id, self.recipient.id]))
+        self.assertEqual(data['channel'], channel.id)
+
+    def test_channel_message_pushed_to_supervisor(self):
+        supervisor = CustomUser.objects.create_user(
+            username='pushsupervisor',
+            email='pushsupervisor@uni.local',
+            password='pass12345',
+            role=CustomUser.Role.LECTURER,
+        )
+        self.project.supervisor = supervisor
+        self.project.save(update_fields=['supervisor'])
+        channel = Channel.objects.get(project=self.project, slug='general')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/api/communication/channel-messages/', {'channel': channel.id, 'content': 'Hello'}, format='json')
+        [(user_ids, _data)] = self._events('message.created')
+        self.assertEqual(sorted(user_ids), sorted([self.sender.id, self.recipient.id, supervisor.id]))
+
+    def test_stream_requires_valid_token(self):
+        self.client.force_authenticate(user=None)
+        self.assertEqual(self.client.get('/api/communication/stream/').status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(self.client.get('/api/communication/stream/', {'token': 'bogus'}).status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class InProcessBrokerTests(APITestCase):
+    def test_events_published_from_another_thread_reach_subscriber(self):
+        broker = InProcessBroker(queue_size=2)
+
+        async def scenario():
+            async with broker.subscription(7) as next_event:
+                for index in range(3):
+                    await asyncio.to_thread(broker.publish, [7, 8], {'event': 'test', 'data': str(index)})
+                await asyncio.sleep(0)
+                # The queue holds two events, so the oldest one was dropped.
+                return [await asyncio.wait_for(next_event(), timeout=1) for _ in range(2)]
+
+        events = asyncio.run(scenario())
+        self.assertEqual([event['data'] for event in events], ['1', '2'])
+        self.assertEqual(broker._subscribers, {})
+
+
+class IncrementalSyncTests(APITestCase):
+    def setUp(self):
+        self.sender, self.recipient = [
+            CustomUser.objects.create_user(
+                username=f'sync{index}',
+                email=f'sync{index}@uni.local',
+                password='pass12345',
+                role=CustomUser.Role.STUDENT,
+            )
+            for index in range(2)
+        ]
+        self.project = Project.objects.create(title='Sync', description='Sync project', deadline=date.today() + timedelta(days=20))
+        team = Team.objects.create(project=self.project)
+        TeamMembership.objects.create(user=self.sender, team=team, role=Team.Role.LEADER)
+        TeamMembership.objects.create(user=self.recipient, team=team, role=Team.Role.MEMBER)
+        self.channel = Channel.objects.get(project=self.project, slug='general')
+        self.client.force_authenticate(user=self.sender)
+
+    def _post(self, content):
+        response = self.client.post('/api/communication/channel-messages/', {'channel': self.channel.id, 'content': content}, format='json')
+        return response.data['id']
+
+    def test_channel_sync_returns_new_edited_and_deleted_rows(self):
+        first, second, third = self._post('one'), self._post('two'), self._post('three')
+        initial = self.client.get('/api/communication/channel-messages/sync/', {'channel': self.channel.id})
+        self.assertEqual([row['id'] for row in initial.data['results']], [first, second, third])
+        self.assertEqual(initial.data['after_id'], third)
+
+        self.client.patch(f'/api/communication/channel-messages/{first}/', {'content': 'one, edited'}, format='json')
+        self.client.delete(f'/api/communication/channel-messages/{second}/')
+        fourth = self._post('four')
+
+        delta = self.client.get('/api/communication/channel-messages/sync/', {
+            'channel': self.channel.id,
+            'after_id': initial.data['after_id'],
+            'since': initial.data['since'],
+        })
+        self.assertEqual(delta.status_code, status.HTTP_200_OK)
+        self.assertEqual([row['id'] for row in delta.data['results']], [first, fourth])
+        self.assertEqual(delta.data['results'][0]['content'], 'one, edited')
+        self.assertEqual(delta.data['deleted'], [second])
+        self.assertEqual(delta.data['after_id'], fourth)
+        self.assertFalse(delta.data['has_more'])
+
+    def test_changed_rows_are_paged(self):
+        ids = [self._post(f'message {index}') for index in range(5)]
+        base = timezone.now() + timedelta(minutes=1)
+        for offset, message_id in enumerate(reversed(ids)):
+            Message.objects.filter(id=message_id).update(updated_at=base + timedelta(seconds=offset))
+        messages = Message.objects.filter(channel=self.channel)
+
+        seen, since = [], base - timedelta(seconds=1)
+        while True:
+            page = sync_payload(messages, lambda rows: [row.id for row in rows], ids[-1], since, changed_field='updated_at', limit=2)
+            self.assertLessEqual(len(page['results']), 2)
+            seen.extend(page['results'])
+            since = page['since']
+            if not page['has_more']:
+                break
+        self.assertEqual(seen, list(reversed(ids)))
+
+    def test_channel_sync_requires_membership(self):
+        outsider = CustomUser.objects.create_user(username='syncoutsider', password='pass12345', role=CustomUser.Role.STUDENT)
+        self.client.force_authenticate(user=outsider)
+        response = self.client.get('/api/communication/channel-messages/sync/', {'channel': self.channel.id})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_direct_message_sync_reports_deletions(self):
+        created = self.client.post(
+            '/api/communication/direct-messages/',
+            {'project': self.project.id, 'recipient_id': self.recipient.id, 'content': 'Hi'},
+            format='json',
+        )
+        self.client.force_authenticate(user=self.recipient)
+        initial = self.client.get('/api/communication/direct-messages/sync/')
+        self.assertEqual([row['id'] for row in initial.data['results']], [created.data['id']])
+
+        self.client.force_authenticate(user=self.sender)
+        self.client.delete(f"/api/communication/direct-messages/{created.data['id']}/")
+        self.client.force_authenticate(user=self.recipient)
+        delta = self.client.get('/api/communication/direct-messages/sync/', {
+            'after_id': initial.data['after_id'],
+            'since': initial.data['since'],
+        })
+        self.assertEqual(delta.data['results'], [])
+        self.assertEqual(delta.data['deleted'], [created.data['id']])
+
+    def test_invalid_since_is_rejected(self):
+        response = self.client.get('/api/communication/direct-messages/sync/', {'since': 'yesterday'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class MessageHistoryPaginationTests(APITestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(username='history', email='history@uni.local', password='pass12345', role=CustomUser.Role.STUDENT)
+        self.project = Project.objects.create(title='History', description='History project', deadline=date.today() + timedelta(days=20))
+        team = Team.objects.create(project=self.project)
+        TeamMembership.objects.create(user=self.user, team=team, role=Team.Role.LEADER)
+        self.channel = Channel.objects.get(project=self.project, slug='general')
+        self.message_ids = [
+            Message.objects.create(channel=self.channel, sender=self.user, content=f'Message {index}').id
+            for index in range(7)
+        ]
+        self.client.force_authenticate(user=self.user)
+
+    def test_cursor_pages_walk_history_newest_first(self):
+        seen = []
+        query_counts = []
+        url = '/api/communication/channel-messages/'
+        params = {'channel': self.channel.id, 'parent': 'null', 'page_size': 3}
+        while url:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn('count', response.data)
+            query_counts.append(len(queries.captured_queries))
+            seen.extend(row['id'] for row in response.data['results'])
+            url, params = response.data['next'], None
+
+        self.assertEqual(seen, list(reversed(self.message_ids)))
+        self.assertEqual(len(set(query_counts)), 1)
+
+
+class ThreadSummaryTests(APITestCase):
+    def setUp(self):
+        self.project = Project.objects.create(title='Threads', description='Thread summaries', deadline=date.today() + timedelta(days=20))
+        team = Team.objects.create(project=self.project)
+        self.users = []
+        for index in range(3):
+            user = CustomUser.objects.create_user(
+                username=f'thread{index}',
+                email=f'thread{index}@uni.local',
+                password='pass12345',
+                role=CustomUser.Role.STUDENT,
+            )
+            TeamMembership.objects.create(user=user, team=team, role=Team.Role.LEADER if index == 0 else Team.Role.MEMBER)
+            self.users.append(user)
+        self.channel = Channel.objects.get(project=self.project, slug='general')
+        self.root = Message.objects.create(channel=self.channel, sender=self.users[0], content='Root')
+
+    def _reply(self, user, content='Reply'):
+        self.client.force_authenticate(user=user)
+        response = self.client.post(
+            '/api/communication/channel-messages/',
+            {'channel': self.channel.id, 'content': content, 'parent_message': self.root.id},
+            format='json',
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return Message.objects.get(id=response.data['id'])
+
+    def test_replies_maintain_root_summary(self):
+        first = self._reply(self.users[1])
+        second = self._reply(self.users[2])
+        self.root.refresh_from_db()
+        self.assertEqual(self.root.reply_count, 2)
+        self.assertEqual(self.root.last_reply_at, second.created_at)
+        self.assertEqual(set(self.root.thread_participants.values_list('id', flat=True)), {user.id for user in self.users})
+        self.assertTrue(Notification.objects.filter(recipient=self.users[1], title='New thread reply').exists())
+
+        self.client.force_authenticate(user=self.users[2])
+        response = self.client.delete(f'/api/communication/channel-messages/{second.id}/')
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.root.refresh_from_db()
+        self.assertEqual(self.root.reply_count, 1)
+        self.assertEqual(self.root.last_reply_at, first.created_at)
+        self.assertNotIn(self.users[2], self.root.thread_participants.all())
+
+        first.delete()
+        self.root.refresh_from_db()
+        self.assertEqual(self.root.reply_count, 0)
+        self.assertIsNone(self.root.last_reply_at)
+
+    def test_root_author_is_notified_of_replies_only_after_replying(self):
+        self._reply(self.users[1])
+        self.assertFalse(Notification.objects.filter(recipient=self.users[0], title='New thread reply').exists())
+
+        self._reply(self.users[0])
+        self._reply(self.users[2])
+        self.assertEqual(Notification.objects.filter(recipient=self.users[0], title='New thread reply').count(), 1)
+
+    def test_listing_thread_summaries_is_constant_in_queries(self):
+        self._reply(self.users[1])
+        self.client.force_authenticate(user=self.users[0])
+        params = {'channel': self.channel.id, 'parent': 'null'}
+        with CaptureQueriesContext(connection) as small:
+            self.client.get('/api/communication/channel-messages/', params)
+
+        for index in range(4):
+            self.root = Message.objects.create(channel=self.channel, sender=self.users[0], content=f'Root {index}')
+            self._reply(self.users[index % 2 + 1])
+        self.client.force_authenticate(user=self.users[0])
+        with CaptureQueriesContext(connection) as large:
+            response = self.client.get('/api/communication/channel-messages/', params)
+
+        self.assertEqual(len(large.captured_queries), len(small.captured_queries))
+        summaries = {row['id']: row for row in response.data['results']}
+        self.assertEqual(summaries[self.root.id]['reply_count'], 1)
+        self.assertEqual(sorted(summaries[self.root.id]['thread_participants']), [self.users[0].id, self.users[2].id])
+
+
+class ReactionSummaryTests(APITestCase):
+    def setUp(self):
+        self.project = Project.objects.create(title='Reactions', description='Reaction summaries', deadline=date.today() + timedelta(days=20))
+        self.team = Team.objects.create(project=self.project)
+        self.users = []
+        self._add_users(3)
+        self.viewer = self.users[0]
+        self.channel = Channel.objects.get(project=self.project, slug='general')
+        self.announcement = Announcement.objects.create(project=self.project, author=self.viewer, content='Demo day')
+        self.message = Message.objects.create(channel=self.channel, sender=self.viewer, content='Ship it')
+
+    def _add_users(self, count):
+        for _ in range(count):
+            index = len(self.users)
+            user = CustomUser.objects.create_user(
+                username=f'reactor{index}',
+                email=f'reactor{index}@uni.local',
+                password='pass12345',
+                role=CustomUser.Role.STUDENT,
+            )
+            TeamMembership.objects.create(user=user, team=self.team, role=Team.Role.LEADER if index == 0 else Team.Role.MEMBER)
+            self.users.append(user)
+
+    def _react(self, users, emoji):
+        AnnouncementReaction.objects.bulk_create([AnnouncementReaction(announcement=self.announcement, user=user, emoji=emoji) for user in users])
+        MessageReaction.objects.bulk_create([MessageReaction(message=self.message, user=user, emoji=emoji) for user in users])
+
+    def test_payloads_carry_grouped_counts(self):
+        self._react(self.users, ':+1:')
+        self._react(self.users[1:2], ':tada:')
+        expected = [
+            {'emoji': ':+1:', 'count': 3, 'reacted_by_me': True},
+            {'emoji': ':tada:', 'count': 1, 'reacted_by_me': False},
+        ]
+        self.client.force_authenticate(user=self.viewer)
+
+        response = self.client.get('/api/communication/announcements/', {'project': self.project.id})
+        self.assertEqual(response.data['results'][0]['reactions'], expected)
+        response = self.client.get('/api/communication/channel-messages/', {'channel': self.channel.id})
+        self.assertEqual(response.data['results'][0]['reactions'], expected)
+        response = self.client.get(f'/api/communication/channel-messages/{self.message.id}/')
+        self.assertEqual(response.data['reactions'], expected)
+
+    def test_listing_queries_do_not_grow_with_reactors(self):
+        self._react(self.users, ':+1:')
+        self.client.force_authenticate(user=self.viewer)
+        with CaptureQueriesContext(connection) as small:
+            self.client.get('/api/communication/announcements/', {'project': self.project.id})
+
+        self._add_users(20)
+        self._react(self.users[3:], ':+1:')
+        with CaptureQueriesContext(connection) as large:
+            response = self.client.get('/api/communication/announcements/', {'project': self.project.id})
+        self.assertEqual(len(large.captured_queries), len(small.captured_queries))
+        self.assertEqual(response.data['results'][0]['reactions'][0]['count'], 23)
+
+    def test_reactors_are_paginated_separately(self):
+        self._react(self.users, ':+1:')
+        self._react(self.users[:1], ':eyes:')
+        self.client.force_authenticate(user=self.viewer)
+
+        response = self.client.get(f'/api/communication/announcements/{self.announcement.id}/reactions/', {'emoji': ':+1:'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 3)
+        self.assertEqual({row['user']['id'] for row in response.data['results']}, {user.id for user in self.users})
+
+        response = self.client.get(f'/api/communication/channel-messages/{self.message.id}/reactions/', {'page_size': 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertIsNotNone(response.data['next'])
+
+
+class MeetingReminderTests(APITestCase):
+    def setUp(self):
+        self.now = timezone.now()
+        self.slots = []
+        for index in range(3):
+            project = Project.objects.create(title=f'Reminders {index}', description='Meetings', deadline=date.today() + timedelta(days=20))
+            team = Team.objects.create(project=project)
+            for member in range(2):
+                user = CustomUser.objects.create_user(
+                    username=f'reminder{index}_{member}',
+                    email=f'reminder{index}_{member}@uni.local',
+                    password='pass12345',
+                    role=CustomUser.Role.STUDENT,
+                )
+                TeamMembership.objects.create(user=user, team=team, role=Team.Role.LEADER if member == 0 else Team.Role.MEMBER)
+            poll = MeetingPoll.objects.create(project=project, created_by=user, title=f'Standup {index}', response_deadline=self.now)
+            self.slots.append(MeetingSlot.objects.create(poll=poll, start_datetime=self.now + timedelta(minutes=30), end_datetime=self.now + timedelta(minutes=90), confirmed=True))
+        # Missed by an earlier run but still inside the catch-up window.
+        self.slots[1].start_datetime = self.now - timedelta(minutes=5)
+        self.slots[1].save(update_fields=['start_datetime'])
+        self.later = MeetingSlot.objects.create(poll=poll, start_datetime=self.now + timedelta(hours=3), end_datetime=self.now + timedelta(hours=4), confirmed=True)
+
+    @override_settings(ENABLE_EMAIL_NOTIFICATIONS=True)
+    def test_all_due_slots_reminded_in_one_pass(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(send_due_meeting_reminders(self.now), 3)
+        statements = [query['sql'].split()[0] for query in queries.captured_queries if 'SAVEPOINT' not in query['sql']]
+        self.assertEqual(statements, ['SELECT', 'SELECT', 'INSERT', 'INSERT', 'UPDATE'])
+
+        self.assertEqual(Notification.objects.filter(type=Notification.Type.MEETING_REMINDER).count(), 6)
+        self.assertEqual(OutboundEmail.objects.count(), 6)
+        self.assertEqual(MeetingSlot.objects.filter(reminder_sent_at=self.now).count(), 3)
+        self.later.refresh_from_db()
+        self.assertIsNone(self.later.reminder_sent_at)
+        self.assertEqual(send_due_meeting_reminders(self.now), 0)
+
+    def test_command_honours_catch_up_window(self):
+        output = StringIO()
+        call_command('send_meeting_reminders', '--catch-up-minutes', '0', stdout=output)
+        self.assertIn('Sent reminders for 2 meeting slot(s).', output.getvalue())
+        self.slots[1].refresh_from_db()
+        self.assertIsNone(self.slots[1].reminder_sent_at)
+
+
+@override_settings(ENABLE_EMAIL_NOTIFICATIONS=True)
+class NotificationDigestTests(APITestCase):
+    def setUp(self):
+        self.users = []
+        for index in range(3):
+            user = CustomUser.objects.create_user(
+                username=f'digest{index}',
+                email=f'digest{index}@uni.local',
+                password='pass12345',
+                role=CustomUser.Role.STUDENT,
+            )
+            NotificationPreference.objects.create(
+                user=user,
+                notification_type=Notification.Type.ANNOUNCEMENT,
+                email_enabled=index < 2,
+                email_frequency=NotificationPreference.EmailFrequency.DIGEST,
+            )
+            self.users.append(user)
+
+    def _notify(self, count):
+        Notification.objects.bulk_create([
+            Notification(recipient=user, type=Notification.Type.ANNOUNCEMENT, title=f'Update {index}', message_body='Body')
+            for user in self.users
+            for index in range(count)
+        ])
+
+    def _build(self):
+        with CaptureQueriesContext(connection) as queries:
+            run = build_digests(chunk_size=100)
+        return run, len(queries.captured_queries)
+
+    def test_queries_do_not_grow_with_notifications(self):
+        self._notify(2)
+        small_run, small = self._build()
+        self.assertEqual((small_run['users'], small_run['notifications']), (2, 4))
+
+        self._notify(40)
+        large_run, large = self._build()
+        self.assertEqual((large_run['users'], large_run['notifications']), (2, 80))
+        self.assertEqual(large, small)
+        self.assertFalse(Notification.objects.filter(recipient=self.users[2], digest_sent_at__isnull=False).exists())
+        self.assertEqual(build_digests()['notifications'], 0)
+
+    def test_long_digests_are_truncated(self):
+        self._notify(DIGEST_MAX_LINES + 5)
+        call_command('send_notification_digests', '--chunk-size', '10', stdout=StringIO())
+        emails = OutboundEmail.objects.filter(to_email=self.users[0].email)
+        self.assertEqual(emails.count(), 1)
+        self.assertIn('...and 5 more.', emails.get().body)
+        self.assertIn('for the last 24 hours:', emails.get().body)
+
+    def test_digest_names_the_requested_window(self):
+        self._notify(1)
+        call_command('send_notification_digests', '--hours', '72', stdout=StringIO())
+        self.assertIn('for the last 3 days:', OutboundEmail.objects.filter(to_email=self.users[0].email).get().body)
+        self.assertFalse(Notification.objects.filter(recipient__in=self.users[:2], digest_sent_at__isnull=True).exists())
@@ -0,0 +1,47 @@
+from django.db import transaction
+from django.db.models import F, Max
+
+from .models import Message
+
+
+ThreadParticipant = Message.thread_participants.through
+
+
+def _add_participants(root_id, user_ids):
+    ThreadParticipant.objects.bulk_create(
+        [ThreadParticipant(message_id=root_id, customuser_id=user_id) for user_id in user_ids],
+        ignore_conflicts=True,
+    )
+
+
+def thread_participant_ids(root_id):
+    """User ids taking part in the thread under ``root_id``, read straight from the through table."""
+    return list(ThreadParticipant.objects.filter(message_id=root_id).values_list('customuser_id', flat=True))
+
+
+def record_thread_reply(reply):
+    """Count a new reply on its root message and add its sender (and the root's) as participants."""
+    if not reply.parent_message_id:
+        return
+    with transaction.atomic():
+        Message.objects.filter(id=reply.parent_message_id).update(
+            reply_count=F('reply_count') + 1,
+            last_reply_at=reply.created_at,
+        )
+        root_sender_id = Message.objects.filter(id=reply.parent_message_id).values_list('sender_id', flat=True).first()
+        _add_participants(reply.parent_message_id, {reply.sender_id, root_sender_id} - {None})
+
+
+def remove_thread_reply(reply):
+    """Undo :func:`record_thread_reply` for a reply that was deleted."""
+    if not reply.parent_message_id:
+        return
+    live_replies = Message.objects.filter(parent_message_id=reply.parent_message_id, is_deleted=False).exclude(id=reply.id)
+    with transaction.atomic():
+        Message.objects.filter(id=reply.parent_message_id, reply_count__gt=0).update(
+            reply_count=F('reply_count') - 1,
+            last_reply_at=live_replies.order_by().values('parent_message_id').annotate(latest=Max('created_at')).values('latest')[:1],
+        )
+        root_sender_id = Message.objects.filter(id=reply.parent_message_id).values_list('sender_id', flat=True).first()
+        if reply.sender_id != root_sender_id and not live_replies.filter(sender_id=reply.sender_id).exists():
+            ThreadParticipant.objects.filter(message_id=reply.parent_message_id, customuser_id=reply.sender_id).delete()
@@ -1,3 +1,56 @@
-from django.shortcuts import render
+import asyncio
 
-# Create your views here.
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import JsonResponse, StreamingHttpResponse
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+
+from .realtime import get_broker
+
+
+def _stream_user(request):
+    """Resolve the JWT from the Authorization header or, for EventSource clients, ``?token=``."""
+    authentication = JWTAuthentication()
+    raw_token = request.GET.get('token')
+    if not raw_token:
+        header = authentication.get_header(request)
+        raw_token = authentication.get_raw_token(header) if header else None
+    if not raw_token:
+        return None
+    try:
+        return authentication.get_user(authentication.get_validated_token(raw_token))
+    except (InvalidToken, AuthenticationFailed):
+        return None
+
+
+async def event_stream(request):
+    """Server-Sent Events stream of new channel messages, direct messages and notifications.
+
+    Needs an ASGI server; each connection holds one broker subscription for
+    the authenticated user until the client disconnects.
+    """
+    if request.method != 'GET':
+        return JsonResponse({'detail': 'Method not allowed.'}, status=405)
+    user = await sync_to_async(_stream_user)(request)
+    if user is None or not user.is_active:
+        return JsonResponse({'detail': 'Authentication credentials were not provided or are invalid.'}, status=401)
+
+    broker = get_broker()
+    heartbeat = settings.REALTIME_HEARTBEAT_SECONDS
+
+    async def events():
+        yield 'retry: 5000\n\n'
+        async with broker.subscription(user.id) as next_event:
+            while True:
+                try:
+                    event = await asyncio.wait_for(next_event(), timeout=heartbeat)
+                except asyncio.TimeoutError:
+                    yield ': keep-alive\n\n'
+                    continue
+                yield f"event: {event['event']}\ndata: {event['data']}\n\n"
+
+    response = StreamingHttpResponse(events(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -8,6 +8,8 @@ export const ProjectDashboard = () => {
   const [project, setProject] = useState(null);
   const [analytics, setAnalytics] = useState(null);
   const [timeline, setTimeline] = useState([]);
+  const [timelineCursor, setTimelineCursor] = useState(null);
+  const [timelineLoading, setTimelineLoading] = useState(false);
   const [loading, setLoading] = useState(true);
 
   useEffect(() => {
@@ -20,7 +22,8 @@ export const ProjectDashboard = () => {
         ]);
         setProject(projectRes);
         setAnalytics(analyticsRes || null);
-        setTimeline(Array.isArray(timelineRes) ? timelineRes : []);
+        setTimeline(Array.isArray(timelineRes?.results) ? timelineRes.results : []);
+        setTimelineCursor(timelineRes?.next_cursor || null);
       } finally {
         setLoading(false);
       }
@@ -29,6 +32,18 @@ export const ProjectDashboard = () => {
     loadProjectData();
   }, [id]);
 
+  const loadMoreTimeline = async () => {
+    if (!timelineCursor) return;
+    setTimelineLoading(true);
+    try {
+      const timelineRes = await projectsAPI.getProjectActivityTimeline(id, { type: 'ALL', cursor: timelineCursor });
+      setTimeline((current) => [...current, ...(timelineRes?.results || [])]);
+      setTimelineCursor(timelineRes?.next_cursor || null);
+    } finally {
+      setTimelineLoading(false);
+    }
+  };
+
   if (loading) return <div className="loading">Loading...</div>;
   if (!project) return <div className="error">Project not found</div>;
 
@@ -96,7 +111,7 @@ export const ProjectDashboard = () => {
         <div className="project-section surface">
           <h2>Project Activity Timeline</h2>
           <div className="team-grid">
-            {timeline.slice(0, 30).map((item, index) => (
+            {timeline.map((item, index) => (
               <div key={`${item.type}-${item.timestamp}-${index}`} className="member-card">
                 <h3>{item.type}</h3>
                 <p>{item.label}</p>
@@ -104,6 +119,11 @@ export const ProjectDashboard = () => {
               </div>
             ))}
           </div>
+          {timelineCursor && (
+            <button className="btn btn-secondary" onClick={loadMoreTimeline} disabled={timelineLoading} style={{ marginTop: '1rem' }}>
+              {timelineLoading ? 'Loading...' : 'Load older activity'}
+            </button>
+          )}
         </div>
       </div>
     </div>
@@ -18,6 +18,13 @@ const availabilityOptions = [
 ];
 
 const asList = (payload) => (Array.isArray(payload) ? payload : payload?.results || []);
+
+const nextCursor = (payload) => {
+  if (!payload?.next) return null;
+  return new URL(payload.next, window.location.origin).searchParams.get('cursor');
+};
+
+const byCreatedAt = (a, b) => new Date(a.created_at).getTime() - new Date(b.created_at).getTime() || a.id - b.id;
 const formatDate = (value) => (value ? new Date(value).toLocaleString() : 'N/A');
 
 const displayName = (user) => {
@@ -52,6 +59,7 @@ const CommunicationWorkspace = () => {
   const [channels, setChannels] = useState([]);
   const [selectedChannelId, setSelectedChannelId] = useState('');
   const [messages, setMessages] = useState([]);
+  const [olderMessagesCursor, setOlderMessagesCursor] = useState(null);
   const [messageDraft, setMessageDraft] = useState('');
   const [messageTaskIds, setMessageTaskIds] = useState([]);
   const [messageFile, setMessageFile] = useState(null);
@@ -120,7 +128,8 @@ const CommunicationWorkspace = () => {
   );
 
   const messageTree = useMemo(() => {
-    const roots = messages.filter((item) => !item.parent_message);
+    // Pages arrive newest-first; the stream reads oldest-first.
+    const roots = messages.filter((item) => !item.parent_message).sort(byCreatedAt);
     const repliesByParent = new Map();
     messages.forEach((item) => {
       if (!item.parent_message) return;
@@ -131,9 +140,7 @@ const CommunicationWorkspace = () => {
 
     return roots.map((root) => ({
       root,
-      replies: (repliesByParent.get(root.id) || []).sort(
-        (a, b) => new Date(a.created_at).getTime() - new Date(b.created_at).getTime()
-      ),
+      replies: (repliesByParent.get(root.id) || []).sort(byCreatedAt),
     }));
   }, [messages]);
 
@@ -205,6 +212,7 @@ const CommunicationWorkspace = () => {
     const loadMessages = async () => {
       if (!selectedChannelId) {
         setMessages([]);
+        setOlderMessagesCursor(null);
         return;
       }
 
@@ -214,8 +222,10 @@ const CommunicationWorkspace = () => {
           project: selectedProjectId,
         });
         setMessages(asList(data));
+        setOlderMessagesCursor(nextCursor(data));
       } catch (error) {
         setMessages([]);
+        setOlderMessagesCursor(null);
         showToast('error', 'Channel', 'Unable to load channel messages.');
       }
     };
@@ -262,6 +272,44 @@ const CommunicationWorkspace = () => {
     loadNotificationsData();
   }, [activeTab, showToast]);
 
+  useEffect(() => {
+    if (!selectedProjectId) return undefined;
+
+    const isCurrentProject = (data) => String(data.project) === String(selectedProjectId);
+
+    return communicationAPI.subscribe({
+      'message.created': async (data) => {
+        if (!isCurrentProject(data) || String(data.channel) !== String(selectedChannelId)) return;
+        try {
+          const latest = asList(await communicationAPI.listMessages({ channel: selectedChannelId, project: selectedProjectId }));
+          setMessages((current) => {
+            const seen = new Set(current.map((item) => item.id));
+            return [...current, ...latest.filter((item) => !seen.has(item.id))];
+          });
+        } catch (error) {
+          // The next manual refresh picks the message up.
+        }
+      },
+      'direct_message.created': async (data) => {
+        if (!isCurrentProject(data)) return;
+        try {
+          const params = { project: selectedProjectId };
+          if (dmRecipientId) params.with_user = dmRecipientId;
+          setDirectMessages(asList(await communicationAPI.listDirectMessages(params)));
+        } catch (error) {
+          // Keep the current list.
+        }
+      },
+      'notification.created': async () => {
+        try {
+          setNotifications(asList(await communicationAPI.listNotifications()));
+        } catch (error) {
+          // Keep the current list.
+        }
+      },
+    });
+  }, [selectedProjectId, selectedChannelId, dmRecipientId]);
+
   const refreshAnnouncements = async () => {
     if (!selectedProjectId) return;
     const data = await communicationAPI.listAnnouncements({ project: selectedProjectId });
@@ -278,6 +326,26 @@ const CommunicationWorkspace = () => {
     if (!selectedProjectId || !selectedChannelId) return;
     const data = await communicationAPI.listMessages({ channel: selectedChannelId, project: selectedProjectId });
     setMessages(asList(data));
+    setOlderMessagesCursor(nextCursor(data));
+  };
+
+  const loadOlderMessages = async () => {
+    if (!olderMessagesCursor) return;
+    try {
+      const data = await communicationAPI.listMessages({
+        channel: selectedChannelId,
+        project: selectedProjectId,
+        cursor: olderMessagesCursor,
+      });
+      const older = asList(data);
+      setMessages((current) => {
+        const seen = new Set(current.map((item) => item.id));
+        return [...older.filter((item) => !seen.has(item.id)), ...current];
+      });
+      setOlderMessagesCursor(nextCursor(data));
+    } catch (error) {
+      showToast('error', 'Channel', 'Unable to load older messages.');
+    }
   };
 
   const refreshMeetings = async () => {
@@ -782,6 +850,11 @@ const CommunicationWorkspace = () => {
             </header>
 
             <div className="stream-list">
+              {olderMessagesCursor && (
+                <button type="button" onClick={loadOlderMessages}>
+                  Load older messages
+                </button>
+              )}
               {messageTree.map(({ root, replies }) => {
                 const canEditRoot = root.sender?.id === user?.id && !root.is_deleted;
                 const canDeleteRoot = canEditRoot || isLeadership;
@@ -19,6 +19,8 @@ export const ProjectDashboard = () => {
   const [submissionChecklist, setSubmissionChecklist] = useState(null);
   const [projectAnalytics, setProjectAnalytics] = useState(null);
   const [projectTimeline, setProjectTimeline] = useState([]);
+  const [timelineCursor, setTimelineCursor] = useState(null);
+  const [timelineLoading, setTimelineLoading] = useState(false);
   const [invitationFilter, setInvitationFilter] = useState('ALL');
   const [now, setNow] = useState(Date.now());
   const [loading, setLoading] = useState(true);
@@ -106,7 +108,8 @@ export const ProjectDashboard = () => {
       setRecentFiles(Array.isArray(recentFilesRes) ? recentFilesRes : []);
       setSubmissionChecklist(checklistRes || null);
       setProjectAnalytics(analyticsRes || null);
-      setProjectTimeline(Array.isArray(timelineRes) ? timelineRes : []);
+      setProjectTimeline(Array.isArray(timelineRes?.results) ? timelineRes.results : []);
+      setTimelineCursor(timelineRes?.next_cursor || null);
 
       const requesterMembership = members.find((member) => member.user?.id === user?.id);
       if (requesterMembership && ['LEADER', 'CO_LEADER'].includes(requesterMembership.role)) {
@@ -121,6 +124,20 @@ export const ProjectDashboard = () => {
     }
   };
 
+  const loadMoreTimeline = async () => {
+    if (!timelineCursor) return;
+    setTimelineLoading(true);
+    try {
+      const timelineRes = await projectsAPI.getProjectActivityTimeline(id, { type: 'ALL', cursor: timelineCursor });
+      setProjectTimeline((current) => [...current, ...(timelineRes?.results || [])]);
+      setTimelineCursor(timelineRes?.next_cursor || null);
+    } catch (err) {
+      showToast('error', 'Timeline', 'Could not load older activity');
+    } finally {
+      setTimelineLoading(false);
+    }
+  };
+
   const applyStatusUpdate = async (milestone, status) => {
     try {
       await milestonesAPI.update(milestone.id, {
@@ -496,7 +513,7 @@ export const ProjectDashboard = () => {
           <div className="project-section surface" style={{ paddingBottom: '1.5rem' }}>
             <h2>Recent Activity Timeline</h2>
             <div className="team-grid">
-              {projectTimeline.slice(0, 20).map((item, index) => (
+              {projectTimeline.map((item, index) => (
                 <div key={`${item.type}-${item.timestamp}-${index}`} className="member-card">
                   <h3>{item.type}</h3>
                   <p>{item.label}</p>
@@ -504,6 +521,11 @@ export const ProjectDashboard = () => {
                 </div>
               ))}
             </div>
+            {timelineCursor && (
+              <button className="btn btn-secondary" onClick={loadMoreTimeline} disabled={timelineLoading} style={{ marginTop: '1rem' }}>
+                {timelineLoading ? 'Loading...' : 'Load older activity'}
+              </button>
+            )}
           </div>
         )}
 
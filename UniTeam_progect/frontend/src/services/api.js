@@ -624,6 +624,17 @@ export const usersAPI = {
 };
 
 export const communicationAPI = {
+  // Server-Sent Events stream; returns a function that closes the connection.
+  subscribe: (handlers = {}) => {
+    const token = localStorage.getItem('access_token');
+    if (!token || typeof EventSource === 'undefined') return () => {};
+    const source = new EventSource(`${API_BASE_URL}/communication/stream/?token=${encodeURIComponent(token)}`);
+    Object.entries(handlers).forEach(([eventName, handler]) => {
+      source.addEventListener(eventName, (event) => handler(JSON.parse(event.data)));
+    });
+    return () => source.close();
+  },
+
   listChannels: async (params = {}) => {
     const response = await api.get('/communication/channels/', { params });
     return response.data;
@@ -0,0 +1,70 @@
+from django.apps import apps
+from django.db import transaction
+from django.db.models import Max
+
+from .models import ProjectActivityIndex, ProjectFileActivityLog, TaskActivityLog
+
+
+def record_project_activity(project_id, user_id, timestamp):
+    """Move the (project, user) index entry forward to ``timestamp``.
+
+    ``user_id`` may be None for activity not attributed to a member. Older
+    timestamps never overwrite newer ones.
+    """
+    if not project_id or not timestamp:
+        return
+    updated = ProjectActivityIndex.objects.filter(
+        project_id=project_id,
+        user_id=user_id,
+        last_activity_at__lt=timestamp,
+    ).update(last_activity_at=timestamp)
+    if not updated:
+        ProjectActivityIndex.objects.get_or_create(
+            project_id=project_id,
+            user_id=user_id,
+            defaults={'last_activity_at': timestamp},
+        )
+
+
+def _activity_sources():
+    """(queryset, project field, user field) for every source feeding the index.
+
+    A user field of None records the activity against the project only.
+    """
+    Message = apps.get_model('communication', 'Message')
+    Announcement = apps.get_model('communication', 'Announcement')
+    MeetingPoll = apps.get_model('communication', 'MeetingPoll')
+    return [
+        (TaskActivityLog.objects.all(), 'task__project_id', 'actor_id'),
+        (ProjectFileActivityLog.objects.all(), 'project_id', 'actor_id'),
+        (Message.objects.all(), 'channel__project_id', 'sender_id'),
+        (Announcement.objects.all(), 'project_id', 'author_id'),
+        (MeetingPoll.objects.all(), 'project_id', None),
+    ]
+
+
+def rebuild_activity_index(project_ids=None):
+    """Recompute the activity index from the source tables; returns the row count."""
+    latest = {}
+    for queryset, project_field, user_field in _activity_sources():
+        if project_ids is not None:
+            queryset = queryset.filter(**{f'{project_field}__in': project_ids})
+        group_fields = [project_field] + ([user_field] if user_field else [])
+        rows = queryset.order_by().values(*group_fields).annotate(latest=Max('created_at'))
+        for row in rows:
+            key = (row[project_field], row[user_field] if user_field else None)
+            if key not in latest or row['latest'] > latest[key]:
+                latest[key] = row['latest']
+
+    entries = [
+        ProjectActivityIndex(project_id=project_id, user_id=user_id, last_activity_at=timestamp)
+        for (project_id, user_id), timestamp in latest.items()
+        if timestamp
+    ]
+    with transaction.atomic():
+        existing = ProjectActivityIndex.objects.all()
+        if project_ids is not None:
+            existing = existing.filter(project_id__in=project_ids)
+        existing.delete()
+        ProjectActivityIndex.objects.bulk_create(entries, batch_size=500)
+    return len(entries)
@@ -5,7 +5,7 @@ from .api_views import (
     InvitationViewSet, ProjectTemplateViewSet, MilestoneTemplateViewSet,
     NotificationViewSet, SectionViewSet, TaskViewSet, TaskCommentViewSet, TaskAttachmentViewSet,
     FileFolderViewSet, ProjectFileViewSet, ProjectFileVersionViewSet, ProjectFileActivityLogViewSet,
-    ProjectTrashViewSet, CalendarEventViewSet
+    ProjectTrashViewSet, CalendarEventViewSet, calendar_ics_feed
 )
 
 router = DefaultRouter()
@@ -28,5 +28,6 @@ router.register(r'project-trash', ProjectTrashViewSet, basename='projecttrash')
 router.register(r'calendar-events', CalendarEventViewSet, basename='calendarevent')
 
 urlpatterns = [
+    path('calendar/<str:token>.ics', calendar_ics_feed, name='calendar-ics-feed'),
     path('', include(router.urls)),
 ]
@@ -1,8 +1,7 @@
 import os
 import mimetypes
 import re
-from decimal import Decimal
-from datetime import timedelta, date, datetime, time
+from datetime import timedelta, date, datetime
 
 from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
@@ -11,18 +10,19 @@ from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.exceptions import PermissionDenied, ValidationError
 from django.apps import apps
+from django.http import Http404, HttpResponseNotAllowed, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
-from django.db.models import Q, Sum, F, Count
+from django.db.models import Q, Sum, F, Count, Prefetch
+from django.urls import reverse
 from django.utils import timezone
+from django.utils.cache import get_conditional_response
 from django.db import transaction
-from django.core.mail import send_mail
-from django.conf import settings
 from .models import (
     Project, Team, TeamMembership, Milestone, Invitation, Notification,
     ProjectTemplate, MilestoneTemplate, Section, Task, SubTask, TaskAttachment,
-    TaskComment, TaskActivityLog, TaskNotification, FileFolder, ProjectFile, ProjectFileVersion,
+    TaskComment, TaskActivityLog, FileFolder, ProjectFile, ProjectFileVersion,
     ProjectFileActivityLog, ProjectTrash, DashboardWidget, ProjectSnapshot,
-    LecturerAlert, SubmissionChecklist, CalendarEvent
+    LecturerAlert, SubmissionChecklist, CalendarEvent, CalendarFeedToken
 )
 from .serializers import (
     ProjectSerializer, TeamSerializer, TeamMembershipSerializer,
@@ -32,53 +32,39 @@ from .serializers import (
     TaskAttachmentSerializer, TaskCommentSerializer, TaskActivityLogSerializer, TaskNotificationSerializer,
     FileFolderSerializer, ProjectFileSerializer, ProjectFileVersionSerializer, ProjectFileActivityLogSerializer,
     ProjectTrashSerializer, CalendarEventSerializer, LecturerAlertSerializer,
-    SubmissionChecklistSerializer
+    SubmissionChecklistSerializer, TASK_DETAIL_PREFETCHES, annotate_project_list
 )
+from .metrics import (
+    annotate_task_counters, cached_project_metrics, cached_project_metrics_map, invalidate_project_metrics,
+    member_last_activity_map, project_file_metrics_map, project_latest_activity_map,
+    project_task_metrics, project_task_metrics_map,
+)
+from .calendar_feed import calendar_events, calendar_feed, calendar_validators, render_ics
+from .memberships import membership_resolver
+from .invitations import expire_stale_invitations
+from .jobs import enqueue_job
+from .notifications import queue_project_notifications, send_notification_emails
+from .side_effects import PROJECT_STORAGE_QUOTA_BYTES
+from .timeline import InvalidCursor, TIMELINE_PAGE_SIZE, project_activity_page
+from communication.sync import sync_params, sync_payload
 from users.models import CustomUser
-from users.serializers import UserSerializer
+from users.serializers import USER_PROFILE_PREFETCH_LOOKUPS, UserSerializer, UserSummarySerializer
 
 
 def create_notification(*, recipients, notification_type, title, message, project=None, invitation=None, milestone=None):
-    normalized_recipients = []
-    for recipient in recipients:
-        if not recipient:
-            continue
-        if isinstance(recipient, int):
-            recipient = CustomUser.objects.filter(id=recipient).first()
-        if recipient:
-            normalized_recipients.append(recipient)
-
-    unique_recipients = {user.id: user for user in normalized_recipients}.values()
-    notifications = []
-    for recipient in unique_recipients:
-        notifications.append(
-            Notification(
-                recipient=recipient,
-                type=notification_type,
-                title=title,
-                message=message,
-                project=project,
-                invitation=invitation,
-                milestone=milestone,
-            )
-        )
-    Notification.objects.bulk_create(notifications)
+    queue_project_notifications(
+        recipients=recipients,
+        notification_type=notification_type,
+        title=title,
+        message=message,
+        project=project,
+        invitation=invitation,
+        milestone=milestone,
+    )
 
 
 def maybe_send_email(subject, message, recipient_list):
-    if not getattr(settings, 'ENABLE_EMAIL_NOTIFICATIONS', False):
-        return
-
-    if not recipient_list:
-        return
-
-    send_mail(
-        subject=subject,
-        message=message,
-        from_email=getattr(settings, 'DEFAULT_FROM_EMAIL', 'noreply@uniteam.local'),
-        recipient_list=recipient_list,
-        fail_silently=True,
-    )
+    send_notification_emails(subject, message, recipient_list)
 
 
 def _project_members(project):
@@ -90,12 +76,11 @@ def _project_member_user_ids(project):
 
 
 def _project_membership(project, user):
-    return TeamMembership.objects.filter(team=project.team, user=user).first()
+    return membership_resolver(user).membership(project)
 
 
 def _member_is_leadership(project, user):
-    membership = _project_membership(project, user)
-    return bool(membership and membership.role in [Team.Role.LEADER, Team.Role.CO_LEADER])
+    return membership_resolver(user).is_leadership(project)
 
 
 def _task_title(task):
@@ -103,31 +88,32 @@ def _task_title(task):
 
 
 def _log_task_activity(task, actor=None, action_type=TaskActivityLog.ActionType.DETAILS_UPDATED, old_value='', new_value='', reason=''):
-    return TaskActivityLog.objects.create(
-        task=task,
-        actor=actor,
-        action_type=action_type,
-        old_value=str(old_value),
-        new_value=str(new_value),
-        reason=reason,
-    )
+    enqueue_job('projects.log_task_activity', {
+        'task': task.id,
+        'actor': actor.id if actor else None,
+        'action_type': action_type,
+        'old_value': str(old_value),
+        'new_value': str(new_value),
+        'reason': reason,
+        'occurred_at': timezone.now(),
+    })
 
 
 def _notify_task(*, task, recipients, notification_type, title, message):
-    create_notification(
+    queue_project_notifications(
         recipients=recipients,
         notification_type=notification_type,
         title=title,
         message=message,
-        project=task.project,
+        project=task.project_id,
+        task=task,
     )
-    for recipient in {user.id: user for user in recipients if user}.values():
-        TaskNotification.objects.create(
-            recipient=recipient,
-            task=task,
-            notification_type=notification_type,
-            message=message,
-        )
+
+
+def _prefetch_expanded_task_fields(queryset, request):
+    """Prefetch the nested task lists a ``?expand=`` request asks TaskSerializer for."""
+    expanded = {name.strip() for name in (request.query_params.get('expand') or '').split(',')}
+    return queryset.prefetch_related(*[lookup for name, lookup in TASK_DETAIL_PREFETCHES.items() if name in expanded])
 
 
 def _task_progress_from_status(task):
@@ -143,21 +129,7 @@ def _task_progress_from_status(task):
 
 
 def _project_task_progress(project):
-    tasks = Task.objects.filter(project=project, is_cancelled=False)
-    total = tasks.count()
-    if total == 0:
-        return 0
-
-    weighted_total = Decimal('0')
-    for task in tasks:
-        if task.status == Task.Status.DONE:
-            weighted_total += Decimal('1')
-        elif task.status == Task.Status.IN_PROGRESS:
-            weighted_total += Decimal(str((task.progress_percentage or 0) / 100))
-        elif task.status == Task.Status.UNDER_REVIEW:
-            weighted_total += Decimal(str(max(task.progress_percentage or 75, 75) / 100))
-
-    return int(round((weighted_total / Decimal(str(total))) * Decimal('100')))
+    return cached_project_metrics(project)['progress_percentage']
 
 
 def _project_days_remaining(project):
@@ -172,41 +144,11 @@ def _project_time_elapsed_percent(project):
 
 
 def _project_task_status_counts(project):
-    tasks = project.tasks.filter(is_cancelled=False)
-    return {
-        'TODO': tasks.filter(status=Task.Status.TODO).count(),
-        'IN_PROGRESS': tasks.filter(status=Task.Status.IN_PROGRESS).count(),
-        'UNDER_REVIEW': tasks.filter(status=Task.Status.UNDER_REVIEW).count(),
-        'DONE': tasks.filter(status=Task.Status.DONE).count(),
-        'BLOCKED': tasks.filter(status=Task.Status.BLOCKED).count(),
-        'CANCELLED': project.tasks.filter(status=Task.Status.CANCELLED).count(),
-    }
+    return project_task_metrics(project)['status_counts']
 
 
 def _latest_project_activity_at(project):
-    timestamps = [project.updated_at]
-    latest_task_activity = TaskActivityLog.objects.filter(task__project=project).order_by('-created_at').values_list('created_at', flat=True).first()
-    latest_file_activity = ProjectFileActivityLog.objects.filter(project=project).order_by('-created_at').values_list('created_at', flat=True).first()
-    if latest_task_activity:
-        timestamps.append(latest_task_activity)
-    if latest_file_activity:
-        timestamps.append(latest_file_activity)
-
-    Message = apps.get_model('communication', 'Message')
-    Announcement = apps.get_model('communication', 'Announcement')
-    MeetingPoll = apps.get_model('communication', 'MeetingPoll')
-
-    latest_message = Message.objects.filter(channel__project=project).order_by('-created_at').values_list('created_at', flat=True).first()
-    latest_announcement = Announcement.objects.filter(project=project).order_by('-created_at').values_list('created_at', flat=True).first()
-    latest_meeting = MeetingPoll.objects.filter(project=project).order_by('-created_at').values_list('created_at', flat=True).first()
-    if latest_message:
-        timestamps.append(latest_message)
-    if latest_announcement:
-        timestamps.append(latest_announcement)
-    if latest_meeting:
-        timestamps.append(latest_meeting)
-
-    return max([ts for ts in timestamps if ts], default=project.updated_at)
+    return project_latest_activity_map([project])[project.id]
 
 
 def _project_section_breakdown(project):
@@ -234,22 +176,10 @@ def _project_section_breakdown(project):
     return sections
 
 
-def _member_last_activity(project, member):
-    timestamps = [
-        TaskActivityLog.objects.filter(task__project=project, actor=member).order_by('-created_at').values_list('created_at', flat=True).first(),
-        ProjectFileActivityLog.objects.filter(project=project, actor=member).order_by('-created_at').values_list('created_at', flat=True).first(),
-    ]
-
-    Message = apps.get_model('communication', 'Message')
-    Announcement = apps.get_model('communication', 'Announcement')
-    timestamps.append(Message.objects.filter(channel__project=project, sender=member).order_by('-created_at').values_list('created_at', flat=True).first())
-    timestamps.append(Announcement.objects.filter(project=project, author=member).order_by('-created_at').values_list('created_at', flat=True).first())
-    return max([ts for ts in timestamps if ts], default=None)
-
-
 def _team_contribution(project):
     contributions = []
     memberships = TeamMembership.objects.filter(team=project.team).select_related('user')
+    member_activity = member_last_activity_map([project.id])
     for membership in memberships:
         user = membership.user
         assigned_tasks = project.tasks.filter(assigned_to=user, is_cancelled=False)
@@ -259,7 +189,7 @@ def _team_contribution(project):
         completed_count = completed_tasks.count()
         on_time_rate = int(round((on_time_completed / completed_count) * 100)) if completed_count else 0
         current_active = assigned_tasks.filter(status__in=[Task.Status.TODO, Task.Status.IN_PROGRESS]).count()
-        last_activity = _member_last_activity(project, user)
+        last_activity = member_activity.get((project.id, user.id))
         stale_days = None
         if last_activity:
             stale_days = (timezone.now() - last_activity).days
@@ -272,7 +202,7 @@ def _team_contribution(project):
 
         contributions.append({
             'membership_id': membership.id,
-            'member': UserSerializer(user).data,
+            'member': UserSummarySerializer(user).data,
             'role': membership.role,
             'tasks_assigned': assigned_tasks.count(),
             'tasks_completed': completed_count,
@@ -285,18 +215,33 @@ def _team_contribution(project):
     return contributions
 
 
-def _submission_checklist_payload(project):
-    all_tasks = project.tasks.filter(is_cancelled=False)
-    active_members = TeamMembership.objects.filter(team=project.team).select_related('user')
-    has_final_file = project.project_files.filter(is_deleted=False, tag=ProjectFile.Tag.FINAL).exists()
-    only_closable_statuses = all_tasks.exclude(status__in=[Task.Status.DONE, Task.Status.CANCELLED, Task.Status.UNDER_REVIEW]).count() == 0
+def _submission_checklist_payload(project, metrics=None, has_final_file=None, memberships=None, member_activity=None):
+    """Build the submission checklist.
+
+    The dashboard passes precomputed task metrics, final-file flag, memberships
+    and a {(project_id, user_id): timestamp} activity map; anything omitted is
+    looked up for this project alone.
+    """
+    if metrics is None:
+        metrics = project_task_metrics(project)
+    if has_final_file is None:
+        has_final_file = project.project_files.filter(is_deleted=False, tag=ProjectFile.Tag.FINAL).exists()
+    if memberships is None:
+        memberships = TeamMembership.objects.filter(team=project.team).select_related('user')
+    if member_activity is None:
+        member_activity = member_last_activity_map([project.id])
+
+    status_counts = metrics['status_counts']
+    only_closable_statuses = not any(
+        status_counts[key] for key in [Task.Status.TODO, Task.Status.IN_PROGRESS, Task.Status.BLOCKED]
+    )
     description_filled = bool((project.description or '').strip())
     lecturer_assigned = bool(project.supervisor_id)
 
     now = timezone.now()
     all_members_active = True
-    for membership in active_members:
-        last_activity = _member_last_activity(project, membership.user)
+    for membership in memberships:
+        last_activity = member_activity.get((project.id, membership.user_id))
         if not last_activity or (now - last_activity).days > 7:
             all_members_active = False
             break
@@ -351,7 +296,8 @@ def _upsert_submission_checklist(project, checklist_items, override_item_types=N
 
 
 def _project_burndown_payload(project):
-    snapshots = list(project.snapshots.order_by('snapshot_date'))
+    # Backfilled snapshots repeat a later task state, so they are not real history.
+    snapshots = list(project.snapshots.filter(is_backfilled=False).order_by('snapshot_date'))
     total_tasks = project.tasks.filter(is_cancelled=False).count()
     start_date = timezone.localtime(project.created_at).date() if project.created_at else timezone.localdate()
     end_date = project.deadline
@@ -394,73 +340,22 @@ def _project_burndown_payload(project):
     }
 
 
-def _project_activity_timeline(project, activity_type='ALL', start_date=None, end_date=None):
-    entries = []
-
-    if activity_type in ['ALL', 'TASKS']:
-        for log in TaskActivityLog.objects.filter(task__project=project).select_related('task', 'actor').order_by('-created_at')[:80]:
-            entries.append({
-                'type': 'TASK',
-                'timestamp': log.created_at,
-                'label': f"{log.actor.get_full_name() or log.actor.username if log.actor else 'System'} {log.get_action_type_display().lower()} task \"{log.task.title}\"",
-                'task_id': log.task_id,
-            })
-
-    if activity_type in ['ALL', 'FILES']:
-        for log in ProjectFileActivityLog.objects.filter(project=project).select_related('file', 'actor').order_by('-created_at')[:80]:
-            actor_name = log.actor.get_full_name() or log.actor.username if log.actor else 'System'
-            entries.append({
-                'type': 'FILE',
-                'timestamp': log.created_at,
-                'label': f"{actor_name} {log.get_action_type_display().lower()} \"{log.file.display_name}\"",
-                'file_id': log.file_id,
-            })
-
-    if activity_type in ['ALL', 'COMMUNICATION']:
-        Announcement = apps.get_model('communication', 'Announcement')
-        Message = apps.get_model('communication', 'Message')
-        MeetingPoll = apps.get_model('communication', 'MeetingPoll')
-
-        for announcement in Announcement.objects.filter(project=project).select_related('author').order_by('-created_at')[:40]:
-            entries.append({
-                'type': 'COMMUNICATION',
-                'timestamp': announcement.created_at,
-                'label': f"{announcement.author.get_full_name() or announcement.author.username} posted an announcement",
-                'announcement_id': announcement.id,
-            })
-        for message in Message.objects.filter(channel__project=project).select_related('sender').order_by('-created_at')[:60]:
-            entries.append({
-                'type': 'COMMUNICATION',
-                'timestamp': message.created_at,
-                'label': f"{message.sender.get_full_name() or message.sender.username} sent a channel message",
-                'message_id': message.id,
-            })
-        for poll in MeetingPoll.objects.filter(project=project).select_related('created_by').order_by('-created_at')[:30]:
-            entries.append({
-                'type': 'COMMUNICATION',
-                'timestamp': poll.created_at,
-                'label': f"{poll.created_by.get_full_name() or poll.created_by.username} created meeting poll \"{poll.title}\"",
-                'meeting_poll_id': poll.id,
-            })
-
-    if start_date:
-        entries = [entry for entry in entries if entry['timestamp'].date() >= start_date]
-    if end_date:
-        entries = [entry for entry in entries if entry['timestamp'].date() <= end_date]
-
-    entries.sort(key=lambda item: item['timestamp'], reverse=True)
-    return entries[:120]
-
-
-def _project_at_risk_conditions(project):
+def _project_at_risk_conditions(project, metrics=None, latest_activity=None, has_final_file=None):
     now = timezone.now()
-    progress = _project_task_progress(project)
+    metrics = metrics or project_task_metrics(project, now=now)
+    progress = metrics['progress_percentage']
     elapsed = _project_time_elapsed_percent(project)
-    overdue_count = project.tasks.filter(is_cancelled=False).exclude(status=Task.Status.DONE).filter(deadline__lt=now).count()
-    latest_activity = _latest_project_activity_at(project)
+    overdue_count = metrics['overdue_tasks']
+    if latest_activity is None:
+        latest_activity = _latest_project_activity_at(project)
     inactive = latest_activity is None or (now - latest_activity) > timedelta(hours=48)
-    stale_blocked = project.tasks.filter(status=Task.Status.BLOCKED, updated_at__lte=now - timedelta(hours=24)).exists()
-    no_final_file_near_deadline = _project_days_remaining(project) < 3 and not project.project_files.filter(is_deleted=False, tag=ProjectFile.Tag.FINAL).exists()
+    stale_blocked = metrics['stale_blocked_tasks'] > 0
+    if _project_days_remaining(project) < 3:
+        if has_final_file is None:
+            has_final_file = project.project_files.filter(is_deleted=False, tag=ProjectFile.Tag.FINAL).exists()
+        no_final_file_near_deadline = not has_final_file
+    else:
+        no_final_file_near_deadline = False
 
     conditions = []
     if progress < 30 and elapsed > 50:
@@ -491,7 +386,6 @@ ALLOWED_FILE_EXTENSIONS = {
     '.pdf', '.doc', '.docx', '.txt', '.odt', '.xlsx', '.xls', '.csv', '.pptx', '.ppt', '.jpg', '.jpeg', '.png', '.gif', '.webp', '.zip'
 }
 MAX_FILE_SIZE_BYTES = 50 * 1024 * 1024
-PROJECT_STORAGE_QUOTA_BYTES = 500 * 1024 * 1024
 
 
 def _normalise_file_name(file_name):
@@ -526,28 +420,6 @@ def _project_file_storage_usage(project):
     return project.project_files.filter(is_deleted=False).aggregate(total=Sum('file_size')).get('total') or 0
 
 
-def expire_stale_invitations_for_queryset(queryset):
-    now = timezone.now()
-    stale = queryset.filter(status=Invitation.Status.PENDING, expires_at__lte=now).select_related('project', 'sender', 'receiver')
-    expired_count = 0
-
-    for invitation in stale:
-        invitation.status = Invitation.Status.EXPIRED
-        invitation.save(update_fields=['status'])
-        expired_count += 1
-        recipients = [invitation.sender, invitation.receiver]
-        create_notification(
-            recipients=recipients,
-            notification_type=Notification.Type.INVITATION_EXPIRED,
-            title='Invitation expired',
-            message=f'Invitation for project "{invitation.project.title}" has expired.',
-            project=invitation.project,
-            invitation=invitation,
-        )
-
-    return expired_count
-
-
 class ProjectViewSet(viewsets.ModelViewSet):
     """API endpoint for projects"""
     queryset = Project.objects.all()
@@ -559,16 +431,20 @@ class ProjectViewSet(viewsets.ModelViewSet):
         
         # Students see projects they're members of
         if user.role == CustomUser.Role.STUDENT:
-            user_teams = user.teammembership_set.all()
-            project_ids = [tm.team.project.id for tm in user_teams]
-            return Project.objects.filter(id__in=project_ids).order_by('deadline', '-created_at')
+            project_ids = user.teammembership_set.values_list('team__project_id', flat=True)
+            queryset = Project.objects.filter(id__in=project_ids).order_by('deadline', '-created_at')
         
         # Lecturers see projects they supervise
         elif user.role == CustomUser.Role.LECTURER:
-            return Project.objects.filter(supervisor=user).order_by('deadline', '-created_at')
+            queryset = Project.objects.filter(supervisor=user).order_by('deadline', '-created_at')
         
         # Admins see all
-        return Project.objects.all().order_by('deadline', '-created_at')
+        else:
+            queryset = Project.objects.all().order_by('deadline', '-created_at')
+
+        if self.action in ['list', 'retrieve']:
+            queryset = annotate_project_list(queryset, user)
+        return queryset
     
     def perform_create(self, serializer):
         """Create project and assign creator as leader"""
@@ -599,7 +475,7 @@ class ProjectViewSet(viewsets.ModelViewSet):
                 )
 
     def _requester_membership(self, project, user):
-        return TeamMembership.objects.filter(team=project.team, user=user).first()
+        return _project_membership(project, user)
 
     def _assert_leader_or_coleader(self, project, user):
         membership = self._requester_membership(project, user)
@@ -628,7 +504,10 @@ class ProjectViewSet(viewsets.ModelViewSet):
         """Return the project task board payload for the kanban/list views."""
         project = self.get_object()
         sections = project.sections.all().order_by('order', 'created_at')
-        tasks = project.tasks.select_related('section', 'assigned_to', 'created_by').prefetch_related('subtasks', 'comments', 'attachments', 'activity_logs')
+        tasks = _prefetch_expanded_task_fields(
+            annotate_task_counters(project.tasks.select_related('project', 'section', 'assigned_to', 'created_by')),
+            request,
+        )
 
         if not sections.exists():
             default_section = {
@@ -637,7 +516,7 @@ class ProjectViewSet(viewsets.ModelViewSet):
                 'name': 'General',
                 'order': 0,
                 'created_at': project.created_at,
-                'task_count': tasks.filter(section__isnull=True, is_cancelled=False).count(),
+                'task_count': project.tasks.filter(section__isnull=True, is_cancelled=False).count(),
             }
             section_data = [default_section]
         else:
@@ -648,10 +527,10 @@ class ProjectViewSet(viewsets.ModelViewSet):
 
         workload = []
         for membership in project.team.teammembership_set.select_related('user').all():
-            member_tasks = tasks.filter(assigned_to=membership.user, is_cancelled=False)
+            member_tasks = project.tasks.filter(assigned_to=membership.user, is_cancelled=False)
             workload.append({
                 'membership_id': membership.id,
-                'user': UserSerializer(membership.user).data,
+                'user': UserSummarySerializer(membership.user).data,
                 'role': membership.role,
                 'active_tasks': member_tasks.exclude(status=Task.Status.DONE).count(),
                 'due_this_week': member_tasks.filter(
@@ -695,21 +574,33 @@ class ProjectViewSet(viewsets.ModelViewSet):
         project_ids = [project.id for project in projects]
 
         my_tasks_qs = Task.objects.filter(assigned_to=user, project_id__in=project_ids, is_cancelled=False).exclude(status=Task.Status.DONE)
-        overdue_tasks = my_tasks_qs.filter(deadline__lt=now).order_by('deadline')
-        due_soon_tasks = my_tasks_qs.filter(deadline__gte=now, deadline__lte=end_due_soon).order_by('deadline')
-        upcoming_tasks = my_tasks_qs.filter(deadline__gt=end_due_soon).order_by('deadline')
-        completed_tasks = Task.objects.filter(assigned_to=user, project_id__in=project_ids, status=Task.Status.DONE).order_by('-completed_at')[:20]
-
+        task_list_qs = _prefetch_expanded_task_fields(
+            annotate_task_counters(my_tasks_qs.select_related('project', 'section', 'assigned_to', 'created_by')),
+            request,
+        )
+        overdue_tasks = task_list_qs.filter(deadline__lt=now).order_by('deadline')
+        due_soon_tasks = task_list_qs.filter(deadline__gte=now, deadline__lte=end_due_soon).order_by('deadline')
+        upcoming_tasks = task_list_qs.filter(deadline__gt=end_due_soon).order_by('deadline')
+        completed_tasks = _prefetch_expanded_task_fields(
+            annotate_task_counters(
+                Task.objects.filter(assigned_to=user, project_id__in=project_ids, status=Task.Status.DONE)
+                .select_related('project', 'section', 'assigned_to', 'created_by')
+                .order_by('-completed_at')
+            ),
+            request,
+        )[:20]
+
+        task_metrics = cached_project_metrics_map(project_ids)
         project_cards = []
         for project in sorted(projects, key=lambda p: p.deadline):
-            membership = TeamMembership.objects.filter(team=project.team, user=user).first() if hasattr(project, 'team') else None
+            membership = _project_membership(project, user)
             incomplete_assigned_count = Task.objects.filter(project=project, assigned_to=user, is_cancelled=False).exclude(status=Task.Status.DONE).count()
             project_cards.append({
                 'id': project.id,
                 'title': project.title,
                 'course_code': project.course_code,
                 'role': membership.role if membership else ('SUPERVISOR' if project.supervisor_id == user.id else 'VIEWER'),
-                'progress_percentage': _project_task_progress(project),
+                'progress_percentage': task_metrics[project.id]['progress_percentage'],
                 'days_remaining': _project_days_remaining(project),
                 'deadline': project.deadline,
                 'deadline_status': 'RED' if _project_days_remaining(project) < 3 else ('AMBER' if _project_days_remaining(project) <= 7 else 'GREEN'),
@@ -718,10 +609,7 @@ class ProjectViewSet(viewsets.ModelViewSet):
                 'lifecycle_status': project.lifecycle_status,
             })
 
-        activity_feed = []
-        for project in projects:
-            activity_feed.extend(_project_activity_timeline(project, activity_type='ALL')[:8])
-        activity_feed.sort(key=lambda item: item['timestamp'], reverse=True)
+        activity_feed, _ = project_activity_page(project_ids, limit=20)
 
         calendar_items = []
         event_queryset = CalendarEvent.objects.filter(project_id__in=project_ids)
@@ -748,13 +636,13 @@ class ProjectViewSet(viewsets.ModelViewSet):
                 'upcoming': TaskSerializer(upcoming_tasks[:100], many=True, context={'request': request}).data,
                 'completed': TaskSerializer(completed_tasks, many=True, context={'request': request}).data,
             },
-            'activity_feed': activity_feed[:20],
+            'activity_feed': activity_feed,
             'calendar_items': calendar_items,
             'notifications_preview': NotificationSerializer(unread_notifications, many=True).data,
             'summary': {
                 'due_today_count': my_tasks_qs.filter(deadline__date=timezone.localdate()).count(),
                 'active_project_count': len(projects),
-                'overdue_count': overdue_tasks.count(),
+                'overdue_count': my_tasks_qs.filter(deadline__lt=now).count(),
             },
         })
 
@@ -763,69 +651,89 @@ class ProjectViewSet(viewsets.ModelViewSet):
         if request.user.role != CustomUser.Role.LECTURER:
             return Response({'error': 'Only lecturers can access this dashboard'}, status=status.HTTP_403_FORBIDDEN)
 
-        projects = Project.objects.filter(supervisor=request.user).prefetch_related('team__teammembership_set__user').order_by('course_code', 'deadline')
+        projects = list(
+            Project.objects.filter(supervisor=request.user)
+            .select_related('team')
+            .prefetch_related('team__teammembership_set')
+            .order_by('course_code', 'deadline')
+        )
+        project_ids = [project.id for project in projects]
+        now = timezone.now()
+        task_metrics = project_task_metrics_map(project_ids, now=now)
+        file_metrics = project_file_metrics_map(project_ids)
+        latest_activity = project_latest_activity_map(projects)
+        member_activity = member_last_activity_map(project_ids)
+        existing_alerts = {
+            (alert.project_id, alert.alert_type): alert
+            for alert in LecturerAlert.objects.filter(lecturer=request.user, project_id__in=project_ids, is_resolved=False)
+        }
+
         grouped = {}
         comparison_rows = []
-        active_alert_ids = []
+        readiness = []
+        new_alerts = []
+        changed_alerts = []
+        kept_alert_keys = set()
 
         for project in projects:
             course_code = project.course_code or 'UNASSIGNED'
             grouped.setdefault(course_code, []).append(project.id)
 
-            statuses = _project_task_status_counts(project)
-            total_tasks = project.tasks.filter(is_cancelled=False).count()
-            done_tasks = statuses['DONE']
-            overdue_tasks = project.tasks.filter(is_cancelled=False).exclude(status=Task.Status.DONE).filter(deadline__lt=timezone.now()).count()
-            final_files = project.project_files.filter(is_deleted=False, tag=ProjectFile.Tag.FINAL).count()
-            latest_activity = _latest_project_activity_at(project)
-            progress = _project_task_progress(project)
-            member_count = TeamMembership.objects.filter(team=project.team).count()
+            metrics = task_metrics[project.id]
+            files = file_metrics[project.id]
+            memberships = project.team.teammembership_set.all()
+            progress = metrics['progress_percentage']
+            conditions = _project_at_risk_conditions(
+                project,
+                metrics,
+                latest_activity=latest_activity[project.id],
+                has_final_file=files['has_final_file'],
+            )
             comparison_rows.append({
                 'project_id': project.id,
                 'project_name': project.title,
                 'course_code': project.course_code,
-                'members_count': member_count,
+                'members_count': len(memberships),
                 'overall_progress_percentage': progress,
                 'tasks': {
-                    'total': total_tasks,
-                    'done': done_tasks,
-                    'overdue': overdue_tasks,
+                    'total': metrics['total_tasks'],
+                    'done': metrics['status_counts']['DONE'],
+                    'overdue': metrics['overdue_tasks'],
                 },
                 'files': {
-                    'total': project.project_files.filter(is_deleted=False).count(),
-                    'finals_uploaded': final_files,
+                    'total': files['total_files'],
+                    'finals_uploaded': files['final_files'],
                 },
-                'last_activity': latest_activity,
+                'last_activity': latest_activity[project.id],
                 'submission_deadline': project.deadline,
                 'status': 'Submitted' if project.lifecycle_status == Project.LifecycleStatus.SUBMITTED else (
-                    'At Risk' if _project_at_risk_conditions(project) else ('Not Started' if progress == 0 else 'On Track')
+                    'At Risk' if conditions else ('Not Started' if progress == 0 else 'On Track')
                 ),
                 'lifecycle_status': project.lifecycle_status,
             })
 
-            conditions = _project_at_risk_conditions(project)
             for alert_type, message in conditions:
-                alert, _ = LecturerAlert.objects.get_or_create(
-                    lecturer=request.user,
-                    project=project,
-                    alert_type=alert_type,
-                    is_resolved=False,
-                    defaults={'alert_message': message},
-                )
-                if alert.alert_message != message:
+                key = (project.id, alert_type)
+                kept_alert_keys.add(key)
+                alert = existing_alerts.get(key)
+                if alert is None:
+                    new_alerts.append(LecturerAlert(
+                        lecturer=request.user,
+                        project=project,
+                        alert_type=alert_type,
+                        alert_message=message,
+                    ))
+                elif alert.alert_message != message:
                     alert.alert_message = message
-                    alert.save(update_fields=['alert_message'])
-                active_alert_ids.append(alert.id)
-
-            LecturerAlert.objects.filter(
-                lecturer=request.user,
-                project=project,
-                is_resolved=False,
-            ).exclude(id__in=active_alert_ids).update(is_resolved=True, resolved_at=timezone.now())
-
-        readiness = []
-        for project in projects:
-            checks = _submission_checklist_payload(project)
+                    changed_alerts.append(alert)
+
+            checks = _submission_checklist_payload(
+                project,
+                metrics=metrics,
+                has_final_file=files['has_final_file'],
+                memberships=memberships,
+                member_activity=member_activity,
+            )
             readiness.append({
                 'project_id': project.id,
                 'project_name': project.title,
@@ -833,12 +741,27 @@ class ProjectViewSet(viewsets.ModelViewSet):
                 'is_submission_ready': all(item['is_passed'] for item in checks),
             })
 
-        alerts = LecturerAlert.objects.filter(lecturer=request.user, is_resolved=False).select_related('project').order_by('-triggered_at')
+        if new_alerts:
+            LecturerAlert.objects.bulk_create(new_alerts)
+        if changed_alerts:
+            LecturerAlert.objects.bulk_update(changed_alerts, ['alert_message'])
+        resolved_alert_ids = [alert.id for key, alert in existing_alerts.items() if key not in kept_alert_keys]
+        if resolved_alert_ids:
+            LecturerAlert.objects.filter(id__in=resolved_alert_ids).update(is_resolved=True, resolved_at=now)
+
+        alerts = list(
+            LecturerAlert.objects.filter(lecturer=request.user, is_resolved=False)
+            .prefetch_related(Prefetch('project', queryset=annotate_project_list(Project.objects.all(), request.user)))
+            .order_by('-triggered_at')
+        )
+        for alert in alerts:
+            if alert.project_id in task_metrics:
+                alert.project._task_metrics = task_metrics[alert.project_id]
         grouped_payload = []
-        for course_code, project_ids in grouped.items():
+        for course_code, course_project_ids in grouped.items():
             grouped_payload.append({
                 'course_code': course_code,
-                'project_ids': project_ids,
+                'project_ids': course_project_ids,
             })
 
         return Response({
@@ -852,13 +775,14 @@ class ProjectViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['get'], url_path='analytics')
     def analytics(self, request, pk=None):
         project = self.get_object()
-        statuses = _project_task_status_counts(project)
-        total_tasks = project.tasks.filter(is_cancelled=False).count()
+        metrics = cached_project_metrics(project)
+        statuses = metrics['status_counts']
+        total_tasks = metrics['total_tasks']
         days_remaining = _project_days_remaining(project)
-        progress = _project_task_progress(project)
+        progress = metrics['progress_percentage']
         time_elapsed = _project_time_elapsed_percent(project)
-        overdue = project.tasks.filter(is_cancelled=False).exclude(status=Task.Status.DONE).filter(deadline__lt=timezone.now()).count()
-        blocked = project.tasks.filter(status=Task.Status.BLOCKED).count()
+        overdue = metrics['overdue_tasks']
+        blocked = metrics['blocked_tasks']
 
         contribution = _team_contribution(project)
         team_health = 'All Active'
@@ -907,11 +831,11 @@ class ProjectViewSet(viewsets.ModelViewSet):
             'upcoming_confirmed_meetings': MeetingPoll.objects.filter(project=project, confirmed_slot__start_datetime__gte=timezone.now()).count(),
         }
 
-        storage_used = _project_file_storage_usage(project)
+        storage_used = metrics['storage_used_bytes']
         latest_file = project.project_files.filter(is_deleted=False).order_by('-upload_timestamp').first()
         file_summary = {
             'uploaded_last_7_days': project.project_files.filter(is_deleted=False, upload_timestamp__gte=timezone.now() - timedelta(days=7)).count(),
-            'final_files_count': project.project_files.filter(is_deleted=False, tag=ProjectFile.Tag.FINAL).count(),
+            'final_files_count': metrics['final_files'],
             'most_recent_file': ProjectFileSerializer(latest_file, context={'request': request}).data if latest_file else None,
             'storage_used_bytes': storage_used,
             'storage_quota_bytes': PROJECT_STORAGE_QUOTA_BYTES,
@@ -937,7 +861,7 @@ class ProjectViewSet(viewsets.ModelViewSet):
                 'completed_tasks': statuses['DONE'],
                 'overdue_tasks': overdue,
                 'blocked_tasks': blocked,
-                'files_uploaded': project.project_files.filter(is_deleted=False).count(),
+                'files_uploaded': metrics['total_files'],
                 'days_to_deadline': days_remaining,
             },
             'task_progress_breakdown': statuses,
@@ -969,7 +893,24 @@ class ProjectViewSet(viewsets.ModelViewSet):
             except ValueError:
                 return Response({'error': 'Invalid end_date format. Use YYYY-MM-DD.'}, status=status.HTTP_400_BAD_REQUEST)
 
-        return Response(_project_activity_timeline(project, activity_type=activity_type, start_date=start_date, end_date=end_date))
+        try:
+            limit = int(request.query_params.get('limit') or TIMELINE_PAGE_SIZE)
+        except ValueError:
+            return Response({'error': 'limit must be a number'}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            entries, next_cursor = project_activity_page(
+                [project.id],
+                activity_type=activity_type,
+                start_date=start_date,
+                end_date=end_date,
+                cursor=request.query_params.get('cursor'),
+                limit=limit,
+            )
+        except InvalidCursor as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({'results': entries, 'next_cursor': next_cursor})
 
     @action(detail=True, methods=['get'])
     def submission_checklist(self, request, pk=None):
@@ -995,7 +936,7 @@ class ProjectViewSet(viewsets.ModelViewSet):
         if not course_code:
             return Response([])
 
-        projects = Project.objects.filter(course_code__iexact=course_code).select_related('supervisor').order_by('deadline', '-created_at')
+        projects = annotate_project_list(Project.objects.filter(course_code__iexact=course_code), request.user).order_by('deadline', '-created_at')
         serializer = ProjectSerializer(projects, many=True, context={'request': request})
         return Response(serializer.data)
 
@@ -1109,7 +1050,7 @@ class ProjectViewSet(viewsets.ModelViewSet):
                 | Q(email__icontains=q)
             )
 
-        serializer = UserSerializer(students[:50], many=True)
+        serializer = UserSerializer(students.prefetch_related(*USER_PROFILE_PREFETCH_LOOKUPS)[:50], many=True)
         return Response(serializer.data)
 
     @action(detail=True, methods=['post'])
@@ -1263,6 +1204,7 @@ class ProjectViewSet(viewsets.ModelViewSet):
             cancelled_at=timezone.now(),
             cancellation_reason='Project archived',
         )
+        invalidate_project_metrics(project.id)
 
         recipients = list(project.team.members.all())
         if project.supervisor:
@@ -1404,7 +1346,7 @@ class TeamMembershipViewSet(viewsets.ModelViewSet):
 
     def destroy(self, request, *args, **kwargs):
         membership = self.get_object()
-        requester_membership = TeamMembership.objects.filter(team=membership.team, user=request.user).first()
+        requester_membership = _project_membership(membership.team.project_id, request.user)
 
         requester_is_admin = request.user.role == CustomUser.Role.ADMIN
         requester_is_target = membership.user_id == request.user.id
@@ -1520,8 +1462,11 @@ class TaskViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        queryset = Task.objects.select_related('project', 'project__supervisor', 'section', 'assigned_to', 'created_by')\
-            .prefetch_related('subtasks', 'comments', 'attachments', 'activity_logs')
+        queryset = annotate_task_counters(Task.objects.select_related('project', 'section', 'assigned_to', 'created_by'))
+        if self.action != 'list':
+            queryset = queryset.prefetch_related(*TASK_DETAIL_PREFETCHES.values())
+        else:
+            queryset = _prefetch_expanded_task_fields(queryset, self.request)
         project_id = self.request.query_params.get('project')
         section_id = self.request.query_params.get('section')
         status_filter = self.request.query_params.get('status')
@@ -1551,6 +1496,11 @@ class TaskViewSet(viewsets.ModelViewSet):
         member_project_ids = user.teammembership_set.values_list('team__project_id', flat=True)
         return queryset.filter(project_id__in=member_project_ids)
 
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['detail'] = self.action != 'list'
+        return context
+
     def _assert_task_permission(self, task, allow_assigned=False):
         if self.request.user.role == CustomUser.Role.ADMIN:
             return
@@ -1792,7 +1742,7 @@ class TaskCommentViewSet(viewsets.ModelViewSet):
 
     def perform_create(self, serializer):
         task = serializer.validated_data['task']
-        if not (_member_is_leadership(task.project, self.request.user) or TeamMembership.objects.filter(team=task.project.team, user=self.request.user).exists()):
+        if not membership_resolver(self.request.user).is_member(task.project_id):
             raise PermissionDenied('You do not have permission to comment on this task')
 
         comment = serializer.save(author=self.request.user)
@@ -1841,7 +1791,7 @@ class TaskAttachmentViewSet(viewsets.ModelViewSet):
 
     def perform_create(self, serializer):
         task = serializer.validated_data['task']
-        if not (_member_is_leadership(task.project, self.request.user) or TeamMembership.objects.filter(team=task.project.team, user=self.request.user).exists()):
+        if not membership_resolver(self.request.user).is_member(task.project_id):
             raise PermissionDenied('You do not have permission to attach files to this task')
 
         uploaded_file = self.request.FILES.get('file')
@@ -2031,43 +1981,21 @@ class ProjectFileViewSet(viewsets.ModelViewSet):
     def _ensure_upload_permission(self, project):
         if self.request.user.role == CustomUser.Role.ADMIN:
             return
-        if not TeamMembership.objects.filter(team=project.team, user=self.request.user).exists():
+        if not membership_resolver(self.request.user).is_member(project):
             raise PermissionDenied('You do not have permission to upload files to this project')
 
     def _create_activity(self, file_obj, action_type, metadata=None):
-        ProjectFileActivityLog.objects.create(
-            project=file_obj.project,
-            file=file_obj,
-            actor=self.request.user,
-            action_type=action_type,
-            metadata=metadata or {},
-        )
-
-    def _project_total_usage(self, project):
-        current_usage = _project_file_storage_usage(project)
-        return current_usage
+        enqueue_job('projects.log_file_activity', {
+            'project': file_obj.project_id,
+            'file': file_obj.id,
+            'actor': self.request.user.id,
+            'action_type': action_type,
+            'metadata': metadata or {},
+            'occurred_at': timezone.now(),
+        })
 
-    def _quota_warning_recipients(self, project):
-        owner = self._project_owner(project)
-        recipients = [owner.user] if owner else []
-        if project.supervisor:
-            recipients.append(project.supervisor)
-        return recipients
-
-    def _maybe_warn_quota(self, project, before_usage, after_usage):
-        quota = PROJECT_STORAGE_QUOTA_BYTES
-        thresholds = [0.8, 0.95]
-        for threshold in thresholds:
-            crossed = before_usage < quota * threshold <= after_usage
-            if crossed:
-                label = f'{int(threshold * 100)}%'
-                create_notification(
-                    recipients=self._quota_warning_recipients(project),
-                    notification_type=Notification.Type.FILE_QUOTA_WARNING,
-                    title='Project storage quota warning',
-                    message=f'Project "{project.title}" has reached {label} of its storage quota.',
-                    project=project,
-                )
+    def _maybe_warn_quota(self, project, before_usage):
+        enqueue_job('projects.check_storage_quota', {'project': project.id, 'before_usage': before_usage})
 
     def _lock_version_upload(self, file_obj):
         if file_obj.version_lock_expires_at and file_obj.version_lock_expires_at > timezone.now() and file_obj.version_lock_by_id not in (None, self.request.user.id):
@@ -2127,7 +2055,6 @@ class ProjectFileViewSet(viewsets.ModelViewSet):
             project_file.current_version_file = version
             project_file.save(update_fields=['current_version_file'])
 
-        after_usage = self._project_total_usage(project)
         self._create_activity(project_file, ProjectFileActivityLog.ActionType.UPLOADED, {
             'folder': folder.name,
             'version': 1,
@@ -2157,7 +2084,7 @@ class ProjectFileViewSet(viewsets.ModelViewSet):
                 message=f'Final file "{project_file.display_name}" was uploaded in project {project.title}.',
                 recipient_list=[u.email for u in recipients if u and u.email],
             )
-        self._maybe_warn_quota(project, before_usage, after_usage)
+        self._maybe_warn_quota(project, before_usage)
 
     @action(detail=True, methods=['post'])
     def upload_version(self, request, pk=None):
@@ -2206,7 +2133,6 @@ class ProjectFileViewSet(viewsets.ModelViewSet):
                 file_obj.stored_file_name = _normalise_file_name(uploaded_file.name)
                 file_obj.save(update_fields=['current_version_number', 'current_version_file', 'file_size', 'mime_type', 'file_extension', 'tag', 'display_name', 'current_version_note', 'stored_file_name'])
 
-            after_usage = self._project_total_usage(file_obj.project)
             self._create_activity(file_obj, ProjectFileActivityLog.ActionType.VERSION_CREATED, {
                 'version': file_obj.current_version_number,
                 'version_note': version_note,
@@ -2219,7 +2145,7 @@ class ProjectFileViewSet(viewsets.ModelViewSet):
                 message=f'{self.request.user.get_full_name() or self.request.user.username} uploaded a new version of "{file_obj.display_name}" in {file_obj.project.title}. {version_note}',
                 project=file_obj.project,
             )
-            self._maybe_warn_quota(file_obj.project, before_usage, after_usage)
+            self._maybe_warn_quota(file_obj.project, before_usage)
             if new_tag == ProjectFile.Tag.FINAL:
                 recipients = [file_obj.project.supervisor] if file_obj.project.supervisor else []
                 owner = self._project_owner(file_obj.project)
@@ -2401,105 +2327,122 @@ class ProjectTrashViewSet(viewsets.ModelViewSet):
         return Response({'message': 'File restored'})
 
 
-class CalendarEventViewSet(viewsets.ModelViewSet):
-    serializer_class = CalendarEventSerializer
-    permission_classes = [IsAuthenticated]
+def _calendar_event_queryset(user, project_id=None):
+    queryset = CalendarEvent.objects.select_related('project', 'created_by')
+    if project_id:
+        queryset = queryset.filter(project_id=project_id)
 
-    def get_queryset(self):
-        queryset = CalendarEvent.objects.select_related('project', 'created_by')
-        project_id = self.request.query_params.get('project')
-        if project_id:
-            queryset = queryset.filter(project_id=project_id)
+    if user.role == CustomUser.Role.ADMIN:
+        return queryset
+    if user.role == CustomUser.Role.LECTURER:
+        return queryset.filter(project__supervisor=user)
 
-        user = self.request.user
-        if user.role == CustomUser.Role.ADMIN:
-            return queryset
-        if user.role == CustomUser.Role.LECTURER:
-            return queryset.filter(project__supervisor=user)
+    member_project_ids = user.teammembership_set.values_list('team__project_id', flat=True)
+    return queryset.filter(project_id__in=member_project_ids)
 
-        member_project_ids = user.teammembership_set.values_list('team__project_id', flat=True)
-        return queryset.filter(project_id__in=member_project_ids)
 
-    def list(self, request, *args, **kwargs):
-        queryset = self.get_queryset()
-        project_id = request.query_params.get('project')
-        scope = (request.query_params.get('scope') or 'personal').lower()
+def _calendar_project_ids(user, project_id=None):
+    if user.role == CustomUser.Role.STUDENT:
+        projects = Project.objects.filter(team__teammembership__user=user)
+    elif user.role == CustomUser.Role.LECTURER:
+        projects = Project.objects.filter(supervisor=user)
+    else:
+        projects = Project.objects.all()
+    if project_id:
+        projects = projects.filter(id=project_id)
+    return list(projects.values_list('id', flat=True).distinct())
+
+
+def _set_validators(response, etag):
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+def _calendar_not_modified(request, etag):
+    not_modified = get_conditional_response(request, etag=etag)
+    return _set_validators(not_modified, etag) if not_modified is not None else None
+
+
+def calendar_ics_feed(request, token):
+    """Token-authenticated iCalendar feed of every calendar event the token's owner can see."""
+    if request.method not in ('GET', 'HEAD'):
+        return HttpResponseNotAllowed(['GET', 'HEAD'])
+    feed_token = CalendarFeedToken.objects.select_related('user').filter(token=token).first()
+    if not feed_token or not feed_token.user.is_active:
+        raise Http404('Unknown calendar feed')
+
+    user = feed_token.user
+    project_ids = _calendar_project_ids(user)
+    custom_events = _calendar_event_queryset(user)
+    etag = calendar_validators(project_ids, custom_events, 'ics')
+    not_modified = _calendar_not_modified(request, etag)
+    if not_modified is not None:
+        return not_modified
+
+    response = StreamingHttpResponse(
+        render_ics(
+            calendar_events(project_ids, custom_events),
+            calendar_name=f'UniTeam - {user.get_full_name() or user.username}',
+            host=request.get_host().split(':')[0],
+        ),
+        content_type='text/calendar; charset=utf-8',
+    )
+    response['Content-Disposition'] = 'inline; filename="uniteam.ics"'
+    return _set_validators(response, etag)
 
-        if project_id:
-            projects = Project.objects.filter(id=project_id)
-        else:
-            if request.user.role == CustomUser.Role.STUDENT:
-                projects = Project.objects.filter(team__teammembership__user=request.user).distinct()
-            elif request.user.role == CustomUser.Role.LECTURER:
-                projects = Project.objects.filter(supervisor=request.user)
-            else:
-                projects = Project.objects.all()
-
-        events = []
-        for project in projects:
-            if scope == 'project' and project_id and str(project.id) != str(project_id):
-                continue
-
-            for task in project.tasks.filter(is_cancelled=False):
-                events.append({
-                    'id': f'task-{task.id}',
-                    'project': project.id,
-                    'title': f'Task deadline: {task.title}',
-                    'event_type': CalendarEvent.EventType.TASK_DEADLINE,
-                    'related_object_id': task.id,
-                    'start_datetime': task.deadline.isoformat(),
-                    'end_datetime': task.deadline.isoformat(),
-                    'is_visible_to_all_members': True,
-                    'source': 'derived',
-                })
-
-            events.append({
-                'id': f'project-deadline-{project.id}',
-                'project': project.id,
-                'title': f'Project submission deadline: {project.title}',
-                'event_type': CalendarEvent.EventType.PROJECT_DEADLINE,
-                'related_object_id': project.id,
-                'start_datetime': timezone.make_aware(datetime.combine(project.deadline, time.min)).isoformat(),
-                'end_datetime': timezone.make_aware(datetime.combine(project.deadline, time.min)).isoformat(),
-                'is_visible_to_all_members': True,
-                'source': 'derived',
-            })
 
-            for milestone in project.milestones.all():
-                milestone_dt = timezone.make_aware(datetime.combine(milestone.due_date, time.min))
-                events.append({
-                    'id': f'milestone-{milestone.id}',
-                    'project': project.id,
-                    'title': f'Milestone: {milestone.title}',
-                    'event_type': CalendarEvent.EventType.MILESTONE,
-                    'related_object_id': milestone.id,
-                    'start_datetime': milestone_dt.isoformat(),
-                    'end_datetime': milestone_dt.isoformat(),
-                    'is_visible_to_all_members': True,
-                    'source': 'derived',
-                })
+class CalendarEventViewSet(viewsets.ModelViewSet):
+    serializer_class = CalendarEventSerializer
+    permission_classes = [IsAuthenticated]
 
-        MeetingPoll = apps.get_model('communication', 'MeetingPoll')
-        for poll in MeetingPoll.objects.filter(project__in=projects, confirmed_slot__isnull=False).select_related('confirmed_slot', 'project'):
-            events.append({
-                'id': f'meeting-{poll.id}',
-                'project': poll.project_id,
-                'title': f'Confirmed meeting: {poll.title}',
-                'event_type': CalendarEvent.EventType.MEETING,
-                'related_object_id': poll.id,
-                'start_datetime': poll.confirmed_slot.start_datetime.isoformat(),
-                'end_datetime': poll.confirmed_slot.end_datetime.isoformat(),
-                'is_visible_to_all_members': True,
-                'source': 'derived',
-            })
+    def get_queryset(self):
+        return _calendar_event_queryset(self.request.user, self.request.query_params.get('project'))
+
+    def _window_bound(self, name):
+        raw = self.request.query_params.get(name)
+        if not raw:
+            return None
+        try:
+            value = datetime.fromisoformat(raw)
+        except ValueError:
+            raise ValidationError({name: 'Invalid format. Use YYYY-MM-DD or an ISO 8601 datetime.'})
+        if timezone.is_naive(value):
+            value = timezone.make_aware(value)
+        return value
 
-        custom_events = CalendarEventSerializer(queryset, many=True).data
-        for event in custom_events:
-            event['source'] = 'custom'
+    def list(self, request, *args, **kwargs):
+        start = self._window_bound('start')
+        end = self._window_bound('end')
+        if start and end and end <= start:
+            raise ValidationError({'end': 'end must be after start.'})
+
+        project_ids = _calendar_project_ids(request.user, request.query_params.get('project'))
+        custom_events = self.get_queryset()
+        etag = calendar_validators(
+            project_ids, custom_events, 'json', start and start.isoformat(), end and end.isoformat(),
+        )
+        not_modified = _calendar_not_modified(request, etag)
+        if not_modified is not None:
+            return not_modified
+
+        feed = calendar_feed(
+            project_ids,
+            custom_events,
+            lambda event: CalendarEventSerializer(event).data,
+            start=start,
+            end=end,
+        )
+        return _set_validators(Response(list(feed)), etag)
 
-        combined = custom_events + events
-        combined.sort(key=lambda item: item['start_datetime'])
-        return Response(combined)
+    @action(detail=False, methods=['get', 'post'], url_path='feed-token')
+    def feed_token(self, request):
+        """GET returns the caller's .ics subscription URL; POST replaces the token, revoking the old URL."""
+        feed_token, created = CalendarFeedToken.objects.get_or_create(user=request.user)
+        if request.method == 'POST' and not created:
+            feed_token.rotate()
+        feed_url = request.build_absolute_uri(reverse('calendar-ics-feed', args=[feed_token.token]))
+        return Response({'token': feed_token.token, 'url': feed_url})
 
     def perform_create(self, serializer):
         project = serializer.validated_data['project']
@@ -2519,20 +2462,27 @@ class InvitationViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     
     def get_queryset(self):
-        expire_stale_invitations_for_queryset(Invitation.objects.all())
+        expire_stale_invitations()
         user = self.request.user
         
         # Students see invitations they received
         if user.role == CustomUser.Role.STUDENT:
-            return Invitation.objects.filter(receiver=user)
+            queryset = Invitation.objects.filter(receiver=user)
         
         # Lecturers see invitations for projects they supervise
         elif user.role == CustomUser.Role.LECTURER:
             supervised_projects = Project.objects.filter(supervisor=user)
-            return Invitation.objects.filter(project__in=supervised_projects)
+            queryset = Invitation.objects.filter(project__in=supervised_projects)
         
         # Admins see all
-        return Invitation.objects.all()
+        else:
+            queryset = Invitation.objects.all()
+
+        if self.action == 'list':
+            queryset = queryset.select_related('sender', 'receiver').prefetch_related(
+                Prefetch('project', queryset=annotate_project_list(Project.objects.all(), user))
+            )
+        return queryset
     
     def perform_create(self, serializer):
         """Create invitation with current user as sender"""
@@ -2633,7 +2583,7 @@ class InvitationViewSet(viewsets.ModelViewSet):
     def resend(self, request, pk=None):
         invitation = get_object_or_404(Invitation.objects.select_related('project', 'receiver', 'sender'), pk=pk)
 
-        requester_membership = TeamMembership.objects.filter(team=invitation.project.team, user=request.user).first()
+        requester_membership = _project_membership(invitation.project, request.user)
         has_team_permission = requester_membership and requester_membership.role in [Team.Role.LEADER, Team.Role.CO_LEADER]
         if invitation.sender_id != request.user.id and not has_team_permission and request.user.role != CustomUser.Role.ADMIN:
             return Response({'error': 'You do not have permission to resend this invitation'}, status=status.HTTP_403_FORBIDDEN)
@@ -2665,7 +2615,7 @@ class InvitationViewSet(viewsets.ModelViewSet):
     def cancel(self, request, pk=None):
         invitation = get_object_or_404(Invitation.objects.select_related('project', 'receiver', 'sender'), pk=pk)
 
-        requester_membership = TeamMembership.objects.filter(team=invitation.project.team, user=request.user).first()
+        requester_membership = _project_membership(invitation.project, request.user)
         has_team_permission = requester_membership and requester_membership.role in [Team.Role.LEADER, Team.Role.CO_LEADER]
         if invitation.sender_id != request.user.id and not has_team_permission and request.user.role != CustomUser.Role.ADMIN:
             return Response({'error': 'You do not have permission to cancel this invitation'}, status=status.HTTP_403_FORBIDDEN)
@@ -2689,8 +2639,9 @@ class InvitationViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['post'])
     def expire_stale(self, request):
-        expired_count = expire_stale_invitations_for_queryset(Invitation.objects.all())
-        return Response({'expired_count': expired_count})
+        dry_run = str(request.data.get('dry_run', '')).lower() in ('1', 'true')
+        expired_count = expire_stale_invitations(dry_run=dry_run)
+        return Response({'expired_count': expired_count, 'dry_run': dry_run})
 
 
 class ProjectTemplateViewSet(viewsets.ModelViewSet):
@@ -2752,3 +2703,16 @@ class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
     def mark_all_read(self, request):
         self.get_queryset().filter(read_at__isnull=True).update(read_at=timezone.now())
         return Response({'message': 'All notifications marked as read'})
+
+    @action(detail=False, methods=['get'])
+    def sync(self, request):
+        """New notifications after ``after_id`` plus older ones read since ``since``."""
+        after_id, since = sync_params(request.query_params)
+        context = self.get_serializer_context()
+        return Response(sync_payload(
+            self.get_queryset(),
+            lambda notifications: NotificationSerializer(notifications, many=True, context=context).data,
+            after_id,
+            since,
+            changed_field='read_at',
+        ))
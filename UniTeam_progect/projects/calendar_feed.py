@@ -0,0 +1,232 @@
+import hashlib
+import heapq
+from datetime import datetime, time, timezone as dt_timezone
+
+from django.apps import apps
+from django.db.models import Count, Max
+from django.utils import timezone
+
+from .models import CalendarEvent, Milestone, Project, Task
+
+
+FEED_CHUNK_SIZE = 500
+ICS_LINE_LIMIT = 75
+
+
+def _day_start(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def _derived_event(key, project_id, title, event_type, related_object_id, start, end=None, all_day=False):
+    return {
+        'uid': f'{key}-{related_object_id}',
+        'project': project_id,
+        'title': title,
+        'event_type': event_type,
+        'related_object_id': related_object_id,
+        'start': start,
+        'end': end or start,
+        'all_day': all_day,
+        'instance': None,
+    }
+
+
+def _window_filter(field, start, end, end_field=None):
+    """Lookups keeping rows that overlap [start, end); point events only need ``field``."""
+    lookups = {}
+    if start:
+        lookups[f'{end_field or field}__gte'] = start
+    if end:
+        lookups[f'{field}__lt'] = end
+    return lookups
+
+
+def _date_window_filter(field, start, end):
+    # All-day events belong to the window when their day overlaps it.
+    lookups = {}
+    if start:
+        lookups[f'{field}__gte'] = timezone.localtime(start).date()
+    if end:
+        end = timezone.localtime(end)
+        lookups[f'{field}__lte' if end.time() > time.min else f'{field}__lt'] = end.date()
+    return lookups
+
+
+def _task_deadlines(project_ids, start, end):
+    tasks = (
+        Task.objects.filter(project_id__in=project_ids, is_cancelled=False, **_window_filter('deadline', start, end))
+        .order_by('deadline', 'id')
+        .values_list('id', 'project_id', 'title', 'deadline')
+    )
+    for task_id, project_id, title, deadline in tasks.iterator(chunk_size=FEED_CHUNK_SIZE):
+        yield _derived_event('task', project_id, f'Task deadline: {title}', CalendarEvent.EventType.TASK_DEADLINE, task_id, deadline)
+
+
+def _project_deadlines(project_ids, start, end):
+    projects = (
+        Project.objects.filter(id__in=project_ids, **_date_window_filter('deadline', start, end))
+        .order_by('deadline', 'id')
+        .values_list('id', 'title', 'deadline')
+    )
+    for project_id, title, deadline in projects.iterator(chunk_size=FEED_CHUNK_SIZE):
+        yield _derived_event(
+            'project-deadline', project_id, f'Project submission deadline: {title}',
+            CalendarEvent.EventType.PROJECT_DEADLINE, project_id, _day_start(deadline), all_day=True,
+        )
+
+
+def _milestones(project_ids, start, end):
+    milestones = (
+        Milestone.objects.filter(project_id__in=project_ids, **_date_window_filter('due_date', start, end))
+        .order_by('due_date', 'id')
+        .values_list('id', 'project_id', 'title', 'due_date')
+    )
+    for milestone_id, project_id, title, due_date in milestones.iterator(chunk_size=FEED_CHUNK_SIZE):
+        yield _derived_event(
+            'milestone', project_id, f'Milestone: {title}',
+            CalendarEvent.EventType.MILESTONE, milestone_id, _day_start(due_date), all_day=True,
+        )
+
+
+def _confirmed_polls(project_ids):
+    MeetingPoll = apps.get_model('communication', 'MeetingPoll')
+    return MeetingPoll.objects.filter(project_id__in=project_ids, confirmed_slot__isnull=False)
+
+
+def _confirmed_meetings(project_ids, start, end):
+    polls = (
+        _confirmed_polls(project_ids)
+        .filter(**_window_filter('confirmed_slot__start_datetime', start, end, end_field='confirmed_slot__end_datetime'))
+        .order_by('confirmed_slot__start_datetime', 'id')
+        .values_list('id', 'project_id', 'title', 'confirmed_slot__start_datetime', 'confirmed_slot__end_datetime')
+    )
+    for poll_id, project_id, title, slot_start, slot_end in polls.iterator(chunk_size=FEED_CHUNK_SIZE):
+        yield _derived_event('meeting', project_id, f'Confirmed meeting: {title}', CalendarEvent.EventType.MEETING, poll_id, slot_start, slot_end)
+
+
+def _custom_events(queryset, start, end):
+    events = queryset.filter(**_window_filter('start_datetime', start, end, end_field='end_datetime')).order_by('start_datetime', 'id')
+    for event in events.iterator(chunk_size=FEED_CHUNK_SIZE):
+        yield {
+            'uid': f'custom-{event.id}',
+            'project': event.project_id,
+            'title': event.title,
+            'event_type': event.event_type,
+            'related_object_id': event.related_object_id,
+            'start': event.start_datetime,
+            'end': event.end_datetime,
+            'all_day': False,
+            'instance': event,
+        }
+
+
+def calendar_events(project_ids, custom_events, start=None, end=None):
+    """Yield raw calendar events for ``project_ids`` in start-time order.
+
+    Task deadlines, project deadlines, milestones and confirmed meetings are
+    each one windowed, ordered query; ``custom_events`` is a CalendarEvent
+    queryset. The sources are heap-merged lazily, so callers can stream the
+    result.
+    """
+    project_ids = list(project_ids)
+    streams = [
+        _custom_events(custom_events, start, end),
+        _task_deadlines(project_ids, start, end),
+        _project_deadlines(project_ids, start, end),
+        _milestones(project_ids, start, end),
+        _confirmed_meetings(project_ids, start, end),
+    ]
+    return heapq.merge(*streams, key=lambda event: event['start'])
+
+
+def calendar_feed(project_ids, custom_events, serialize, start=None, end=None):
+    """Yield the JSON payloads of :func:`calendar_events`; custom events go through ``serialize``."""
+    for event in calendar_events(project_ids, custom_events, start=start, end=end):
+        if event['instance'] is not None:
+            payload = serialize(event['instance'])
+            payload['source'] = 'custom'
+        else:
+            payload = {
+                'id': event['uid'],
+                'project': event['project'],
+                'title': event['title'],
+                'event_type': event['event_type'],
+                'related_object_id': event['related_object_id'],
+                'start_datetime': event['start'].isoformat(),
+                'end_datetime': event['end'].isoformat(),
+                'is_visible_to_all_members': True,
+                'source': 'derived',
+            }
+        yield payload
+
+
+def calendar_validators(project_ids, custom_events, *extra):
+    """Return the ETag for the feed over ``project_ids``.
+
+    One aggregate per source: the newest ``updated_at`` and the row count,
+    so edits and deletions both change it. ``extra`` (window bounds, output
+    format) is folded in. There is deliberately no Last-Modified: deleting
+    a row or losing access to a project does not advance any timestamp, so
+    clients validating by date alone would never see removals.
+    """
+    project_ids = sorted(project_ids)
+    sources = [
+        Task.objects.filter(project_id__in=project_ids),
+        Project.objects.filter(id__in=project_ids),
+        Milestone.objects.filter(project_id__in=project_ids),
+        _confirmed_polls(project_ids),
+        custom_events,
+    ]
+    fingerprint = [project_ids, *extra]
+    for queryset in sources:
+        state = queryset.order_by().aggregate(latest=Max('updated_at'), rows=Count('id'))
+        fingerprint.append((state['latest'] and state['latest'].isoformat(), state['rows']))
+    return '"%s"' % hashlib.sha256(repr(fingerprint).encode()).hexdigest()
+
+
+def _ics_escape(value):
+    return (
+        str(value).replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+        .replace('\r\n', '\\n').replace('\n', '\\n')
+    )
+
+
+def _ics_datetime(value):
+    return value.astimezone(dt_timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+
+def _ics_line(line):
+    # RFC 5545 folds content lines longer than 75 octets.
+    encoded = line.encode()
+    chunks = []
+    while len(encoded) > ICS_LINE_LIMIT:
+        cut = ICS_LINE_LIMIT if not chunks else ICS_LINE_LIMIT - 1
+        while (encoded[cut] & 0xC0) == 0x80:
+            cut -= 1
+        chunks.append(encoded[:cut].decode())
+        encoded = encoded[cut:]
+    chunks.append(encoded.decode())
+    return '\r\n '.join(chunks) + '\r\n'
+
+
+def render_ics(events, calendar_name, host, stamp=None):
+    """Yield an iCalendar document for ``events`` line by line."""
+    stamp = _ics_datetime(stamp or timezone.now())
+    yield _ics_line('BEGIN:VCALENDAR')
+    yield _ics_line('VERSION:2.0')
+    yield _ics_line('PRODID:-//UniTeam//Project Calendar//EN')
+    yield _ics_line('CALSCALE:GREGORIAN')
+    yield _ics_line(f'X-WR-CALNAME:{_ics_escape(calendar_name)}')
+    for event in events:
+        yield _ics_line('BEGIN:VEVENT')
+        yield _ics_line(f"UID:{event['uid']}@{host}")
+        yield _ics_line(f'DTSTAMP:{stamp}')
+        if event['all_day']:
+            yield _ics_line(f"DTSTART;VALUE=DATE:{timezone.localtime(event['start']).date():%Y%m%d}")
+        else:
+            yield _ics_line(f"DTSTART:{_ics_datetime(event['start'])}")
+            yield _ics_line(f"DTEND:{_ics_datetime(event['end'])}")
+        yield _ics_line(f"SUMMARY:{_ics_escape(event['title'])}")
+        yield _ics_line(f"CATEGORIES:{event['event_type']}")
+        yield _ics_line('END:VEVENT')
+    yield _ics_line('END:VCALENDAR')
@@ -0,0 +1,56 @@
+from django.db import transaction
+from django.utils import timezone
+
+from communication.realtime import publish_notifications
+
+from .models import Invitation, Notification
+
+
+INVITATION_EXPIRY_CHUNK_SIZE = 500
+
+
+def _expire_chunk(stale, chunk_size):
+    with transaction.atomic():
+        rows = list(
+            stale.select_for_update(skip_locked=True, of=('self',))
+            .order_by('id')
+            .values_list('id', 'sender_id', 'receiver_id', 'project_id', 'project__title')[:chunk_size]
+        )
+        if not rows:
+            return 0
+        Invitation.objects.filter(id__in=[row[0] for row in rows]).update(status=Invitation.Status.EXPIRED)
+        notifications = Notification.objects.bulk_create([
+            Notification(
+                recipient_id=recipient_id,
+                type=Notification.Type.INVITATION_EXPIRED,
+                title='Invitation expired',
+                message=f'Invitation for project "{project_title}" has expired.',
+                project_id=project_id,
+                invitation_id=invitation_id,
+            )
+            for invitation_id, sender_id, receiver_id, project_id, project_title in rows
+            for recipient_id in dict.fromkeys([sender_id, receiver_id])
+        ])
+    publish_notifications(notifications, 'projects', 'message')
+    return len(rows)
+
+
+def expire_stale_invitations(queryset=None, *, chunk_size=INVITATION_EXPIRY_CHUNK_SIZE, dry_run=False):
+    """Expire every pending invitation in ``queryset`` whose ``expires_at`` has passed.
+
+    Works through the stale rows ``chunk_size`` at a time: each chunk is
+    locked, flipped to EXPIRED with one UPDATE and gets its sender and
+    receiver notifications in one insert. With ``dry_run`` nothing is
+    changed. Returns the number of invitations expired (or that would be).
+    """
+    queryset = Invitation.objects.all() if queryset is None else queryset
+    stale = queryset.filter(status=Invitation.Status.PENDING, expires_at__lte=timezone.now())
+    if dry_run:
+        return stale.count()
+
+    expired_count = 0
+    while True:
+        expired = _expire_chunk(stale, chunk_size)
+        if not expired:
+            return expired_count
+        expired_count += expired
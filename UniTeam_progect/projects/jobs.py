@@ -0,0 +1,174 @@
+import logging
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import close_old_connections, connection, transaction
+from django.db.models import F
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import BackgroundJob
+
+
+logger = logging.getLogger(__name__)
+
+JOB_MAX_ATTEMPTS = 5
+JOB_RETRY_BASE_SECONDS = 30
+JOB_STALE_SECONDS = 15 * 60
+
+JOB_HANDLERS = {}
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def job(name):
+    """Register the decorated function as the handler for jobs called ``name``.
+
+    Handlers receive the job payload as keyword arguments, so payloads must
+    hold ids and plain values rather than model instances.
+    """
+    def register(func):
+        JOB_HANDLERS[name] = func
+        return func
+    return register
+
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=settings.BACKGROUND_JOBS_THREADS, thread_name_prefix='uniteam-job')
+        return _executor
+
+
+@receiver(setting_changed)
+def _reset_executor(setting, **kwargs):
+    global _executor
+    if setting == 'BACKGROUND_JOBS_THREADS':
+        with _executor_lock:
+            if _executor is not None:
+                _executor.shutdown(wait=False)
+            _executor = None
+
+
+def enqueue_job(name, payload=None, *, idempotency_key=None):
+    """Persist a job and hand it to the runner configured by ``BACKGROUND_JOBS_MODE``.
+
+    ``sync`` runs it right away in the calling thread (tests), ``thread``
+    submits it to this process's thread pool once the surrounding
+    transaction commits, and ``worker`` leaves it for the run_worker
+    command. A job whose ``idempotency_key`` was already enqueued
+    is not created or run again.
+    """
+    if name not in JOB_HANDLERS:
+        raise ValueError(f'No background job handler registered for "{name}".')
+    fields = {'name': name, 'payload': payload or {}}
+    if idempotency_key:
+        background_job, created = BackgroundJob.objects.get_or_create(idempotency_key=idempotency_key, defaults=fields)
+        if not created:
+            return background_job
+    else:
+        background_job = BackgroundJob.objects.create(**fields)
+
+    mode = settings.BACKGROUND_JOBS_MODE
+    if mode == 'sync':
+        run_job(background_job, raise_errors=True)
+    elif mode == 'thread':
+        job_id = background_job.id
+        transaction.on_commit(lambda: get_executor().submit(_run_in_thread, job_id, True))
+    return background_job
+
+
+def retry_delay(attempts):
+    return timedelta(seconds=JOB_RETRY_BASE_SECONDS * 2 ** max(attempts - 1, 0))
+
+
+def run_job(background_job, raise_errors=False):
+    """Claim a pending job, run its handler and record the outcome.
+
+    Returns False when another runner claimed the job first. Failures are
+    retried with exponential backoff until ``JOB_MAX_ATTEMPTS``.
+    """
+    now = timezone.now()
+    claimed = BackgroundJob.objects.filter(id=background_job.id, status=BackgroundJob.Status.PENDING).update(
+        status=BackgroundJob.Status.RUNNING,
+        attempts=F('attempts') + 1,
+        started_at=now,
+    )
+    if not claimed:
+        return False
+    attempts = background_job.attempts + 1
+
+    try:
+        JOB_HANDLERS[background_job.name](**background_job.payload)
+    except Exception as exc:
+        logger.exception('Background job %s#%s failed', background_job.name, background_job.id)
+        exhausted = attempts >= JOB_MAX_ATTEMPTS
+        BackgroundJob.objects.filter(id=background_job.id).update(
+            status=BackgroundJob.Status.FAILED if exhausted else BackgroundJob.Status.PENDING,
+            run_after=timezone.now() + retry_delay(attempts),
+            last_error=''.join(traceback.format_exception_only(type(exc), exc))[:2000],
+            finished_at=timezone.now() if exhausted else None,
+        )
+        if raise_errors:
+            raise
+        return True
+
+    BackgroundJob.objects.filter(id=background_job.id).update(status=BackgroundJob.Status.DONE, finished_at=timezone.now())
+    return True
+
+
+def _run_in_thread(job_id, resubmit=False):
+    close_old_connections()
+    try:
+        background_job = BackgroundJob.objects.filter(id=job_id).first()
+        claimed = background_job is not None and run_job(background_job)
+        if claimed and resubmit:
+            _resubmit_retry(job_id)
+        return claimed
+    finally:
+        connection.close()
+
+
+def _resubmit_retry(job_id):
+    """In thread mode nothing polls the queue, so hand a failed job back to the pool once its backoff elapses."""
+    run_after = (
+        BackgroundJob.objects.filter(id=job_id, status=BackgroundJob.Status.PENDING)
+        .values_list('run_after', flat=True)
+        .first()
+    )
+    if run_after is None:
+        return
+    delay = max((run_after - timezone.now()).total_seconds(), 0)
+    timer = threading.Timer(delay, lambda: get_executor().submit(_run_in_thread, job_id, True))
+    timer.daemon = True
+    timer.start()
+
+
+def requeue_stale_jobs():
+    """Put jobs left RUNNING by a crashed runner back in the queue."""
+    cutoff = timezone.now() - timedelta(seconds=JOB_STALE_SECONDS)
+    return BackgroundJob.objects.filter(status=BackgroundJob.Status.RUNNING, started_at__lt=cutoff).update(
+        status=BackgroundJob.Status.PENDING,
+    )
+
+
+def due_jobs(limit):
+    return list(
+        BackgroundJob.objects.filter(status=BackgroundJob.Status.PENDING, run_after__lte=timezone.now())
+        .order_by('run_after', 'id')[:limit]
+    )
+
+
+def run_due_jobs(limit=100, threads=1):
+    """Run up to ``limit`` due jobs, ``threads`` at a time, and wait for them; returns how many were claimed."""
+    jobs = due_jobs(limit)
+    if threads <= 1:
+        return sum(1 for background_job in jobs if run_job(background_job))
+    with ThreadPoolExecutor(max_workers=threads, thread_name_prefix='uniteam-worker') as executor:
+        return sum(1 for claimed in executor.map(_run_in_thread, [background_job.id for background_job in jobs]) if claimed)
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from projects.activity import rebuild_activity_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the project/member last-activity index from task, file and communication activity.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--project', type=int, action='append', dest='project_ids', help='Only rebuild the given project id (repeatable).')
+
+    def handle(self, *args, **options):
+        row_count = rebuild_activity_index(options.get('project_ids'))
+        self.stdout.write(self.style.SUCCESS(f'Activity index rebuilt. Rows written: {row_count}'))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from projects.timeline import backfill_project_events
+
+
+class Command(BaseCommand):
+    help = 'Create project events for task, file and communication activity recorded before the event log existed.'
+
+    def handle(self, *args, **options):
+        created = backfill_project_events()
+        self.stdout.write(self.style.SUCCESS(f'Project events backfilled: {created}'))
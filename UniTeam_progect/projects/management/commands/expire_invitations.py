@@ -1,42 +1,21 @@
-from django.core.management.base import BaseCommand
-from django.utils import timezone
+from django.core.management.base import BaseCommand, CommandError
 
-from projects.models import Invitation, Notification
+from projects.invitations import INVITATION_EXPIRY_CHUNK_SIZE, expire_stale_invitations
 
 
 class Command(BaseCommand):
     help = 'Expire stale project invitations and create in-app notifications.'
 
-    def handle(self, *args, **options):
-        now = timezone.now()
-        stale_invitations = Invitation.objects.filter(
-            status=Invitation.Status.PENDING,
-            expires_at__lte=now,
-        ).select_related('sender', 'receiver', 'project')
-
-        expired_count = 0
-        for invitation in stale_invitations:
-            invitation.status = Invitation.Status.EXPIRED
-            invitation.save(update_fields=['status'])
-            expired_count += 1
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=INVITATION_EXPIRY_CHUNK_SIZE, help='Invitations expired per transaction.')
+        parser.add_argument('--dry-run', action='store_true', help='Only report how many invitations would expire.')
 
-            Notification.objects.bulk_create([
-                Notification(
-                    recipient=invitation.sender,
-                    type=Notification.Type.INVITATION_EXPIRED,
-                    title='Invitation expired',
-                    message=f'Invitation for project "{invitation.project.title}" has expired.',
-                    project=invitation.project,
-                    invitation=invitation,
-                ),
-                Notification(
-                    recipient=invitation.receiver,
-                    type=Notification.Type.INVITATION_EXPIRED,
-                    title='Invitation expired',
-                    message=f'Invitation for project "{invitation.project.title}" has expired.',
-                    project=invitation.project,
-                    invitation=invitation,
-                ),
-            ])
+    def handle(self, *args, **options):
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size must be at least 1.')
 
-        self.stdout.write(self.style.SUCCESS(f'Expired invitations: {expired_count}'))
+        expired_count = expire_stale_invitations(chunk_size=options['chunk_size'], dry_run=options['dry_run'])
+        if options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(f'Invitations that would expire: {expired_count}'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Expired invitations: {expired_count}'))
@@ -1,59 +1,59 @@
-from datetime import timedelta
+from datetime import date, timedelta
 
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 from django.utils import timezone
 
-from projects.models import Project, ProjectSnapshot, Task
+from projects.metrics import invalidate_project_metrics
+from projects.models import Project
+from projects.snapshots import build_project_snapshots
 
 
 class Command(BaseCommand):
     help = 'Create daily project snapshots and auto-archive projects 30 days after deadline.'
 
+    def add_arguments(self, parser):
+        parser.add_argument('--date', dest='snapshot_date', help='Snapshot a single day (YYYY-MM-DD) instead of today.')
+        parser.add_argument('--since', help='Fill in missing snapshots for every day from this date (YYYY-MM-DD) through today; past days are marked as backfilled.')
+        parser.add_argument('--workers', type=int, default=1, help='Number of threads writing project chunks in parallel.')
+
+    def _parse_date(self, value, option):
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            raise CommandError(f'Invalid {option} value "{value}". Use YYYY-MM-DD.')
+
     def handle(self, *args, **options):
         today = timezone.localdate()
         now = timezone.now()
 
-        snap_count = 0
-        archived_count = 0
-
-        projects = Project.objects.exclude(lifecycle_status=Project.LifecycleStatus.ARCHIVED)
-
-        for project in projects:
-            tasks = project.tasks.filter(is_cancelled=False)
-            task_total = tasks.count()
-            done = tasks.filter(status=Task.Status.DONE).count()
-            in_progress = tasks.filter(status=Task.Status.IN_PROGRESS).count()
-            blocked = tasks.filter(status=Task.Status.BLOCKED).count()
-            overdue = tasks.exclude(status=Task.Status.DONE).filter(deadline__lt=now).count()
-            remaining = tasks.exclude(status=Task.Status.DONE).count()
-            progress = int(round((done / task_total) * 100)) if task_total else 0
-
-            _, created = ProjectSnapshot.objects.get_or_create(
-                project=project,
-                snapshot_date=today,
-                defaults={
-                    'metrics': {
-                        'task_total': task_total,
-                        'done': done,
-                        'in_progress': in_progress,
-                        'blocked': blocked,
-                        'overdue': overdue,
-                        'remaining_tasks': remaining,
-                        'progress_percentage': progress,
-                    }
-                },
-            )
-            if created:
-                snap_count += 1
-
-            archive_threshold = project.deadline + timedelta(days=30)
-            if today >= archive_threshold and project.lifecycle_status != Project.LifecycleStatus.ARCHIVED:
-                project.lifecycle_status = Project.LifecycleStatus.ARCHIVED
-                project.save(update_fields=['lifecycle_status', 'updated_at'])
-                archived_count += 1
+        if options['since']:
+            since = self._parse_date(options['since'], '--since')
+            if since > today:
+                raise CommandError('--since cannot be in the future.')
+            snapshot_dates = [since + timedelta(days=offset) for offset in range((today - since).days + 1)]
+        elif options['snapshot_date']:
+            snapshot_date = self._parse_date(options['snapshot_date'], '--date')
+            if snapshot_date > today:
+                raise CommandError('--date cannot be in the future.')
+            snapshot_dates = [snapshot_date]
+        else:
+            snapshot_dates = [today]
+
+        snap_count, refreshed_count = build_project_snapshots(snapshot_dates, workers=max(options['workers'], 1))
+
+        to_archive = Project.objects.exclude(lifecycle_status=Project.LifecycleStatus.ARCHIVED).filter(
+            deadline__lte=today - timedelta(days=30),
+        )
+        archived_ids = list(to_archive.values_list('id', flat=True))
+        archived_count = Project.objects.filter(id__in=archived_ids).update(
+            lifecycle_status=Project.LifecycleStatus.ARCHIVED,
+            updated_at=now,
+        )
+        invalidate_project_metrics(*archived_ids)
 
         self.stdout.write(
             self.style.SUCCESS(
-                f'Phase 6 maintenance complete. Snapshots created: {snap_count}. Auto-archived projects: {archived_count}.'
+                f'Phase 6 maintenance complete. Snapshots created: {snap_count}. Snapshots refreshed: {refreshed_count}. '
+                f'Auto-archived projects: {archived_count}.'
             )
         )
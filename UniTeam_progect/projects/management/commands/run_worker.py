@@ -0,0 +1,42 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from projects.jobs import requeue_stale_jobs, run_due_jobs
+
+
+class Command(BaseCommand):
+    help = 'Run queued background jobs (notifications, activity logs, attachment mirroring, quota checks).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=settings.BACKGROUND_JOBS_THREADS, help='Jobs run concurrently per pass.')
+        parser.add_argument('--batch-size', type=int, default=100, help='Jobs claimed per pass.')
+        parser.add_argument('--once', action='store_true', help='Run a single pass and exit instead of polling.')
+        parser.add_argument('--interval', type=float, default=2.0, help='Seconds to wait between passes when the queue is empty.')
+
+    def handle(self, *args, **options):
+        if options['threads'] < 1 or options['batch_size'] < 1:
+            raise CommandError('--threads and --batch-size must be at least 1.')
+        if not settings.REALTIME_REDIS_URL:
+            self.stderr.write(
+                self.style.WARNING(
+                    'REALTIME_REDIS_URL is not set: realtime events published by this worker '
+                    'will not reach event streams served by the web processes.'
+                )
+            )
+
+        while True:
+            requeued = requeue_stale_jobs()
+            started = time.perf_counter()
+            ran = run_due_jobs(limit=options['batch_size'], threads=options['threads'])
+            if ran or requeued or options['once']:
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f'Ran {ran} job(s) in {time.perf_counter() - started:.2f}s; requeued {requeued} stale job(s).'
+                    )
+                )
+            if options['once']:
+                break
+            if ran < options['batch_size']:
+                time.sleep(options['interval'])
@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from projects.outbox import OUTBOX_BATCH_SIZE, drain_outbox, outbox_stats
+
+
+class Command(BaseCommand):
+    help = 'Deliver queued outbound emails in batches over one connection, retrying failures with backoff.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=OUTBOX_BATCH_SIZE, help='Queued emails claimed and sent per pass.')
+        parser.add_argument('--max-batches', type=int, default=None, help='Stop after this many batches in one pass.')
+        parser.add_argument('--loop', action='store_true', help='Keep polling the outbox instead of exiting when it is empty.')
+        parser.add_argument('--interval', type=float, default=5.0, help='Seconds to wait between passes with --loop.')
+
+    def _report(self, run):
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Sent {run['sent']} email(s) in {run['batches']} batch(es) over {run['elapsed']:.2f}s "
+                f"({run['per_second']:.1f}/s); {run['retrying']} rescheduled, {run['failed']} failed permanently."
+            )
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1.')
+
+        while True:
+            run = drain_outbox(batch_size=options['batch_size'], max_batches=options['max_batches'])
+            if run['batches'] or not options['loop']:
+                self._report(run)
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+        self.stdout.write(f"Outbox totals: {outbox_stats()}")
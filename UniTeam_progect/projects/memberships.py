@@ -0,0 +1,138 @@
+import logging
+import threading
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction
+from django.utils.decorators import sync_and_async_middleware
+
+from .models import Team, TeamMembership
+
+
+logger = logging.getLogger(__name__)
+
+LEADERSHIP_ROLES = (Team.Role.LEADER, Team.Role.CO_LEADER)
+
+# user id -> MembershipResolver for the request being handled; None outside requests.
+_request_resolvers = ContextVar('membership_resolvers', default=None)
+
+_stats_lock = threading.Lock()
+_endpoint_stats = {}
+
+
+class MembershipResolver:
+    """All of one user's team memberships keyed by project id, loaded with a single query.
+
+    Every permission check is answered from that map; ``checks`` and
+    ``queries`` record how many lookups were served and how many queries it
+    took, which the middleware reports per endpoint.
+    """
+
+    def __init__(self, user_id):
+        self.user_id = user_id
+        self.checks = 0
+        self.queries = 0
+        self._memberships = None
+
+    def _by_project(self):
+        if self._memberships is None:
+            self.queries += 1
+            self._memberships = {
+                membership.team.project_id: membership
+                for membership in TeamMembership.objects.filter(user_id=self.user_id).select_related('team', 'user')
+            }
+        return self._memberships
+
+    def membership(self, project):
+        self.checks += 1
+        return self._by_project().get(getattr(project, 'pk', project))
+
+    def role(self, project):
+        membership = self.membership(project)
+        return membership.role if membership else None
+
+    def is_member(self, project):
+        return self.membership(project) is not None
+
+    def is_leadership(self, project):
+        return self.role(project) in LEADERSHIP_ROLES
+
+    def project_ids(self):
+        self.checks += 1
+        return list(self._by_project())
+
+    def invalidate(self):
+        self._memberships = None
+
+
+def membership_resolver(user):
+    """The resolver for ``user`` in the current request, or a fresh one outside requests."""
+    user_id = getattr(user, 'pk', user)
+    resolvers = _request_resolvers.get()
+    if resolvers is None:
+        return MembershipResolver(user_id)
+    if user_id not in resolvers:
+        resolvers[user_id] = MembershipResolver(user_id)
+    return resolvers[user_id]
+
+
+def invalidate_memberships(user_id):
+    resolvers = _request_resolvers.get()
+    if resolvers and user_id in resolvers:
+        resolvers[user_id].invalidate()
+
+
+def _record_request(request, resolvers):
+    checks = sum(resolver.checks for resolver in resolvers.values())
+    if not checks:
+        return
+    queries = sum(resolver.queries for resolver in resolvers.values())
+    match = getattr(request, 'resolver_match', None)
+    endpoint = (match.view_name if match else None) or request.path
+    with _stats_lock:
+        stats = _endpoint_stats.setdefault(endpoint, {'requests': 0, 'checks': 0, 'queries': 0})
+        stats['requests'] += 1
+        stats['checks'] += checks
+        stats['queries'] += queries
+    logger.debug('%s: %d membership checks answered with %d queries', endpoint, checks, queries)
+
+
+def membership_cache_stats():
+    """Per-endpoint membership check counters since the process started.
+
+    ``saved`` is the number of TeamMembership queries the per-request cache
+    avoided compared to one query per check.
+    """
+    with _stats_lock:
+        return {
+            endpoint: {**stats, 'saved': stats['checks'] - stats['queries']}
+            for endpoint, stats in _endpoint_stats.items()
+        }
+
+
+def reset_membership_cache_stats():
+    with _stats_lock:
+        _endpoint_stats.clear()
+
+
+@sync_and_async_middleware
+def membership_cache_middleware(get_response):
+    """Scope membership resolvers to one request and record what they saved."""
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            resolvers = {}
+            token = _request_resolvers.set(resolvers)
+            try:
+                return await get_response(request)
+            finally:
+                _request_resolvers.reset(token)
+                _record_request(request, resolvers)
+    else:
+        def middleware(request):
+            resolvers = {}
+            token = _request_resolvers.set(resolvers)
+            try:
+                return get_response(request)
+            finally:
+                _request_resolvers.reset(token)
+                _record_request(request, resolvers)
+    return middleware
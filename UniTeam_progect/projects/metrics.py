@@ -0,0 +1,259 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Case, Count, F, IntegerField, Max, OuterRef, Q, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import ProjectActivityIndex, ProjectFile, SubTask, Task, TaskAttachment, TaskComment
+
+
+OPEN_TASK_STATUSES = [
+    Task.Status.TODO,
+    Task.Status.IN_PROGRESS,
+    Task.Status.UNDER_REVIEW,
+    Task.Status.DONE,
+    Task.Status.BLOCKED,
+]
+
+STALE_BLOCKED_AFTER = timedelta(hours=24)
+
+
+def _weighted_progress_expression():
+    """Per-task contribution to project progress, in percentage points."""
+    return Case(
+        When(status=Task.Status.DONE, then=Value(100)),
+        When(status=Task.Status.IN_PROGRESS, then=F('progress_percentage')),
+        When(
+            status=Task.Status.UNDER_REVIEW,
+            then=Case(
+                When(progress_percentage__gt=75, then=F('progress_percentage')),
+                default=Value(75),
+                output_field=IntegerField(),
+            ),
+        ),
+        default=Value(0),
+        output_field=IntegerField(),
+    )
+
+
+def _aggregate_fields(now):
+    active = Q(is_cancelled=False)
+    fields = {
+        f'status_{status.lower()}': Count('id', filter=active & Q(status=status))
+        for status in OPEN_TASK_STATUSES
+    }
+    fields.update({
+        'status_cancelled': Count('id', filter=Q(status=Task.Status.CANCELLED)),
+        'total_tasks': Count('id', filter=active),
+        'weighted_progress': Sum(_weighted_progress_expression(), filter=active),
+        'overdue_tasks': Count('id', filter=active & ~Q(status=Task.Status.DONE) & Q(deadline__lt=now)),
+        'stale_blocked_tasks': Count(
+            'id',
+            filter=Q(status=Task.Status.BLOCKED, updated_at__lte=now - STALE_BLOCKED_AFTER),
+        ),
+    })
+    return fields
+
+
+def _progress_percentage(weighted_progress, total):
+    if not total:
+        return 0
+    return int(round(Decimal(weighted_progress or 0) / Decimal(total)))
+
+
+def _metrics_from_row(row):
+    status_counts = {status: row.get(f'status_{status.lower()}', 0) or 0 for status in OPEN_TASK_STATUSES}
+    status_counts[Task.Status.CANCELLED] = row.get('status_cancelled', 0) or 0
+    total = row.get('total_tasks', 0) or 0
+    return {
+        'status_counts': {str(key): value for key, value in status_counts.items()},
+        'total_tasks': total,
+        'progress_percentage': _progress_percentage(row.get('weighted_progress'), total),
+        'overdue_tasks': row.get('overdue_tasks', 0) or 0,
+        'blocked_tasks': status_counts[Task.Status.BLOCKED],
+        'stale_blocked_tasks': row.get('stale_blocked_tasks', 0) or 0,
+        'remaining_tasks': total - status_counts[Task.Status.DONE],
+    }
+
+
+def project_task_metrics_map(project_ids, now=None):
+    """Return task metrics for every project id using a single grouped query.
+
+    Projects without tasks are included with zeroed metrics so callers can
+    index the result directly.
+    """
+    project_ids = list(dict.fromkeys(project_ids))
+    if not project_ids:
+        return {}
+
+    now = now or timezone.now()
+    rows = (
+        Task.objects.filter(project_id__in=project_ids)
+        .order_by()
+        .values('project_id')
+        .annotate(**_aggregate_fields(now))
+    )
+    metrics = {row['project_id']: _metrics_from_row(row) for row in rows}
+    return {project_id: metrics.get(project_id) or _metrics_from_row({}) for project_id in project_ids}
+
+
+def _task_count(queryset):
+    """Correlated per-task COUNT over ``queryset``; 0 when there are no rows."""
+    counts = queryset.filter(task=OuterRef('pk')).order_by().values('task').annotate(total=Count('id')).values('total')
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+def annotate_task_counters(queryset):
+    """Annotate the counters TaskSerializer exposes so lists avoid per-row queries.
+
+    Each counter is its own correlated subquery; joining the three relations
+    and counting DISTINCT would multiply rows per task first.
+    """
+    return queryset.annotate(
+        comment_count=_task_count(TaskComment.objects.all()),
+        attachment_count=_task_count(TaskAttachment.objects.all()),
+        subtask_count=_task_count(SubTask.objects.all()),
+        completed_subtask_count=_task_count(SubTask.objects.filter(is_completed=True)),
+    )
+
+
+def project_task_metrics(project, now=None):
+    """Return task metrics for a single project (one query)."""
+    project_id = getattr(project, 'pk', project)
+    return project_task_metrics_map([project_id], now=now)[project_id]
+
+
+def project_file_metrics_map(project_ids):
+    """Return live file counts, final-file counts and storage usage per project."""
+    project_ids = list(dict.fromkeys(project_ids))
+    if not project_ids:
+        return {}
+
+    rows = (
+        ProjectFile.objects.filter(project_id__in=project_ids, is_deleted=False)
+        .order_by()
+        .values('project_id')
+        .annotate(
+            total_files=Count('id'),
+            final_files=Count('id', filter=Q(tag=ProjectFile.Tag.FINAL)),
+            storage_used_bytes=Sum('file_size'),
+        )
+    )
+    metrics = {row['project_id']: row for row in rows}
+    result = {}
+    for project_id in project_ids:
+        row = metrics.get(project_id, {})
+        result[project_id] = {
+            'total_files': row.get('total_files', 0),
+            'final_files': row.get('final_files', 0),
+            'has_final_file': row.get('final_files', 0) > 0,
+            'storage_used_bytes': row.get('storage_used_bytes') or 0,
+        }
+    return result
+
+
+def project_latest_activity_map(projects):
+    """Return the most recent activity timestamp for each project.
+
+    Reads the activity index in one grouped query; a project's own
+    ``updated_at`` counts as activity too.
+    """
+    projects = list(projects)
+    if not projects:
+        return {}
+
+    indexed = dict(
+        ProjectActivityIndex.objects.filter(project_id__in=[project.id for project in projects])
+        .order_by()
+        .values('project_id')
+        .annotate(latest=Max('last_activity_at'))
+        .values_list('project_id', 'latest')
+    )
+    latest = {}
+    for project in projects:
+        timestamps = [project.updated_at, indexed.get(project.id)]
+        latest[project.id] = max([ts for ts in timestamps if ts], default=project.updated_at)
+    return latest
+
+
+def member_last_activity_map(project_ids):
+    """Return {(project_id, user_id): last activity timestamp} for the given projects."""
+    project_ids = list(dict.fromkeys(project_ids))
+    if not project_ids:
+        return {}
+
+    rows = ProjectActivityIndex.objects.filter(
+        project_id__in=project_ids,
+        user__isnull=False,
+    ).values_list('project_id', 'user_id', 'last_activity_at')
+    return {(project_id, user_id): timestamp for project_id, user_id, timestamp in rows}
+
+
+METRICS_CACHE_PREFIX = 'project-metrics'
+
+
+def _metrics_cache_key(project_id):
+    return f'{METRICS_CACHE_PREFIX}:{project_id}'
+
+
+def _count_cache_event(name, amount):
+    if not amount:
+        return
+    key = f'{METRICS_CACHE_PREFIX}:stats:{name}'
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key, amount)
+    except ValueError:
+        cache.set(key, amount, timeout=None)
+
+
+def cached_project_metrics_map(project_ids):
+    """Return task and file metrics per project, served from the cache when possible.
+
+    Missing entries are computed with the grouped queries above and stored
+    for ``PROJECT_METRICS_CACHE_TIMEOUT`` seconds; writes to a project's
+    tasks, files, memberships or messages invalidate its entry.
+    """
+    project_ids = list(dict.fromkeys(project_ids))
+    if not project_ids:
+        return {}
+
+    keys = {project_id: _metrics_cache_key(project_id) for project_id in project_ids}
+    cached = cache.get_many(list(keys.values()))
+    result = {project_id: cached[key] for project_id, key in keys.items() if key in cached}
+    missing = [project_id for project_id in project_ids if project_id not in result]
+    _count_cache_event('hits', len(result))
+    _count_cache_event('misses', len(missing))
+
+    if missing:
+        task_metrics = project_task_metrics_map(missing)
+        file_metrics = project_file_metrics_map(missing)
+        fresh = {project_id: {**task_metrics[project_id], **file_metrics[project_id]} for project_id in missing}
+        cache.set_many(
+            {keys[project_id]: metrics for project_id, metrics in fresh.items()},
+            timeout=settings.PROJECT_METRICS_CACHE_TIMEOUT,
+        )
+        result.update(fresh)
+
+    return {project_id: result[project_id] for project_id in project_ids}
+
+
+def cached_project_metrics(project):
+    """Return cached task and file metrics for a single project."""
+    project_id = getattr(project, 'pk', project)
+    return cached_project_metrics_map([project_id])[project_id]
+
+
+def invalidate_project_metrics(*project_ids):
+    cache.delete_many([_metrics_cache_key(project_id) for project_id in project_ids if project_id])
+
+
+def project_metrics_cache_stats():
+    """Return the cache hit/miss counters for project metrics."""
+    return {
+        name: cache.get(f'{METRICS_CACHE_PREFIX}:stats:{name}', 0)
+        for name in ['hits', 'misses']
+    }
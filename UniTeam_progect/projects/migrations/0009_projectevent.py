@@ -0,0 +1,36 @@
+# Generated by Django 5.2.5 on 2026-10-17 17:20
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0008_projectactivityindex'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('category', models.CharField(choices=[('TASK', 'Task'), ('FILE', 'File'), ('COMMUNICATION', 'Communication')], max_length=20)),
+                ('source', models.CharField(max_length=30)),
+                ('source_id', models.PositiveBigIntegerField()),
+                ('label', models.TextField()),
+                ('payload', models.JSONField(blank=True, default=dict)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('actor', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='project_events', to=settings.AUTH_USER_MODEL)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='events', to='projects.project')),
+            ],
+            options={
+                'ordering': ['-created_at', '-id'],
+                'indexes': [models.Index(fields=['project', 'created_at'], name='project_event_project_idx'), models.Index(fields=['actor', 'created_at'], name='project_event_actor_idx')],
+                'constraints': [models.UniqueConstraint(fields=('source', 'source_id'), name='uniq_project_event_per_source_row')],
+            },
+        ),
+    ]
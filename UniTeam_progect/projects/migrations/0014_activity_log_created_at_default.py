@@ -0,0 +1,24 @@
+# Generated by Django 5.2.5 on 2026-10-17 23:10
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0013_backgroundjob'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='taskactivitylog',
+            name='created_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AlterField(
+            model_name='projectfileactivitylog',
+            name='created_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.5 on 2026-10-17 23:30
+
+from django.db import migrations, models
+
+
+def backfill_activity_index(apps, schema_editor):
+    # Mirrors projects.activity.rebuild_activity_index against the historical models.
+    ProjectActivityIndex = apps.get_model('projects', 'ProjectActivityIndex')
+    sources = [
+        (apps.get_model('projects', 'TaskActivityLog'), 'task__project_id', 'actor_id'),
+        (apps.get_model('projects', 'ProjectFileActivityLog'), 'project_id', 'actor_id'),
+        (apps.get_model('communication', 'Message'), 'channel__project_id', 'sender_id'),
+        (apps.get_model('communication', 'Announcement'), 'project_id', 'author_id'),
+        (apps.get_model('communication', 'MeetingPoll'), 'project_id', None),
+    ]
+    latest = {}
+    for model, project_field, user_field in sources:
+        group_fields = [project_field] + ([user_field] if user_field else [])
+        for row in model.objects.order_by().values(*group_fields).annotate(latest=models.Max('created_at')):
+            key = (row[project_field], row[user_field] if user_field else None)
+            if row['latest'] and (key not in latest or row['latest'] > latest[key]):
+                latest[key] = row['latest']
+
+    ProjectActivityIndex.objects.all().delete()
+    ProjectActivityIndex.objects.bulk_create(
+        [
+            ProjectActivityIndex(project_id=project_id, user_id=user_id, last_activity_at=timestamp)
+            for (project_id, user_id), timestamp in latest.items()
+            if project_id is not None
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0014_activity_log_created_at_default'),
+        ('communication', '0007_meetingslot_reminder_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_activity_index, migrations.RunPython.noop),
+    ]
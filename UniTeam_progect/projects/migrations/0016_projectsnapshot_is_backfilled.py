@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-17 23:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0015_backfill_activity_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='projectsnapshot',
+            name='is_backfilled',
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -1,7 +1,9 @@
 from django.db import models
 from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
 from django.urls import reverse
 from django.utils import timezone
+import secrets
 from datetime import timedelta
 
 
@@ -102,6 +104,7 @@ class Milestone(models.Model):
     description = models.TextField(blank=True)
     due_date = models.DateField()
     status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
+    updated_at = models.DateTimeField(auto_now=True)
 
     # --- NEW FIELD ---
     # Tracks which team members are responsible for this milestone.
@@ -179,6 +182,10 @@ class Notification(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['recipient', 'id'], name='notif_recipient_id_idx'),
+            models.Index(fields=['recipient', 'read_at'], name='notif_recipient_read_idx'),
+        ]
 
     def mark_as_read(self):
         if not self.read_at:
@@ -314,7 +321,7 @@ class TaskActivityLog(models.Model):
     old_value = models.TextField(blank=True)
     new_value = models.TextField(blank=True)
     reason = models.TextField(blank=True)
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(default=timezone.now)
 
     class Meta:
         ordering = ['-created_at']
@@ -430,7 +437,7 @@ class ProjectFileActivityLog(models.Model):
     actor = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='file_activity_logs')
     action_type = models.CharField(max_length=40, choices=ActionType.choices)
     metadata = models.JSONField(default=dict, blank=True)
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(default=timezone.now)
 
     class Meta:
         ordering = ['-created_at']
@@ -484,6 +491,8 @@ class ProjectSnapshot(models.Model):
     project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='snapshots')
     snapshot_date = models.DateField()
     metrics = models.JSONField(default=dict)
+    # Written after the day had passed, from the task state at that later time.
+    is_backfilled = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
@@ -570,4 +579,141 @@ class CalendarEvent(models.Model):
         ordering = ['start_datetime', 'title']
 
     def __str__(self):
-        return f"{self.project.title} - {self.title}"
\ No newline at end of file
+        return f"{self.project.title} - {self.title}"
+
+
+class ProjectActivityIndex(models.Model):
+    """Latest activity timestamp per (project, member).
+
+    Rows with no user hold activity that is not attributed to a member
+    (system task/file logs and meeting polls). Maintained by projects.signals
+    and rebuilt by the backfill_activity_index command.
+    """
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='activity_index')
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, null=True, blank=True, related_name='project_activity_index')
+    last_activity_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['project', 'user'], name='uniq_activity_index_per_member'),
+            models.UniqueConstraint(
+                fields=['project'],
+                condition=models.Q(user__isnull=True),
+                name='uniq_activity_index_unattributed_per_project',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.project_id}:{self.user_id or '-'} @ {self.last_activity_at}"
+
+
+class ProjectEvent(models.Model):
+    """Append-only copy of every project activity row, read by timelines and feeds.
+
+    Emitted by projects.signals when a task/file activity log, channel
+    message, announcement or meeting poll is created, and filled in for
+    older rows by the backfill_project_events command.
+    """
+    class Category(models.TextChoices):
+        TASK = 'TASK', 'Task'
+        FILE = 'FILE', 'File'
+        COMMUNICATION = 'COMMUNICATION', 'Communication'
+
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='events')
+    actor = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='project_events')
+    category = models.CharField(max_length=20, choices=Category.choices)
+    source = models.CharField(max_length=30)
+    source_id = models.PositiveBigIntegerField()
+    label = models.TextField()
+    payload = models.JSONField(default=dict, blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['-created_at', '-id']
+        indexes = [
+            models.Index(fields=['project', 'created_at'], name='project_event_project_idx'),
+            models.Index(fields=['actor', 'created_at'], name='project_event_actor_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['source', 'source_id'], name='uniq_project_event_per_source_row'),
+        ]
+
+    def __str__(self):
+        return f"{self.project_id} {self.source}#{self.source_id} @ {self.created_at}"
+
+
+def generate_calendar_feed_token():
+    return secrets.token_urlsafe(32)
+
+
+class CalendarFeedToken(models.Model):
+    """Secret that lets calendar clients fetch a user's .ics feed without a JWT."""
+    user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='calendar_feed_token')
+    token = models.CharField(max_length=64, unique=True, default=generate_calendar_feed_token)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def rotate(self):
+        self.token = generate_calendar_feed_token()
+        self.created_at = timezone.now()
+        self.save(update_fields=['token', 'created_at'])
+
+    def __str__(self):
+        return f"Calendar feed for {self.user_id}"
+
+
+class OutboundEmail(models.Model):
+    """One queued email, written by request handlers and delivered by the send_queued_emails command."""
+    class Status(models.TextChoices):
+        PENDING = 'PENDING', 'Pending'
+        SENDING = 'SENDING', 'Sending'
+        SENT = 'SENT', 'Sent'
+        FAILED = 'FAILED', 'Failed'
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=254)
+    to_email = models.EmailField()
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='outbound_email_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.to_email}: {self.subject} ({self.status})"
+
+
+class BackgroundJob(models.Model):
+    """A side effect deferred out of the request; see projects.jobs."""
+    class Status(models.TextChoices):
+        PENDING = 'PENDING', 'Pending'
+        RUNNING = 'RUNNING', 'Running'
+        DONE = 'DONE', 'Done'
+        FAILED = 'FAILED', 'Failed'
+
+    name = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, blank=True, encoder=DjangoJSONEncoder)
+    idempotency_key = models.CharField(max_length=200, unique=True, null=True, blank=True)
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    run_after = models.DateTimeField(default=timezone.now)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['status', 'run_after'], name='background_job_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.name}#{self.id} ({self.status})"
@@ -0,0 +1,182 @@
+from django.apps import apps
+from django.conf import settings
+
+from communication.realtime import publish_notifications
+from users.models import CustomUser
+
+from .jobs import enqueue_job
+from .models import Notification, TaskNotification
+from .outbox import enqueue_email_batch
+
+
+def _pk(value):
+    return getattr(value, 'pk', value)
+
+
+def recipient_ids(recipients):
+    """Distinct user ids, in first-seen order, from a mix of users, ids and None."""
+    ids = {}
+    for recipient in recipients:
+        if not recipient:
+            continue
+        user_id = recipient if isinstance(recipient, int) else recipient.id
+        ids[user_id] = True
+    return list(ids)
+
+
+def send_notification_emails(subject, message, recipient_list):
+    """Queue ``message`` for each address when email notifications are enabled.
+
+    Delivery happens in the send_queued_emails worker; returns the number
+    of emails queued.
+    """
+    return send_notification_email_batch([(subject, message, recipient_list)])
+
+
+def send_notification_email_batch(messages):
+    """Queue several ``(subject, message, recipient_list)`` emails in one insert when email notifications are enabled."""
+    if not getattr(settings, 'ENABLE_EMAIL_NOTIFICATIONS', False):
+        return 0
+    return enqueue_email_batch(messages)
+
+
+def dispatch_project_notifications(*, recipients, notification_type, title, message, project=None, invitation=None, milestone=None, task=None):
+    """Bulk-create projects.Notification rows, plus TaskNotification rows when ``task`` is given.
+
+    ``project``, ``invitation``, ``milestone`` and ``task`` may be instances or ids.
+
+    Costs one user lookup and one insert per table however many recipients there are.
+    """
+    ids = recipient_ids(recipients)
+    if not ids:
+        return []
+    ids = list(CustomUser.objects.filter(id__in=ids).values_list('id', flat=True))
+
+    notifications = Notification.objects.bulk_create([
+        Notification(
+            recipient_id=user_id,
+            type=notification_type,
+            title=title,
+            message=message,
+            project_id=_pk(project),
+            invitation_id=_pk(invitation),
+            milestone_id=_pk(milestone),
+        )
+        for user_id in ids
+    ])
+    if task is not None:
+        TaskNotification.objects.bulk_create([
+            TaskNotification(recipient_id=user_id, task_id=_pk(task), notification_type=notification_type, message=message)
+            for user_id in ids
+        ])
+    publish_notifications(notifications, 'projects', 'message')
+    return notifications
+
+
+def queue_project_notifications(*, recipients, notification_type, title, message, project=None, invitation=None, milestone=None, task=None):
+    """Run :func:`dispatch_project_notifications` as a background job instead of inside the request."""
+    ids = recipient_ids(recipients)
+    if not ids:
+        return None
+    return enqueue_job('projects.notify', {
+        'recipients': ids,
+        'notification_type': notification_type,
+        'title': title,
+        'message': message,
+        'project': _pk(project),
+        'invitation': _pk(invitation),
+        'milestone': _pk(milestone),
+        'task': _pk(task),
+    })
+
+
+def notification_preferences(user_ids, notification_types):
+    """Map (user id, type) -> (in_app_enabled, email_enabled, email_frequency), with defaults filled in."""
+    NotificationPreference = apps.get_model('communication', 'NotificationPreference')
+    defaults = (True, False, NotificationPreference.EmailFrequency.DIGEST)
+    preferences = {
+        (user_id, notification_type): defaults
+        for user_id in user_ids
+        for notification_type in notification_types
+    }
+    rows = NotificationPreference.objects.filter(user_id__in=user_ids, notification_type__in=notification_types).values_list(
+        'user_id', 'notification_type', 'in_app_enabled', 'email_enabled', 'email_frequency',
+    )
+    for user_id, notification_type, in_app_enabled, email_enabled, email_frequency in rows:
+        preferences[(user_id, notification_type)] = (in_app_enabled, email_enabled, email_frequency)
+    return preferences
+
+
+def dispatch_communication_batches(batches):
+    """Bulk-create communication.Notification rows for several notifications at once.
+
+    Each batch is a dict of :func:`dispatch_communication_notifications`
+    keyword arguments. Recipients who turned a type off in-app are skipped
+    unless the batch sets ``always_in_app``; those who asked for immediate
+    email get it through the outbox. All batches together cost one user
+    query, one preference query and one insert per table.
+    """
+    CommunicationNotification = apps.get_model('communication', 'Notification')
+    NotificationPreference = apps.get_model('communication', 'NotificationPreference')
+    batches = [(batch, recipient_ids(batch['recipients'])) for batch in batches]
+    all_ids = {user_id for _, ids in batches for user_id in ids}
+    if not all_ids:
+        return []
+    emails = dict(CustomUser.objects.filter(id__in=all_ids).values_list('id', 'email'))
+    preferences = notification_preferences(list(emails), {batch['notification_type'] for batch, _ in batches})
+
+    rows = []
+    outgoing_emails = []
+    for batch, ids in batches:
+        notification_type = batch['notification_type']
+        immediate_email_recipients = []
+        for user_id in ids:
+            if user_id not in emails:
+                continue
+            in_app_enabled, email_enabled, email_frequency = preferences[(user_id, notification_type)]
+            if not in_app_enabled and not batch.get('always_in_app'):
+                continue
+            rows.append(
+                CommunicationNotification(
+                    recipient_id=user_id,
+                    type=notification_type,
+                    title=batch['title'],
+                    message_body=batch['message'],
+                    project_id=_pk(batch.get('project')),
+                    related_object_type=batch.get('related_type', ''),
+                    related_object_id=batch.get('related_id'),
+                )
+            )
+            if email_enabled and email_frequency == NotificationPreference.EmailFrequency.IMMEDIATE:
+                immediate_email_recipients.append(emails[user_id])
+        outgoing_emails.append((batch['title'], batch['message'], immediate_email_recipients))
+
+    notifications = CommunicationNotification.objects.bulk_create(rows)
+    publish_notifications(notifications, 'communication', 'message_body')
+    send_notification_email_batch(outgoing_emails)
+    return notifications
+
+
+def dispatch_communication_notifications(*, recipients, notification_type, title, message, project=None, related_type='', related_id=None, always_in_app=False):
+    """Bulk-create communication.Notification rows according to each recipient's preferences."""
+    return dispatch_communication_batches([{
+        'recipients': recipients,
+        'notification_type': notification_type,
+        'title': title,
+        'message': message,
+        'project': project,
+        'related_type': related_type,
+        'related_id': related_id,
+        'always_in_app': always_in_app,
+    }])
+
+
+def queue_communication_batches(batches):
+    """Run :func:`dispatch_communication_batches` as a background job instead of inside the request."""
+    payload = [
+        {**batch, 'recipients': recipient_ids(batch['recipients']), 'project': _pk(batch.get('project'))}
+        for batch in batches
+    ]
+    if not any(batch['recipients'] for batch in payload):
+        return None
+    return enqueue_job('communication.notify', {'batches': payload})
@@ -0,0 +1,146 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import OutboundEmail
+
+
+OUTBOX_BATCH_SIZE = 100
+OUTBOX_MAX_ATTEMPTS = 5
+OUTBOX_RETRY_BASE_SECONDS = 60
+OUTBOX_CLAIM_SECONDS = 10 * 60
+OUTBOX_STATS_PREFIX = 'email-outbox:stats'
+
+
+def enqueue_emails(subject, message, recipient_list, from_email=None):
+    """Queue one email per distinct address for the send_queued_emails worker.
+
+    Costs a single insert, so it is safe to call inside a request; returns
+    the number of emails queued.
+    """
+    return enqueue_email_batch([(subject, message, recipient_list)], from_email=from_email)
+
+
+def enqueue_email_batch(messages, from_email=None):
+    """Queue several ``(subject, message, recipient_list)`` emails with one insert; returns the number queued."""
+    from_email = from_email or getattr(settings, 'DEFAULT_FROM_EMAIL', 'noreply@uniteam.local')
+    rows = [
+        OutboundEmail(subject=subject[:255], body=message, from_email=from_email, to_email=address)
+        for subject, message, recipient_list in messages
+        for address in dict.fromkeys(address for address in recipient_list if address)
+    ]
+    OutboundEmail.objects.bulk_create(rows)
+    return len(rows)
+
+
+def retry_delay(attempts):
+    """Exponential backoff after the ``attempts``-th failed delivery: 1, 2, 4, ... minutes."""
+    return timedelta(seconds=OUTBOX_RETRY_BASE_SECONDS * 2 ** max(attempts - 1, 0))
+
+
+def _count_outbox_event(name, amount):
+    if not amount:
+        return
+    key = f'{OUTBOX_STATS_PREFIX}:{name}'
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key, amount)
+    except ValueError:
+        cache.set(key, amount, timeout=None)
+
+
+def _claim_batch(batch_size):
+    """Mark up to ``batch_size`` due rows SENDING and return them.
+
+    The claim is committed before anything is sent, so other workers skip
+    the rows without a lock held across SMTP round trips. It lasts
+    ``OUTBOX_CLAIM_SECONDS``: rows a killed worker left SENDING become due
+    again once it runs out.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        batch = list(
+            OutboundEmail.objects.select_for_update(skip_locked=True)
+            .filter(
+                status__in=[OutboundEmail.Status.PENDING, OutboundEmail.Status.SENDING],
+                next_attempt_at__lte=now,
+            )
+            .order_by('next_attempt_at', 'id')[:batch_size]
+        )
+        OutboundEmail.objects.filter(id__in=[row.id for row in batch]).update(
+            status=OutboundEmail.Status.SENDING,
+            next_attempt_at=now + timedelta(seconds=OUTBOX_CLAIM_SECONDS),
+        )
+    return batch
+
+
+def _send_batch(connection, batch):
+    """Send ``batch`` over the open ``connection`` one message at a time.
+
+    Each row is saved as soon as its own send succeeds or fails, so neither
+    a backend that raises part way through (as SMTP does) nor a worker
+    killed mid-batch causes a delivered email to be sent again. Only the
+    message in flight when a worker dies can go out twice.
+    """
+    sent = retrying = failed = 0
+    for row in batch:
+        message = EmailMessage(subject=row.subject, body=row.body, from_email=row.from_email, to=[row.to_email], connection=connection)
+        row.attempts += 1
+        try:
+            connection.send_messages([message])
+        except Exception as exc:
+            row.last_error = f'{type(exc).__name__}: {exc}'[:2000]
+            row.next_attempt_at = timezone.now() + retry_delay(row.attempts)
+            if row.attempts >= OUTBOX_MAX_ATTEMPTS:
+                row.status = OutboundEmail.Status.FAILED
+                failed += 1
+            else:
+                row.status = OutboundEmail.Status.PENDING
+                retrying += 1
+        else:
+            row.status = OutboundEmail.Status.SENT
+            row.sent_at = timezone.now()
+            row.last_error = ''
+            sent += 1
+        row.save(update_fields=['status', 'attempts', 'sent_at', 'last_error', 'next_attempt_at'])
+    return sent, retrying, failed
+
+
+def drain_outbox(batch_size=OUTBOX_BATCH_SIZE, max_batches=None):
+    """Send every due queued email over one connection, claiming ``batch_size`` rows at a time.
+
+    Claimed rows are skipped by other workers, so several can drain the same
+    table. Failed emails are rescheduled with :func:`retry_delay` and marked
+    FAILED after ``OUTBOX_MAX_ATTEMPTS``. Returns counts for the run plus its
+    elapsed time and throughput.
+    """
+    stats = {'sent': 0, 'retrying': 0, 'failed': 0, 'batches': 0}
+    started = time.perf_counter()
+    connection = get_connection()
+    with connection:
+        while max_batches is None or stats['batches'] < max_batches:
+            batch = _claim_batch(batch_size)
+            if not batch:
+                break
+            sent, retrying, failed = _send_batch(connection, batch)
+            stats['sent'] += sent
+            stats['retrying'] += retrying
+            stats['failed'] += failed
+            stats['batches'] += 1
+
+    elapsed = time.perf_counter() - started
+    for name in ['sent', 'retrying', 'failed', 'batches']:
+        _count_outbox_event(name, stats[name])
+    return {**stats, 'elapsed': elapsed, 'per_second': stats['sent'] / elapsed if elapsed else 0.0}
+
+
+def outbox_stats():
+    """Delivery counters accumulated by every worker run, plus the current queue depth."""
+    counters = {name: cache.get(f'{OUTBOX_STATS_PREFIX}:{name}', 0) for name in ['sent', 'retrying', 'failed', 'batches']}
+    counters['pending'] = OutboundEmail.objects.filter(status=OutboundEmail.Status.PENDING).count()
+    return counters
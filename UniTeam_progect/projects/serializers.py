@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from django.db.models import Count, OuterRef, Subquery
 from django.utils import timezone
 from .models import (
     Project, Team, TeamMembership, Milestone, Invitation, Notification,
@@ -6,12 +7,13 @@ from .models import (
     FileFolder, ProjectFile, ProjectFileVersion, ProjectFileActivityLog, ProjectTrash,
     DashboardWidget, ProjectSnapshot, LecturerAlert, SubmissionChecklist, CalendarEvent
 )
-from users.serializers import UserSerializer
+from .metrics import project_task_metrics, project_task_metrics_map
+from users.serializers import UserContactSerializer, UserSummarySerializer
 from users.models import CustomUser
 
 
 class MilestoneSerializer(serializers.ModelSerializer):
-    assigned_to = UserSerializer(many=True, read_only=True)
+    assigned_to = UserSummarySerializer(many=True, read_only=True)
     assigned_to_ids = serializers.PrimaryKeyRelatedField(
         many=True, 
         write_only=True, 
@@ -28,7 +30,7 @@ class MilestoneSerializer(serializers.ModelSerializer):
 
 
 class TeamMembershipSerializer(serializers.ModelSerializer):
-    user = UserSerializer(read_only=True)
+    user = UserContactSerializer(read_only=True)
     user_id = serializers.PrimaryKeyRelatedField(
         write_only=True,
         queryset=CustomUser.objects.all(),
@@ -50,10 +52,40 @@ class TeamSerializer(serializers.ModelSerializer):
         read_only_fields = ['id']
 
 
+def annotate_project_list(queryset, user=None):
+    """Annotate and prefetch what ProjectSerializer reads for each project.
+
+    ``user`` should be the requesting user so ``current_membership`` can be
+    read from the annotation instead of a per-row lookup.
+    """
+    queryset = queryset.select_related('supervisor', 'template_used', 'team').prefetch_related(
+        'team__teammembership_set__user',
+        'milestones__assigned_to',
+    ).annotate(team_member_count=Count('team__teammembership', distinct=True))
+    if user is not None and user.is_authenticated:
+        memberships = TeamMembership.objects.filter(team__project=OuterRef('pk'), user=user)
+        queryset = queryset.annotate(
+            current_membership_id=Subquery(memberships.values('id')[:1]),
+            current_membership_role=Subquery(memberships.values('role')[:1]),
+        )
+    return queryset
+
+
+class ProjectListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        # Task metrics for the whole page come from one grouped query.
+        projects = list(data.all() if hasattr(data, 'all') else data)
+        missing = [project for project in projects if not hasattr(project, '_task_metrics')]
+        metrics = project_task_metrics_map([project.pk for project in missing])
+        for project in missing:
+            project._task_metrics = metrics[project.pk]
+        return super().to_representation(projects)
+
+
 class ProjectSerializer(serializers.ModelSerializer):
     status = serializers.CharField(source='lifecycle_status', read_only=True)
     linked_lecturer_email = serializers.EmailField(write_only=True, required=False, allow_blank=True, allow_null=True)
-    supervisor = UserSerializer(read_only=True)
+    supervisor = UserSummarySerializer(read_only=True)
     supervisor_id = serializers.PrimaryKeyRelatedField(
         write_only=True,
         queryset=CustomUser.objects.filter(role='LECTURER'),
@@ -103,6 +135,7 @@ class ProjectSerializer(serializers.ModelSerializer):
                   'template_used_title', 'created_at', 'updated_at', 'team', 'milestones',
                   'task_progress_percentage', 'task_count']
         read_only_fields = ['id', 'created_at', 'updated_at']
+        list_serializer_class = ProjectListSerializer
 
     def get_supervisor_name(self, obj):
         if not obj.supervisor:
@@ -122,6 +155,14 @@ class ProjectSerializer(serializers.ModelSerializer):
         if not user:
             return None
 
+        if hasattr(obj, 'current_membership_id'):
+            if obj.current_membership_id is None:
+                return None
+            return {
+                'id': obj.current_membership_id,
+                'role': obj.current_membership_role,
+            }
+
         try:
             team = obj.team
         except Team.DoesNotExist:
@@ -137,31 +178,25 @@ class ProjectSerializer(serializers.ModelSerializer):
         }
 
     def get_team_size(self, obj):
+        if hasattr(obj, 'team_member_count'):
+            return obj.team_member_count
         try:
             team = obj.team
         except Team.DoesNotExist:
             return 0
         return team.members.count()
 
-    def get_task_progress_percentage(self, obj):
-        tasks = obj.tasks.filter(is_cancelled=False)
-        total = tasks.count()
-        if total == 0:
-            return 0
-
-        completed_weight = 0.0
-        for task in tasks:
-            if task.status == Task.Status.DONE:
-                completed_weight += 1
-            elif task.status == Task.Status.IN_PROGRESS:
-                completed_weight += (task.progress_percentage or 0) / 100
-            elif task.status == Task.Status.UNDER_REVIEW:
-                completed_weight += max((task.progress_percentage or 75), 0) / 100
+    def _task_metrics(self, obj):
+        # Progress and count come from the same aggregate; compute it once per project.
+        if not hasattr(obj, '_task_metrics'):
+            obj._task_metrics = project_task_metrics(obj)
+        return obj._task_metrics
 
-        return round((completed_weight / total) * 100)
+    def get_task_progress_percentage(self, obj):
+        return self._task_metrics(obj)['progress_percentage']
 
     def get_task_count(self, obj):
-        return obj.tasks.filter(is_cancelled=False).count()
+        return self._task_metrics(obj)['total_tasks']
 
 
 class SectionSerializer(serializers.ModelSerializer):
@@ -177,7 +212,7 @@ class SectionSerializer(serializers.ModelSerializer):
 
 
 class TaskCommentSerializer(serializers.ModelSerializer):
-    author = UserSerializer(read_only=True)
+    author = UserSummarySerializer(read_only=True)
     author_id = serializers.PrimaryKeyRelatedField(write_only=True, queryset=CustomUser.objects.all(), source='author', required=False)
     can_edit = serializers.SerializerMethodField()
 
@@ -198,7 +233,7 @@ class SubTaskSerializer(serializers.ModelSerializer):
 
 
 class TaskAttachmentSerializer(serializers.ModelSerializer):
-    uploaded_by = UserSerializer(read_only=True)
+    uploaded_by = UserSummarySerializer(read_only=True)
     file_url = serializers.SerializerMethodField()
 
     class Meta:
@@ -215,7 +250,7 @@ class TaskAttachmentSerializer(serializers.ModelSerializer):
 
 
 class TaskActivityLogSerializer(serializers.ModelSerializer):
-    actor = UserSerializer(read_only=True)
+    actor = UserSummarySerializer(read_only=True)
 
     class Meta:
         model = TaskActivityLog
@@ -243,7 +278,7 @@ class FileFolderSerializer(serializers.ModelSerializer):
 
 
 class ProjectFileVersionSerializer(serializers.ModelSerializer):
-    uploader = UserSerializer(read_only=True)
+    uploader = UserSummarySerializer(read_only=True)
     file_url = serializers.SerializerMethodField()
 
     class Meta:
@@ -260,7 +295,7 @@ class ProjectFileVersionSerializer(serializers.ModelSerializer):
 
 
 class ProjectFileActivityLogSerializer(serializers.ModelSerializer):
-    actor = UserSerializer(read_only=True)
+    actor = UserSummarySerializer(read_only=True)
 
     class Meta:
         model = ProjectFileActivityLog
@@ -270,7 +305,7 @@ class ProjectFileActivityLogSerializer(serializers.ModelSerializer):
 
 class ProjectTrashSerializer(serializers.ModelSerializer):
     original_file = serializers.SerializerMethodField()
-    deleted_by = UserSerializer(read_only=True)
+    deleted_by = UserSummarySerializer(read_only=True)
 
     class Meta:
         model = ProjectTrash
@@ -286,8 +321,8 @@ class ProjectTrashSerializer(serializers.ModelSerializer):
 
 
 class ProjectFileSerializer(serializers.ModelSerializer):
-    uploaded_by = UserSerializer(read_only=True)
-    version_lock_by = UserSerializer(read_only=True)
+    uploaded_by = UserSummarySerializer(read_only=True)
+    version_lock_by = UserSummarySerializer(read_only=True)
     folder = FileFolderSerializer(read_only=True)
     folder_id = serializers.PrimaryKeyRelatedField(write_only=True, queryset=FileFolder.objects.all(), source='folder', required=False, allow_null=True)
     linked_task = serializers.SerializerMethodField()
@@ -343,14 +378,33 @@ class ProjectFileSerializer(serializers.ModelSerializer):
         return attrs
 
 
+TASK_DETAIL_FIELDS = ('subtasks', 'comments', 'attachments', 'activity_logs')
+TASK_EXPANDABLE_FIELDS = TASK_DETAIL_FIELDS + ('project',)
+# prefetch_related lookups that let TaskSerializer render each detail field without per-task queries.
+TASK_DETAIL_PREFETCHES = {
+    'subtasks': 'subtasks',
+    'comments': 'comments__author',
+    'attachments': 'attachments__uploaded_by',
+    'activity_logs': 'activity_logs__actor',
+}
+
+
 class TaskSerializer(serializers.ModelSerializer):
-    project = ProjectSerializer(read_only=True)
+    """Compact task representation for lists.
+
+    Counters read the annotations added by ``annotate_task_counters`` and
+    ``project`` is an id/title stub. Nested subtasks, comments, attachments
+    and activity logs are included when the view passes ``detail=True`` in
+    the context (retrieve and task actions) or the request asks for them
+    with ``?expand=``; ``?expand=project`` returns the full project.
+    """
+    project = serializers.SerializerMethodField()
     project_id = serializers.PrimaryKeyRelatedField(write_only=True, queryset=Project.objects.all(), source='project', required=False)
-    section = SectionSerializer(read_only=True)
+    section = serializers.SerializerMethodField()
     section_id = serializers.PrimaryKeyRelatedField(write_only=True, queryset=Section.objects.all(), source='section', required=False, allow_null=True)
-    assigned_to = UserSerializer(read_only=True)
+    assigned_to = UserSummarySerializer(read_only=True)
     assigned_to_id = serializers.PrimaryKeyRelatedField(write_only=True, queryset=CustomUser.objects.filter(role='STUDENT'), source='assigned_to', required=False, allow_null=True)
-    created_by = UserSerializer(read_only=True)
+    created_by = UserSummarySerializer(read_only=True)
     created_by_id = serializers.PrimaryKeyRelatedField(write_only=True, queryset=CustomUser.objects.all(), source='created_by', required=False)
     subtasks = SubTaskSerializer(many=True, read_only=True)
     comments = TaskCommentSerializer(many=True, read_only=True)
@@ -375,6 +429,20 @@ class TaskSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'created_by', 'created_at', 'updated_at', 'in_progress_at', 'under_review_at', 'completed_at', 'cancelled_at']
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        expanded = self._expanded_fields()
+        for field_name in TASK_DETAIL_FIELDS:
+            if field_name not in expanded:
+                self.fields.pop(field_name, None)
+
+    def _expanded_fields(self):
+        expanded = set(TASK_DETAIL_FIELDS) if self.context.get('detail') else set()
+        request = self.context.get('request')
+        query_params = getattr(request, 'query_params', {})
+        requested = {name.strip() for name in (query_params.get('expand') or '').split(',')}
+        return expanded | (requested & set(TASK_EXPANDABLE_FIELDS))
+
     def validate(self, attrs):
         project = attrs.get('project') or getattr(self.instance, 'project', None)
         section = attrs.get('section') or getattr(self.instance, 'section', None)
@@ -395,17 +463,41 @@ class TaskSerializer(serializers.ModelSerializer):
 
         return attrs
 
+    def get_project(self, obj):
+        if 'project' in self._expanded_fields():
+            return ProjectSerializer(obj.project, context=self.context).data
+        return {
+            'id': obj.project_id,
+            'title': obj.project.title,
+            'course_code': obj.project.course_code,
+            'deadline': obj.project.deadline,
+        }
+
+    def get_section(self, obj):
+        if not obj.section:
+            return None
+        return {
+            'id': obj.section.id,
+            'name': obj.section.name,
+            'order': obj.section.order,
+        }
+
+    def _counter(self, obj, name, queryset):
+        # Annotated by annotate_task_counters(); fall back to a query for bare instances.
+        value = getattr(obj, name, None)
+        return queryset.count() if value is None else value
+
     def get_comment_count(self, obj):
-        return obj.comments.count()
+        return self._counter(obj, 'comment_count', obj.comments.all())
 
     def get_attachment_count(self, obj):
-        return obj.attachments.count()
+        return self._counter(obj, 'attachment_count', obj.attachments.all())
 
     def get_subtask_count(self, obj):
-        return obj.subtasks.count()
+        return self._counter(obj, 'subtask_count', obj.subtasks.all())
 
     def get_completed_subtask_count(self, obj):
-        return obj.subtasks.filter(is_completed=True).count()
+        return self._counter(obj, 'completed_subtask_count', obj.subtasks.filter(is_completed=True))
 
     def get_is_overdue(self, obj):
         return obj.is_overdue
@@ -415,8 +507,8 @@ class TaskSerializer(serializers.ModelSerializer):
 
 
 class InvitationSerializer(serializers.ModelSerializer):
-    sender = UserSerializer(read_only=True)
-    receiver = UserSerializer(read_only=True)
+    sender = UserContactSerializer(read_only=True)
+    receiver = UserContactSerializer(read_only=True)
     is_expired = serializers.BooleanField(read_only=True)
     receiver_id = serializers.PrimaryKeyRelatedField(
         write_only=True,
@@ -463,7 +555,7 @@ class MilestoneTemplateSerializer(serializers.ModelSerializer):
 
 
 class ProjectTemplateSerializer(serializers.ModelSerializer):
-    creator = UserSerializer(read_only=True)
+    creator = UserSummarySerializer(read_only=True)
     milestone_templates = MilestoneTemplateSerializer(many=True, read_only=True)
     
     class Meta:
@@ -508,8 +600,8 @@ class DashboardWidgetSerializer(serializers.ModelSerializer):
 class ProjectSnapshotSerializer(serializers.ModelSerializer):
     class Meta:
         model = ProjectSnapshot
-        fields = ['id', 'project', 'snapshot_date', 'metrics', 'created_at']
-        read_only_fields = ['id', 'created_at']
+        fields = ['id', 'project', 'snapshot_date', 'metrics', 'is_backfilled', 'created_at']
+        read_only_fields = ['id', 'is_backfilled', 'created_at']
 
 
 class LecturerAlertSerializer(serializers.ModelSerializer):
@@ -522,7 +614,7 @@ class LecturerAlertSerializer(serializers.ModelSerializer):
 
 
 class SubmissionChecklistSerializer(serializers.ModelSerializer):
-    override_by = UserSerializer(read_only=True)
+    override_by = UserSummarySerializer(read_only=True)
 
     class Meta:
         model = SubmissionChecklist
@@ -531,7 +623,7 @@ class SubmissionChecklistSerializer(serializers.ModelSerializer):
 
 
 class CalendarEventSerializer(serializers.ModelSerializer):
-    created_by = UserSerializer(read_only=True)
+    created_by = UserSummarySerializer(read_only=True)
 
     class Meta:
         model = CalendarEvent
@@ -0,0 +1,70 @@
+from django.utils.dateparse import parse_datetime
+
+from .jobs import job
+from .metrics import project_file_metrics_map
+from .models import Notification, Project, ProjectFileActivityLog, TaskActivityLog, Team, TeamMembership
+from .notifications import dispatch_project_notifications
+
+
+PROJECT_STORAGE_QUOTA_BYTES = 500 * 1024 * 1024
+STORAGE_WARNING_THRESHOLDS = (0.8, 0.95)
+
+
+def _as_datetime(value):
+    # Payloads read back from the job table hold ISO strings; sync jobs still hold the datetime.
+    return parse_datetime(value) if isinstance(value, str) else value
+
+
+@job('projects.notify')
+def notify(**kwargs):
+    dispatch_project_notifications(**kwargs)
+
+
+@job('projects.log_task_activity')
+def log_task_activity(*, task, actor, action_type, old_value, new_value, reason, occurred_at):
+    TaskActivityLog.objects.create(
+        task_id=task,
+        actor_id=actor,
+        action_type=action_type,
+        old_value=old_value,
+        new_value=new_value,
+        reason=reason,
+        created_at=_as_datetime(occurred_at),
+    )
+
+
+@job('projects.log_file_activity')
+def log_file_activity(*, project, file, actor, action_type, metadata, occurred_at):
+    ProjectFileActivityLog.objects.create(
+        project_id=project,
+        file_id=file,
+        actor_id=actor,
+        action_type=action_type,
+        metadata=metadata,
+        created_at=_as_datetime(occurred_at),
+    )
+
+
+@job('projects.check_storage_quota')
+def check_storage_quota(*, project, before_usage):
+    """Warn the project owner and supervisor when an upload pushed usage past a quota threshold."""
+    after_usage = project_file_metrics_map([project])[project]['storage_used_bytes']
+    crossed = [
+        threshold for threshold in STORAGE_WARNING_THRESHOLDS
+        if before_usage < PROJECT_STORAGE_QUOTA_BYTES * threshold <= after_usage
+    ]
+    if not crossed:
+        return
+
+    project = Project.objects.get(id=project)
+    recipients = list(TeamMembership.objects.filter(team__project=project, role=Team.Role.LEADER).values_list('user_id', flat=True)[:1])
+    if project.supervisor_id:
+        recipients.append(project.supervisor_id)
+    for threshold in crossed:
+        dispatch_project_notifications(
+            recipients=recipients,
+            notification_type=Notification.Type.FILE_QUOTA_WARNING,
+            title='Project storage quota warning',
+            message=f'Project "{project.title}" has reached {int(threshold * 100)}% of its storage quota.',
+            project=project,
+        )
@@ -0,0 +1,65 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .activity import record_project_activity
+from .memberships import invalidate_memberships
+from .metrics import invalidate_project_metrics
+from .models import Project, ProjectFile, ProjectFileActivityLog, Task, TaskActivityLog, TeamMembership
+from .timeline import record_project_event
+
+
+@receiver(post_save, sender=TaskActivityLog)
+def record_task_activity(sender, instance, created, **kwargs):
+    if created:
+        record_project_activity(instance.task.project_id, instance.actor_id, instance.created_at)
+        record_project_event('task', instance)
+
+
+@receiver(post_save, sender=ProjectFileActivityLog)
+def record_file_activity(sender, instance, created, **kwargs):
+    if created:
+        record_project_activity(instance.project_id, instance.actor_id, instance.created_at)
+        record_project_event('file', instance)
+
+
+@receiver(post_save, sender='communication.Message')
+def record_channel_message(sender, instance, created, **kwargs):
+    if created:
+        record_project_activity(instance.channel.project_id, instance.sender_id, instance.created_at)
+        record_project_event('message', instance)
+
+
+@receiver(post_save, sender='communication.Announcement')
+def record_announcement(sender, instance, created, **kwargs):
+    if created:
+        record_project_activity(instance.project_id, instance.author_id, instance.created_at)
+        record_project_event('announcement', instance)
+
+
+@receiver(post_save, sender='communication.MeetingPoll')
+def record_meeting_poll(sender, instance, created, **kwargs):
+    if created:
+        record_project_activity(instance.project_id, None, instance.created_at)
+        record_project_event('meeting_poll', instance)
+
+
+@receiver([post_save, post_delete], sender=Project)
+def invalidate_metrics_for_project(sender, instance, **kwargs):
+    invalidate_project_metrics(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=Task)
+@receiver([post_save, post_delete], sender=ProjectFile)
+def invalidate_metrics_for_project_row(sender, instance, **kwargs):
+    invalidate_project_metrics(instance.project_id)
+
+
+@receiver([post_save, post_delete], sender=TeamMembership)
+def invalidate_metrics_for_membership(sender, instance, **kwargs):
+    invalidate_project_metrics(instance.team.project_id)
+    invalidate_memberships(instance.user_id)
+
+
+@receiver([post_save, post_delete], sender='communication.Message')
+def invalidate_metrics_for_message(sender, instance, **kwargs):
+    invalidate_project_metrics(instance.channel.project_id)
@@ -0,0 +1,102 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, time, timedelta
+
+from django.db import connection
+from django.utils import timezone
+
+from .metrics import project_task_metrics_map
+from .models import Project, ProjectSnapshot, Task
+
+
+SNAPSHOT_CHUNK_SIZE = 500
+
+
+def _snapshot_cutoff(snapshot_date):
+    """Overdue tasks are counted as of the end of the snapshot day (or now, for today)."""
+    end_of_day = timezone.make_aware(datetime.combine(snapshot_date + timedelta(days=1), time.min))
+    return min(end_of_day, timezone.now())
+
+
+def snapshot_metrics(metrics):
+    """Translate project task metrics into the ProjectSnapshot.metrics payload."""
+    task_total = metrics['total_tasks']
+    done = metrics['status_counts'][Task.Status.DONE]
+    return {
+        'task_total': task_total,
+        'done': done,
+        'in_progress': metrics['status_counts'][Task.Status.IN_PROGRESS],
+        'blocked': metrics['blocked_tasks'],
+        'overdue': metrics['overdue_tasks'],
+        'remaining_tasks': metrics['remaining_tasks'],
+        'progress_percentage': int(round((done / task_total) * 100)) if task_total else 0,
+    }
+
+
+def _write_snapshot_chunk(project_ids, snapshot_dates, overwrite_date):
+    created = updated = 0
+    for snapshot_date in snapshot_dates:
+        metrics = project_task_metrics_map(project_ids, now=_snapshot_cutoff(snapshot_date))
+        existing = {
+            snapshot.project_id: snapshot
+            for snapshot in ProjectSnapshot.objects.filter(project_id__in=project_ids, snapshot_date=snapshot_date)
+        }
+        to_create = []
+        to_update = []
+        for project_id in project_ids:
+            payload = snapshot_metrics(metrics[project_id])
+            snapshot = existing.get(project_id)
+            if snapshot is None:
+                to_create.append(ProjectSnapshot(
+                    project_id=project_id,
+                    snapshot_date=snapshot_date,
+                    metrics=payload,
+                    is_backfilled=snapshot_date < overwrite_date,
+                ))
+            elif snapshot_date == overwrite_date and snapshot.metrics != payload:
+                snapshot.metrics = payload
+                to_update.append(snapshot)
+        ProjectSnapshot.objects.bulk_create(to_create, ignore_conflicts=True)
+        ProjectSnapshot.objects.bulk_update(to_update, ['metrics'])
+        created += len(to_create)
+        updated += len(to_update)
+    return created, updated
+
+
+def _write_snapshot_chunk_in_thread(project_ids, snapshot_dates, overwrite_date):
+    try:
+        return _write_snapshot_chunk(project_ids, snapshot_dates, overwrite_date)
+    finally:
+        # Each worker thread opens its own database connection.
+        connection.close()
+
+
+def build_project_snapshots(snapshot_dates, project_ids=None, workers=1, chunk_size=SNAPSHOT_CHUNK_SIZE):
+    """Write ProjectSnapshot rows for every non-archived project and date.
+
+    Each chunk of projects costs one grouped metrics query, one lookup of
+    existing snapshots and the bulk writes per date. Only today's snapshot
+    is refreshed when it already exists; earlier dates are filled in only
+    where missing. Task states are taken as they are now, so snapshots for
+    past days are marked ``is_backfilled`` and kept out of burndown history.
+    Returns (created, updated).
+    """
+    if project_ids is None:
+        project_ids = list(
+            Project.objects.exclude(lifecycle_status=Project.LifecycleStatus.ARCHIVED)
+            .order_by('id')
+            .values_list('id', flat=True)
+        )
+    snapshot_dates = sorted(set(snapshot_dates))
+    chunks = [project_ids[index:index + chunk_size] for index in range(0, len(project_ids), chunk_size)]
+    today = timezone.localdate()
+
+    if workers > 1 and len(chunks) > 1:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(
+                lambda chunk: _write_snapshot_chunk_in_thread(chunk, snapshot_dates, today),
+                chunks,
+            ))
+    else:
+        results = [_write_snapshot_chunk(chunk, snapshot_dates, today) for chunk in chunks]
+
+    return sum(result[0] for result in results), sum(result[1] for result in results)
@@ -1,12 +1,37 @@
+import os
+import tempfile
+import time
 from datetime import date, timedelta
-
+from io import StringIO
+from unittest import mock
+
+from django.core import mail
+from django.core.cache import cache
+from django.core.mail.backends import locmem
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
+from django.utils.http import http_date
 from django.core.files.uploadedfile import SimpleUploadedFile
 from rest_framework import status
 from rest_framework.test import APITestCase
 
-from projects.models import Invitation, Notification, TeamMembership, Project, FileFolder, ProjectFile, ProjectTrash
+from projects.api_views import _log_task_activity
+from projects.invitations import expire_stale_invitations
+from projects.jobs import JOB_MAX_ATTEMPTS, _resubmit_retry, _run_in_thread, enqueue_job, job, retry_delay, run_due_jobs, run_job
+from projects.metrics import (
+	cached_project_metrics, member_last_activity_map, project_latest_activity_map,
+	project_metrics_cache_stats, project_task_metrics, project_task_metrics_map,
+)
+from projects.memberships import membership_cache_middleware, membership_cache_stats, membership_resolver, reset_membership_cache_stats
+from projects.notifications import dispatch_project_notifications
+from projects.outbox import OUTBOX_MAX_ATTEMPTS, drain_outbox, enqueue_emails, outbox_stats
+from projects.models import Invitation, Notification, Team, TeamMembership, Project, FileFolder, ProjectFile, ProjectTrash, Task, TaskActivityLog, ProjectActivityIndex, SubTask, TaskComment, ProjectSnapshot, ProjectEvent, Milestone, CalendarEvent, CalendarFeedToken, TaskNotification, OutboundEmail, BackgroundJob, TaskAttachment
 from users.models import CustomUser
 
 
@@ -470,3 +495,934 @@ class ProjectFilesAPITests(APITestCase):
 		}, format='json')
 		self.assertEqual(promote_resp.status_code, status.HTTP_201_CREATED)
 		self.assertEqual(promote_resp.data.get('linked_task', {}).get('id'), task_resp.data['id'])
+
+
+class ProjectTaskMetricsTests(APITestCase):
+	def setUp(self):
+		self.owner = CustomUser.objects.create_user(
+			username='metricsowner',
+			email='metricsowner@example.com',
+			password='pass12345',
+			role=CustomUser.Role.STUDENT,
+		)
+		self.project = Project.objects.create(title='Metrics', description='Metrics project', deadline=date.today() + timedelta(days=30))
+		self.empty_project = Project.objects.create(title='Empty', description='No tasks', deadline=date.today() + timedelta(days=30))
+
+	def _task(self, status_value, progress=0, days=5, is_cancelled=False):
+		return Task.objects.create(
+			project=self.project,
+			title=f'{status_value} task',
+			created_by=self.owner,
+			status=status_value,
+			progress_percentage=progress,
+			deadline=timezone.now() + timedelta(days=days),
+			is_cancelled=is_cancelled,
+		)
+
+	def test_metrics_match_weighted_progress_rules(self):
+		self._task(Task.Status.DONE)
+		self._task(Task.Status.IN_PROGRESS, progress=50)
+		self._task(Task.Status.UNDER_REVIEW, progress=10)
+		self._task(Task.Status.BLOCKED, days=-1)
+		self._task(Task.Status.CANCELLED, is_cancelled=True)
+
+		metrics = project_task_metrics(self.project)
+		self.assertEqual(metrics['total_tasks'], 4)
+		# (100 + 50 + 75 + 0) / 4 = 56.25
+		self.assertEqual(metrics['progress_percentage'], 56)
+		self.assertEqual(metrics['status_counts']['DONE'], 1)
+		self.assertEqual(metrics['status_counts']['CANCELLED'], 1)
+		self.assertEqual(metrics['overdue_tasks'], 1)
+		self.assertEqual(metrics['blocked_tasks'], 1)
+		self.assertEqual(metrics['remaining_tasks'], 3)
+
+	def test_batch_metrics_use_one_query_and_fill_empty_projects(self):
+		self._task(Task.Status.DONE)
+		with self.assertNumQueries(1):
+			metrics = project_task_metrics_map([self.project.id, self.empty_project.id])
+		self.assertEqual(metrics[self.project.id]['progress_percentage'], 100)
+		self.assertEqual(metrics[self.empty_project.id]['total_tasks'], 0)
+		self.assertEqual(metrics[self.empty_project.id]['progress_percentage'], 0)
+
+
+class LecturerDashboardQueryTests(APITestCase):
+	def setUp(self):
+		self.lecturer = CustomUser.objects.create_user(
+			username='cohortlecturer',
+			email='cohortlecturer@example.com',
+			password='pass12345',
+			role=CustomUser.Role.LECTURER,
+			is_approved=True,
+		)
+		self.client.force_authenticate(user=self.lecturer)
+		self.project_count = 0
+
+	def _add_project(self):
+		self.project_count += 1
+		project = Project.objects.create(
+			title=f'Cohort project {self.project_count}',
+			description='Cohort project',
+			course_code='SE350',
+			deadline=date.today() + timedelta(days=30),
+			supervisor=self.lecturer,
+		)
+		team = Team.objects.create(project=project)
+		for index in range(2):
+			student = CustomUser.objects.create_user(
+				username=f'cohort{self.project_count}_{index}',
+				email=f'cohort{self.project_count}_{index}@example.com',
+				password='pass12345',
+				role=CustomUser.Role.STUDENT,
+			)
+			TeamMembership.objects.create(user=student, team=team, role=Team.Role.MEMBER)
+			Task.objects.create(
+				project=project,
+				title=f'Task {index}',
+				created_by=student,
+				assigned_to=student,
+				deadline=timezone.now() + timedelta(days=5),
+			)
+		return project
+
+	def _dashboard_query_count(self):
+		with CaptureQueriesContext(connection) as queries:
+			response = self.client.get('/api/projects/dashboard/lecturer/')
+		self.assertEqual(response.status_code, status.HTTP_200_OK)
+		return len(queries), response
+
+	def test_query_count_does_not_grow_with_project_count(self):
+		self._add_project()
+		baseline, _ = self._dashboard_query_count()
+
+		for _ in range(4):
+			self._add_project()
+		query_count, response = self._dashboard_query_count()
+
+		self.assertEqual(query_count, baseline)
+		self.assertEqual(len(response.data['comparison_rows']), 5)
+		self.assertEqual(len(response.data['submission_readiness']), 5)
+		self.assertEqual(response.data['comparison_rows'][0]['members_count'], 2)
+
+
+class ProjectActivityIndexTests(APITestCase):
+	def setUp(self):
+		self.member = CustomUser.objects.create_user(
+			username='activemember',
+			email='activemember@example.com',
+			password='pass12345',
+			role=CustomUser.Role.STUDENT,
+		)
+		self.project = Project.objects.create(title='Activity', description='Activity project', deadline=date.today() + timedelta(days=30))
+		self.task = Task.objects.create(
+			project=self.project,
+			title='Indexed task',
+			created_by=self.member,
+			deadline=timezone.now() + timedelta(days=5),
+		)
+
+	def test_activity_log_updates_index_on_write(self):
+		log = TaskActivityLog.objects.create(task=self.task, actor=self.member, action_type=TaskActivityLog.ActionType.CREATED)
+
+		activity = member_last_activity_map([self.project.id])
+		self.assertEqual(activity[(self.project.id, self.member.id)], log.created_at)
+		self.assertGreaterEqual(project_latest_activity_map([self.project])[self.project.id], log.created_at)
+
+		TaskActivityLog.objects.create(task=self.task, actor=None, action_type=TaskActivityLog.ActionType.DETAILS_UPDATED)
+		self.assertEqual(ProjectActivityIndex.objects.filter(project=self.project).count(), 2)
+
+	def test_backfill_command_rebuilds_index(self):
+		log = TaskActivityLog.objects.create(task=self.task, actor=self.member, action_type=TaskActivityLog.ActionType.CREATED)
+		ProjectActivityIndex.objects.all().delete()
+
+		call_command('backfill_activity_index', stdout=StringIO())
+
+		self.assertEqual(member_last_activity_map([self.project.id]), {(self.project.id, self.member.id): log.created_at})
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'metrics-tests'}})
+class ProjectMetricsCacheTests(APITestCase):
+	def setUp(self):
+		cache.clear()
+		self.owner = CustomUser.objects.create_user(
+			username='cacheowner',
+			email='cacheowner@example.com',
+			password='pass12345',
+			role=CustomUser.Role.STUDENT,
+		)
+		self.project = Project.objects.create(title='Cached', description='Cached project', deadline=date.today() + timedelta(days=30))
+
+	def _task(self, status_value):
+		return Task.objects.create(
+			project=self.project,
+			title=f'{status_value} task',
+			created_by=self.owner,
+			status=status_value,
+			deadline=timezone.now() + timedelta(days=5),
+		)
+
+	def test_second_read_is_served_from_cache(self):
+		self._task(Task.Status.DONE)
+		self.assertEqual(cached_project_metrics(self.project)['progress_percentage'], 100)
+
+		with self.assertNumQueries(0):
+			metrics = cached_project_metrics(self.project)
+		self.assertEqual(metrics['total_tasks'], 1)
+		self.assertFalse(metrics['has_final_file'])
+		self.assertEqual(project_metrics_cache_stats(), {'hits': 1, 'misses': 1})
+
+	def test_task_write_invalidates_entry(self):
+		self._task(Task.Status.DONE)
+		self.assertEqual(cached_project_metrics(self.project)['progress_percentage'], 100)
+
+		self._task(Task.Status.TODO)
+		metrics = cached_project_metrics(self.project)
+		self.assertEqual(metrics['total_tasks'], 2)
+		self.assertEqual(metrics['progress_percentage'], 50)
+		self.assertEqual(project_metrics_cache_stats()['misses'], 2)
+
+
+@override_settings(CACHES={
+	'default': {
+		'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+		'LOCATION': os.path.join(tempfile.gettempdir(), 'uniteam-metrics-cache-tests'),
+	}
+})
+class FileBasedProjectMetricsCacheTests(ProjectMetricsCacheTests):
+	pass
+
+
+class TaskListPayloadTests(APITestCase):
+	def setUp(self):
+		self.leader = CustomUser.objects.create_user(
+			username='payloadleader',
+			email='payloadleader@example.com',
+			password='pass12345',
+			role=CustomUser.Role.STUDENT,
+		)
+		self.project = Project.objects.create(title='Payload', description='Payload project', course_code='SE350', deadline=date.today() + timedelta(days=30))
+		team = Team.objects.create(project=self.project)
+		TeamMembership.objects.create(user=self.leader, team=team, role=Team.Role.LEADER)
+		self.task = Task.objects.create(
+			project=self.project,
+			title='Payload task',
+			created_by=self.leader,
+			deadline=timezone.now() + timedelta(days=5),
+		)
+		TaskComment.objects.create(task=self.task, author=self.leader, content='First')
+		TaskComment.objects.create(task=self.task, author=self.leader, content='Second')
+		SubTask.objects.create(task=self.task, description='Done part', is_completed=True)
+		SubTask.objects.create(task=self.task, description='Open part')
+		self.client.force_authenticate(user=self.leader)
+
+	def test_list_is_compact_with_annotated_counters(self):
+		response = self.client.get(f'/api/tasks/?project={self.project.id}')
+		self.assertEqual(response.status_code, status.HTTP_200_OK)
+		task = response.data['results'][0]
+		self.assertEqual(task['project']['id'], self.project.id)
+		self.assertEqual(task['project']['title'], 'Payload')
+		self.assertNotIn('comments', task)
+		self.assertNotIn('activity_logs', task)
+		self.assertEqual(task['comment_count'], 2)
+		self.assertEqual(task['subtask_count'], 2)
+		self.assertEqual(task['completed_subtask_count'], 1)
+
+	def test_expanded_comments_are_prefetched(self):
+		url = f'/api/tasks/?project={self.project.id}&expand=comments'
+		with CaptureQueriesContext(connection) as small:
+			self.client.get(url)
+		for index in range(3):
+			task = Task.objects.create(project=self.project, title=f'Extra {index}', created_by=self.leader, deadline=timezone.now() + timedelta(days=5))
+			TaskComment.objects.create(task=task, author=self.leader, content='Note')
+			TaskAttachment.objects.create(task=task, uploaded_by=self.leader, file_name='notes.txt', file_size=1)
+		with CaptureQueriesContext(connection) as large:
+			response = self.client.get(url)
+		self.assertEqual(len(large.captured_queries), len(small.captured_queries))
+		counts = {task['title']: (task['comment_count'], task['attachment_count'], task['subtask_count']) for task in response.data['results']}
+		self.assertEqual(counts['Payload task'], (2, 0, 2))
+		self.assertEqual(counts['Extra 0'], (1, 1, 0))
+
+	def test_task_board_prefetches_expanded_comments(self):
+		url = f'/api/projects/{self.project.id}/task_board/?expand=comments'
+		with CaptureQueriesContext(connection) as small:
+			self.client.get(url)
+		for index in range(3):
+			task = Task.objects.create(project=self.project, title=f'Board {index}', created_by=self.leader, deadline=timezone.now() + timedelta(days=5))
+			TaskComment.objects.create(task=task, author=self.leader, content='Note')
+		with CaptureQueriesContext(connection) as large:
+			response = self.client.get(url)
+		self.assertEqual(len(large.captured_queries), len(small.captured_queries))
+		comments = {task['title']: len(task['comments']) for task in response.data['tasks']}
+		self.assertEqual(comments['Payload task'], 2)
+		self.assertEqual(comments['Board 0'], 1)
+
+	def test_expand_and_retrieve_include_nested_detail(self):
+		response = self.client.get(f'/api/tasks/?project={self.project.id}&expand=comments,project')
+		task = response.data['results'][0]
+		self.assertEqual(len(task['comments']), 2)
+		self.assertNotIn('subtasks', task)
+		self.assertIn('team_size', task['project'])
+
+		detail = self.client.get(f'/api/tasks/{self.task.id}/')
+		self.assertEqual(detail.status_code, status.HTTP_200_OK)
+		self.assertEqual(len(detail.data['subtasks']), 2)
+		self.assertIn('activity_logs', detail.data)
+		self.assertNotIn('team_size', detail.data['project'])
+
+
+class ProjectListQueryTests(APITestCase):
+	def setUp(self):
+		self.student = CustomUser.objects.create_user(
+			username='listmember',
+			email='listmember@example.com',
+			password='pass12345',
+			role=CustomUser.Role.STUDENT,
+		)
+		self.teammate = CustomUser.objects.create_user(
+			username='listteammate',
+			email='listteammate@example.com',
+			password='pass12345',
+			role=CustomUser.Role.STUDENT,
+		)
+		self.client.force_authenticate(user=self.student)
+		self.project_count = 0
+
+	def _add_project(self):
+		self.project_count += 1
+		project = Project.objects.create(
+			title=f'Listed project {self.project_count}',
+			description='Listed project',
+			deadline=date.today() + timedelta(days=30),
+		)
+		team = Team.objects.create(project=project)
+		TeamMembership.objects.create(user=self.student, team=team, role=Team.Role.LEADER)
+		TeamMembership.objects.create(user=self.teammate, team=team, role=Team.Role.MEMBER)
+		Task.objects.create(
+			project=project,
+			title='Listed task',
+			created_by=self.student,
+			status=Task.Status.DONE,
+			deadline=timezone.now() + timedelta(days=5),
+		)
+		return project
+
+	def _list_projects(self):
+		with CaptureQueriesContext(connection) as queries:
+			response = self.client.get('/api/projects/')
+		self.assertEqual(response.status_code, status.HTTP_200_OK)
+		return len(queries), response.data['results']
+
+	def test_project_list_query_count_is_constant(self):
+		self._add_project()
+		baseline, _ = self._list_projects()
+
+		for _ in range(3):
+			self._add_project()
+		query_count, results = self._list_projects()
+
+		self.assertEqual(query_count, baseline)
+		self.assertEqual(len(results), 4)
+		for row in results:
+			self.assertEqual(row['team_size'], 2)
+			self.assertEqual(row['current_membership']['role'], Team.Role.LEADER)
+			self.assertEqual(row['task_count'], 1)
+			self.assertEqual(row['task_progress_percentage'], 100)
+
+
+class Phase6MaintenanceCommandTests(APITestCase):
+	def setUp(self):
+		self.owner = CustomUser.objects.create_user(
+			username='snapshotowner',
+			email='snapshotowner@example.com',
+			password='pass12345',
+			role=CustomUser.Role.STUDENT,
+		)
+		self.project = Project.objects.create(title='Snapshot', description='Snapshot project', deadline=date.today() + timedelta(days=30))
+		self.expired = Project.objects.create(title='Expired', description='Long past deadline', deadline=date.today() - timedelta(days=40))
+		for status_value in [Task.Status.DONE, Task.Status.IN_PROGRESS, Task.Status.BLOCKED, Task.Status.TODO]:
+			Task.objects.create(
+				project=self.project,
+				title=f'{status_value} task',
+				created_by=self.owner,
+				status=status_value,
+				deadline=timezone.now() + timedelta(days=5),
+			)
+
+	def _run(self, *args):
+		call_command('phase6_maintenance', *args, stdout=StringIO())
+
+	def test_builds_snapshot_metrics_and_archives_expired_projects(self):
+		self._run()
+
+		snapshot = ProjectSnapshot.objects.get(project=self.project, snapshot_date=timezone.localdate())
+		self.assertEqual(snapshot.metrics, {
+			'task_total': 4,
+			'done': 1,
+			'in_progress': 1,
+			'blocked': 1,
+			'overdue': 0,
+			'remaining_tasks': 3,
+			'progress_percentage': 25,
+		})
+		self.expired.refresh_from_db()
+		self.assertEqual(self.expired.lifecycle_status, Project.LifecycleStatus.ARCHIVED)
+
+		Task.objects.filter(project=self.project, status=Task.Status.TODO).update(status=Task.Status.DONE)
+		self._run()
+		snapshot.refresh_from_db()
+		self.assertEqual(snapshot.metrics['done'], 2)
+
+	def test_since_backfills_only_missing_days(self):
+		today = timezone.localdate()
+		ProjectSnapshot.objects.create(project=self.project, snapshot_date=today - timedelta(days=1), metrics={'remaining_tasks': 9})
+
+		self._run('--since', str(today - timedelta(days=2)), '--workers', '2')
+
+		dates = set(ProjectSnapshot.objects.filter(project=self.project).values_list('snapshot_date', flat=True))
+		self.assertEqual(dates, {today - timedelta(days=offset) for offset in range(3)})
+		kept = ProjectSnapshot.objects.get(project=self.project, snapshot_date=today - timedelta(days=1))
+		self.assertEqual(kept.metrics, {'remaining_tasks': 9})
+		self.assertFalse(kept.is_backfilled)
+		self.assertTrue(ProjectSnapshot.objects.get(project=self.project, snapshot_date=today - timedelta(days=2)).is_backfilled)
+		self.assertFalse(ProjectSnapshot.objects.get(project=self.project, snapshot_date=today).is_backfilled)
+
+	def test_rejects_future_date(self):
+		with self.assertRaises(CommandError):
+			self._run('--date', str(timezone.localdate() + timedelta(days=1)))
+		self.assertFalse(ProjectSnapshot.objects.exists())
+
+
+class ActivityTimelineCursorTests(APITestCase):
+	def setUp(self):
+		self.leader = CustomUser.objects.create_user(
+			username='timelineleader',
+			email='timelineleader@example.com',
+			password='pass12345',
+			role=CustomUser.Role.STUDENT,
+		)
+		self.project = Project.objects.create(title='Timeline', description='Timeline project', deadline=date.today() + timedelta(days=30))
+		team = Team.objects.create(project=self.project)
+		TeamMembership.objects.create(user=self.leader, team=team, role=Team.Role.LEADER)
+		self.task = Task.objects.create(
+			project=self.project,
+			title='Timeline task',
+			created_by=self.leader,
+			deadline=timezone.now() + timedelta(days=5),
+		)
+		for _ in range(5):
+			TaskActivityLog.objects.create(task=self.task, actor=self.leader, action_type=TaskActivityLog.ActionType.DETAILS_UPDATED)
+		# Identical timestamps exercise the (timestamp, source, id) tie-break.
+		ProjectEvent.objects.filter(project=self.project).update(created_at=timezone.now() - timedelta(days=400))
+		self.client.force_authenticate(user=self.leader)
+
+	def test_cursor_pages_through_history_without_gaps(self):
+		seen = []
+		cursor = None
+		for _ in range(5):
+			params = {'limit': 2}
+			if cursor:
+				params['cursor'] = cursor
+			response = self.client.get(f'/api/projects/{self.project.id}/activity_timeline/', params)
+			self.assertEqual(response.status_code, status.HTTP_200_OK)
+			seen.extend(entry['source_id'] for entry in response.data['results'])
+			cursor = response.data['next_cursor']
+			if not cursor:
+				break
+
+		expected = list(TaskActivityLog.objects.filter(task__project=self.project).order_by('-id').values_list('id', flat=True))
+		self.assertEqual(seen, expected)
+
+	def test_backfill_recreates_missing_events(self):
+		ProjectEvent.objects.all().delete()
+		call_command('backfill_project_events', stdout=StringIO())
+		call_command('backfill_project_events', stdout=StringIO())
+
+		events = ProjectEvent.objects.filter(project=self.project)
+		self.assertEqual(events.count(), 5)
+		self.assertEqual({event.payload['task_id'] for event in events}, {self.task.id})
+
+	def test_invalid_cursor_is_rejected(self):
+		response = self.client.get(f'/api/projects/{self.project.id}/activity_timeline/', {'cursor': 'not-a-cursor'})
+		self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class CalendarFeedTests(APITestCase):
+	def setUp(self):
+		self.student = CustomUser.objects.create_user(
+			username='calendarstudent',
+			email='calendarstudent@example.com',
+			password='pass12345',
+			role=CustomUser.Role.STUDENT,
+		)
+		self.today = timezone.localdate()
+		self.client.force_authenticate(user=self.student)
+
+	def _add_project(self, index):
+		project = Project.objects.create(title=f'Calendar {index}', description='Calendar project', deadline=self.today + timedelta(days=60))
+		team = Team.objects.create(project=project)
+		TeamMembership.objects.create(user=self.student, team=team, role=Team.Role.LEADER)
+		for offset in (2, 40):
+			Task.objects.create(
+				project=project,
+				title=f'Task {index}-{offset}',
+				created_by=self.student,
+				deadline=timezone.now() + timedelta(days=offset),
+			)
+		Milestone.objects.create(project=project, title=f'Milestone {index}', due_date=self.today + timedelta(days=3))
+		CalendarEvent.objects.create(
+			project=project,
+			created_by=self.student,
+			title=f'Standup {index}',
+			event_type=CalendarEvent.EventType.CUSTOM,
+			start_datetime=timezone.now() + timedelta(days=1),
+			end_datetime=timezone.now() + timedelta(days=1, hours=1),
+		)
+		return project
+
+	def _feed(self, params=None):
+		with CaptureQueriesContext(connection) as queries:
+			response = self.client.get('/api/calendar-events/', params or {})
+		self.assertEqual(response.status_code, status.HTTP_200_OK)
+		return response.data, len(queries.captured_queries)
+
+	def test_query_count_does_not_grow_with_projects(self):
+		self._add_project(1)
+		events, baseline = self._feed()
+		self.assertEqual(len(events), 5)
+		for index in range(2, 6):
+			self._add_project(index)
+		events, queries = self._feed()
+		self.assertEqual(len(events), 25)
+		self.assertEqual(queries, baseline)
+		starts = [event['start_datetime'] for event in events]
+		self.assertEqual(starts, sorted(starts))
+
+	def test_window_limits_every_source(self):
+		project = self._add_project(1)
+		start = self.today.isoformat()
+		end = (self.today + timedelta(days=7)).isoformat()
+		events, _ = self._feed({'start': start, 'end': end})
+
+		self.assertEqual(
+			sorted(event['event_type'] for event in events),
+			sorted([CalendarEvent.EventType.CUSTOM, CalendarEvent.EventType.TASK_DEADLINE, CalendarEvent.EventType.MILESTONE]),
+		)
+		self.assertTrue(all(event['project'] == project.id for event in events))
+
+	def test_invalid_window_is_rejected(self):
+		response = self.client.get('/api/calendar-events/', {'start': 'soon'})
+		self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class CalendarIcsFeedTests(APITestCase):
+	def setUp(self):
+		self.student = CustomUser.objects.create_user(
+			username='icsstudent',
+			email='icsstudent@example.com',
+			password='pass12345',
+			role=CustomUser.Role.STUDENT,
+		)
+		self.project = Project.objects.create(title='Ics', description='Ics project', deadline=date.today() + timedelta(days=30))
+		team = Team.objects.create(project=self.project)
+		TeamMembership.objects.create(user=self.student, team=team, role=Team.Role.LEADER)
+		self.task = Task.objects.create(
+			project=self.project,
+			title='Write report, part 1',
+			created_by=self.student,
+			deadline=timezone.now() + timedelta(days=5),
+		)
+		Milestone.objects.create(project=self.project, title='Prototype', due_date=date.today() + timedelta(days=10))
+		self.client.force_authenticate(user=self.student)
+		self.feed_url = self.client.get('/api/calendar-events/feed-token/').data['url']
+		self.client.force_authenticate(user=None)
+
+	def _get(self, **headers):
+		response = self.client.get(self.feed_url, **headers)
+		body = b''.join(response.streaming_content).decode() if response.status_code == status.HTTP_200_OK else ''
+		return response, body
+
+	def test_feed_lists_derived_events_without_jwt(self):
+		response, body = self._get()
+		self.assertEqual(response.status_code, status.HTTP_200_OK)
+		self.assertTrue(response['Content-Type'].startswith('text/calendar'))
+		self.assertIn(f'UID:task-{self.task.id}@', body)
+		self.assertIn('SUMMARY:Task deadline: Write report\\, part 1', body)
+		self.assertIn('SUMMARY:Milestone: Prototype', body)
+		self.assertIn('SUMMARY:Project submission deadline: Ics', body)
+		self.assertEqual(body.count('BEGIN:VEVENT'), 3)
+
+	def test_conditional_get_returns_304_until_rows_change(self):
+		first, _ = self._get()
+		etag = first['ETag']
+
+		repeat, _ = self._get(HTTP_IF_NONE_MATCH=etag)
+		self.assertEqual(repeat.status_code, status.HTTP_304_NOT_MODIFIED)
+		self.assertNotIn('Last-Modified', first)
+
+		self.task.title = 'Write final report'
+		self.task.save()
+		changed, body = self._get(HTTP_IF_NONE_MATCH=etag)
+		self.assertEqual(changed.status_code, status.HTTP_200_OK)
+		self.assertNotEqual(changed['ETag'], etag)
+		self.assertIn('Write final report', body)
+
+		self.task.delete()
+		deleted, _ = self._get(HTTP_IF_NONE_MATCH=changed['ETag'])
+		self.assertEqual(deleted.status_code, status.HTTP_200_OK)
+		# Date-only validation must not hide the removal.
+		date_only, _ = self._get(HTTP_IF_MODIFIED_SINCE=http_date(time.time() + 60))
+		self.assertEqual(date_only.status_code, status.HTTP_200_OK)
+
+	def test_json_list_supports_conditional_get(self):
+		self.client.force_authenticate(user=self.student)
+		first = self.client.get('/api/calendar-events/')
+		self.assertEqual(first.status_code, status.HTTP_200_OK)
+		repeat = self.client.get('/api/calendar-events/', HTTP_IF_NONE_MATCH=first['ETag'])
+		self.assertEqual(repeat.status_code, status.HTTP_304_NOT_MODIFIED)
+		windowed = self.client.get('/api/calendar-events/', {'end': date.today().isoformat()}, HTTP_IF_NONE_MATCH=first['ETag'])
+		self.assertEqual(windowed.status_code, status.HTTP_200_OK)
+
+	def test_rotating_token_revokes_old_url(self):
+		self.client.force_authenticate(user=self.student)
+		rotated = self.client.post('/api/calendar-events/feed-token/')
+		self.client.force_authenticate(user=None)
+		self.assertNotEqual(rotated.data['url'], self.feed_url)
+		self.assertEqual(self.client.get(self.feed_url).status_code, status.HTTP_404_NOT_FOUND)
+		self.assertEqual(CalendarFeedToken.objects.filter(user=self.student).count(), 1)
+
+
+class NotificationDispatchTests(APITestCase):
+	def setUp(self):
+		self.owner = CustomUser.objects.create_user(
+			username='dispatchowner',
+			email='dispatchowner@example.com',
+			password='pass12345',
+			role=CustomUser.Role.STUDENT,
+		)
+		self.project = Project.objects.create(title='Dispatch', description='Dispatch project', deadline=date.today() + timedelta(days=30))
+		self.task = Task.objects.create(
+			project=self.project,
+			title='Dispatch task',
+			created_by=self.owner,
+			deadline=timezone.now() + timedelta(days=5),
+		)
+
+	def _members(self, count):
+		start = CustomUser.objects.filter(username__startswith='dispatch_').count()
+		return [
+			CustomUser.objects.create_user(
+				username=f'dispatch_{index}',
+				email=f'dispatch_{index}@example.com',
+				password='pass12345',
+				role=CustomUser.Role.STUDENT,
+			)
+			for index in range(start, start + count)
+		]
+
+	def _dispatch_queries(self, recipients):
+		with CaptureQueriesContext(connection) as queries:
+			dispatch_project_notifications(
+				recipients=recipients,
+				notification_type=Notification.Type.TASK_ASSIGNED,
+				title='Assigned',
+				message='You have a task',
+				project=self.project,
+				task=self.task,
+			)
+		return len(queries.captured_queries)
+
+	def test_query_count_is_constant_for_ids_and_users(self):
+		baseline = self._dispatch_queries([member.id for member in self._members(2)])
+		members = self._members(12)
+		self.assertEqual(self._dispatch_queries([member.id for member in members] + [None, members[0]]), baseline)
+		self.assertEqual(Notification.objects.filter(recipient__in=members).count(), 12)
+		self.assertEqual(TaskNotification.objects.filter(recipient__in=members, task=self.task).count(), 12)
+
+	def test_unknown_ids_are_skipped(self):
+		self._dispatch_queries([self.owner.id, 987654])
+		self.assertEqual(Notification.objects.count(), 1)
+
+
+class UserSummaryEmbeddingTests(APITestCase):
+	def setUp(self):
+		self.leader = CustomUser.objects.create_user(username='summaryleader', email='summaryleader@example.com', password='pass12345', role=CustomUser.Role.STUDENT)
+		self.project = Project.objects.create(title='Summary Project', description='Embedded users', deadline=date.today() + timedelta(days=20))
+		self.team = Team.objects.create(project=self.project)
+		TeamMembership.objects.create(user=self.leader, team=self.team, role=Team.Role.LEADER)
+		self.client.force_authenticate(user=self.leader)
+
+	def _add_members(self, count, offset):
+		for index in range(offset, offset + count):
+			user = CustomUser.objects.create_user(
+				username=f'summarymember{index}',
+				email=f'summarymember{index}@example.com',
+				password='pass12345',
+				role=CustomUser.Role.STUDENT,
+			)
+			user.studentprofile.skills.add('django', f'skill-{index}')
+			TeamMembership.objects.create(user=user, team=self.team, role=Team.Role.MEMBER)
+
+	def test_project_members_are_compact_and_tag_free(self):
+		self._add_members(2, 0)
+		with CaptureQueriesContext(connection) as small:
+			self.client.get(f'/api/projects/{self.project.id}/')
+
+		self._add_members(8, 2)
+		with CaptureQueriesContext(connection) as large:
+			response = self.client.get(f'/api/projects/{self.project.id}/')
+		self.assertEqual(response.status_code, status.HTTP_200_OK)
+		self.assertEqual(len(large.captured_queries), len(small.captured_queries))
+		self.assertFalse(any('taggit' in query['sql'] for query in large.captured_queries))
+
+		member = response.data['team']['members'][0]['user']
+		self.assertEqual(set(member), {'id', 'username', 'first_name', 'last_name', 'full_name', 'avatar', 'role', 'email'})
+
+
+class MembershipResolverTests(APITestCase):
+	def setUp(self):
+		self.user = CustomUser.objects.create_user(username='resolver', email='resolver@example.com', password='pass12345', role=CustomUser.Role.STUDENT)
+		self.project = Project.objects.create(title='Resolver', description='Membership cache', deadline=date.today() + timedelta(days=20))
+		self.other_project = Project.objects.create(title='Other', description='Joined mid-request', deadline=date.today() + timedelta(days=20))
+		TeamMembership.objects.create(user=self.user, team=Team.objects.create(project=self.project), role=Team.Role.CO_LEADER)
+		self.other_team = Team.objects.create(project=self.other_project)
+		reset_membership_cache_stats()
+
+	def test_checks_within_a_request_share_one_query(self):
+		seen = {}
+
+		def probe(request):
+			with CaptureQueriesContext(connection) as queries:
+				seen['leadership'] = membership_resolver(self.user).is_leadership(self.project)
+				seen['member'] = membership_resolver(self.user.id).is_member(self.project.id)
+				seen['other'] = membership_resolver(self.user).is_member(self.other_project)
+			seen['queries'] = len(queries.captured_queries)
+			TeamMembership.objects.create(user=self.user, team=self.other_team, role=Team.Role.MEMBER)
+			seen['joined'] = membership_resolver(self.user).is_member(self.other_project)
+			return HttpResponse()
+
+		membership_cache_middleware(probe)(RequestFactory().get('/membership-probe/'))
+
+		self.assertEqual(seen, {'leadership': True, 'member': True, 'other': False, 'queries': 1, 'joined': True})
+		self.assertEqual(membership_cache_stats()['/membership-probe/'], {'requests': 1, 'checks': 4, 'queries': 2, 'saved': 2})
+
+	def test_outside_requests_every_resolver_is_fresh(self):
+		self.assertIsNot(membership_resolver(self.user), membership_resolver(self.user))
+		self.assertFalse(membership_resolver(self.user).is_member(self.other_project))
+
+
+class FailingEmailBackend(BaseEmailBackend):
+	def send_messages(self, email_messages):
+		raise ConnectionRefusedError('SMTP server unavailable')
+
+
+class PartiallyFailingEmailBackend(locmem.EmailBackend):
+	"""Like SMTP: delivers the messages ahead of a rejected recipient, then raises."""
+
+	def send_messages(self, email_messages):
+		for message in email_messages:
+			if message.to[0].startswith('reject'):
+				raise ConnectionRefusedError('Recipient refused')
+			super().send_messages([message])
+		return len(email_messages)
+
+
+class WorkerKilled(BaseException):
+	pass
+
+
+class DyingEmailBackend(locmem.EmailBackend):
+	"""Delivers messages until it reaches a "crash" recipient, then dies like a killed worker."""
+
+	def send_messages(self, email_messages):
+		for message in email_messages:
+			if message.to[0].startswith('crash'):
+				raise WorkerKilled()
+			super().send_messages([message])
+		return len(email_messages)
+
+
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend')
+class OutboundEmailQueueTests(APITestCase):
+	def setUp(self):
+		cache.clear()
+
+	def test_handlers_enqueue_and_worker_sends_in_batches(self):
+		queued = enqueue_emails('Weekly update', 'All on track', [f'outbox{index}@example.com' for index in range(5)] + ['outbox0@example.com', ''])
+		self.assertEqual(queued, 5)
+		self.assertEqual(len(mail.outbox), 0)
+
+		run = drain_outbox(batch_size=2)
+		self.assertEqual((run['sent'], run['batches']), (5, 3))
+		self.assertEqual(len(mail.outbox), 5)
+		self.assertEqual([message.to for message in mail.outbox][:2], [['outbox0@example.com'], ['outbox1@example.com']])
+		self.assertFalse(OutboundEmail.objects.exclude(status=OutboundEmail.Status.SENT).exists())
+		self.assertEqual(outbox_stats(), {'sent': 5, 'retrying': 0, 'failed': 0, 'batches': 3, 'pending': 0})
+
+	def test_failed_batches_back_off_then_give_up(self):
+		enqueue_emails('Reminder', 'Meeting soon', ['retry@example.com'])
+		with override_settings(EMAIL_BACKEND='projects.tests.FailingEmailBackend'):
+			run = drain_outbox()
+		self.assertEqual((run['sent'], run['retrying'], run['failed']), (0, 1, 0))
+		email = OutboundEmail.objects.get()
+		self.assertEqual((email.status, email.attempts), (OutboundEmail.Status.PENDING, 1))
+		self.assertIn('ConnectionRefusedError', email.last_error)
+		self.assertGreater(email.next_attempt_at, timezone.now())
+		self.assertEqual(drain_outbox()['batches'], 0)
+
+		OutboundEmail.objects.update(attempts=OUTBOX_MAX_ATTEMPTS - 1, next_attempt_at=timezone.now())
+		with override_settings(EMAIL_BACKEND='projects.tests.FailingEmailBackend'):
+			self.assertEqual(drain_outbox()['failed'], 1)
+		self.assertEqual(OutboundEmail.objects.get().status, OutboundEmail.Status.FAILED)
+
+	def test_partial_batch_failure_does_not_resend_delivered_emails(self):
+		enqueue_emails('Notice', 'Body', ['first@example.com', 'reject@example.com', 'last@example.com'])
+		with override_settings(EMAIL_BACKEND='projects.tests.PartiallyFailingEmailBackend'):
+			run = drain_outbox()
+		self.assertEqual((run['sent'], run['retrying']), (2, 1))
+		self.assertEqual(sorted(message.to[0] for message in mail.outbox), ['first@example.com', 'last@example.com'])
+		self.assertEqual(OutboundEmail.objects.get(status=OutboundEmail.Status.PENDING).to_email, 'reject@example.com')
+
+		OutboundEmail.objects.update(next_attempt_at=timezone.now())
+		drain_outbox()
+		self.assertEqual(len(mail.outbox), 3)
+		self.assertEqual(OutboundEmail.objects.filter(status=OutboundEmail.Status.SENT).count(), 3)
+
+	def test_worker_killed_mid_batch_keeps_delivered_emails_sent(self):
+		enqueue_emails('Notice', 'Body', ['first@example.com', 'crash@example.com', 'last@example.com'])
+		with override_settings(EMAIL_BACKEND='projects.tests.DyingEmailBackend'):
+			with self.assertRaises(WorkerKilled):
+				drain_outbox()
+		self.assertEqual(OutboundEmail.objects.get(to_email='first@example.com').status, OutboundEmail.Status.SENT)
+		self.assertEqual(OutboundEmail.objects.filter(status=OutboundEmail.Status.SENDING).count(), 2)
+		# Claimed rows stay out of other workers' reach until the claim runs out.
+		self.assertEqual(drain_outbox()['batches'], 0)
+
+		OutboundEmail.objects.filter(status=OutboundEmail.Status.SENDING).update(next_attempt_at=timezone.now())
+		self.assertEqual(drain_outbox()['sent'], 2)
+		self.assertEqual(sorted(message.to[0] for message in mail.outbox), ['crash@example.com', 'first@example.com', 'last@example.com'])
+
+	def test_worker_command_reports_throughput(self):
+		enqueue_emails('Digest', 'Body', ['command@example.com'])
+		output = StringIO()
+		call_command('send_queued_emails', stdout=output)
+		self.assertIn('Sent 1 email(s) in 1 batch(es)', output.getvalue())
+		self.assertEqual(len(mail.outbox), 1)
+
+
+
+class InvitationExpiryTests(APITestCase):
+	def setUp(self):
+		self.sender = CustomUser.objects.create_user(username='expirysender', email='expirysender@example.com', password='pass12345', role=CustomUser.Role.STUDENT)
+		self.project = Project.objects.create(title='Expiry', description='Expiry project', deadline=date.today() + timedelta(days=30))
+		for index in range(5):
+			receiver = CustomUser.objects.create_user(username=f'expiryreceiver{index}', email=f'expiryreceiver{index}@example.com', password='pass12345', role=CustomUser.Role.STUDENT)
+			Invitation.objects.create(project=self.project, sender=self.sender, receiver=receiver, expires_at=timezone.now() - timedelta(minutes=1))
+		self.fresh = Invitation.objects.create(project=self.project, sender=self.sender, receiver=CustomUser.objects.create_user(username='expiryfresh', email='expiryfresh@example.com', password='pass12345'))
+
+	def test_expires_in_chunks_with_bulk_notifications(self):
+		with CaptureQueriesContext(connection) as queries:
+			self.assertEqual(expire_stale_invitations(chunk_size=2), 5)
+		statements = [query['sql'].split()[0] for query in queries.captured_queries if 'projects_invitation' in query['sql'] or 'projects_notification' in query['sql']]
+		# One select, one update and one insert per chunk of two, plus the final empty select.
+		self.assertEqual((statements.count('SELECT'), statements.count('UPDATE'), statements.count('INSERT')), (4, 3, 3))
+		self.assertEqual(Invitation.objects.filter(status=Invitation.Status.EXPIRED).count(), 5)
+		self.fresh.refresh_from_db()
+		self.assertEqual(self.fresh.status, Invitation.Status.PENDING)
+		self.assertEqual(Notification.objects.filter(type=Notification.Type.INVITATION_EXPIRED, recipient=self.sender).count(), 5)
+		self.assertEqual(Notification.objects.filter(type=Notification.Type.INVITATION_EXPIRED).count(), 10)
+
+	def test_command_dry_run_changes_nothing(self):
+		output = StringIO()
+		call_command('expire_invitations', '--dry-run', stdout=output)
+		self.assertIn('Invitations that would expire: 5', output.getvalue())
+		self.assertFalse(Invitation.objects.filter(status=Invitation.Status.EXPIRED).exists())
+
+		output = StringIO()
+		call_command('expire_invitations', '--chunk-size', '3', stdout=output)
+		self.assertIn('Expired invitations: 5', output.getvalue())
+		self.assertFalse(Notification.objects.filter(type=Notification.Type.INVITATION_EXPIRED).exclude(invitation__status=Invitation.Status.EXPIRED).exists())
+
+
+_job_calls = []
+
+
+@job('tests.record')
+def _record_job(*, value, fail=False):
+	if fail:
+		raise RuntimeError('handler failed')
+	_job_calls.append(value)
+
+
+class BackgroundJobTests(APITestCase):
+	def setUp(self):
+		_job_calls.clear()
+		self.member = CustomUser.objects.create_user(username='jobsmember', email='jobsmember@example.com', password='pass12345', role=CustomUser.Role.STUDENT)
+		project = Project.objects.create(title='Jobs', description='Jobs project', deadline=date.today() + timedelta(days=30))
+		self.task = Task.objects.create(project=project, title='Queued task', created_by=self.member, deadline=timezone.now() + timedelta(days=5))
+
+	def test_sync_mode_runs_job_immediately(self):
+		background_job = enqueue_job('tests.record', {'value': 1})
+		background_job.refresh_from_db()
+		self.assertEqual(background_job.status, BackgroundJob.Status.DONE)
+		self.assertEqual(_job_calls, [1])
+
+	def test_idempotency_key_enqueues_once(self):
+		enqueue_job('tests.record', {'value': 1}, idempotency_key='record:1')
+		enqueue_job('tests.record', {'value': 1}, idempotency_key='record:1')
+		self.assertEqual(BackgroundJob.objects.filter(idempotency_key='record:1').count(), 1)
+		self.assertEqual(_job_calls, [1])
+
+	@override_settings(BACKGROUND_JOBS_MODE='worker')
+	def test_worker_mode_defers_side_effects_to_worker(self):
+		_log_task_activity(self.task, actor=self.member, action_type=TaskActivityLog.ActionType.CREATED, new_value=self.task.status)
+		self.assertFalse(TaskActivityLog.objects.filter(task=self.task).exists())
+		self.assertEqual(BackgroundJob.objects.get().status, BackgroundJob.Status.PENDING)
+
+		output, errors = StringIO(), StringIO()
+		call_command('run_worker', '--once', '--threads', '1', stdout=output, stderr=errors)
+		self.assertIn('Ran 1 job(s)', output.getvalue())
+		self.assertIn('REALTIME_REDIS_URL is not set', errors.getvalue())
+		log = TaskActivityLog.objects.get(task=self.task)
+		self.assertEqual(log.actor, self.member)
+		# Stamped when the action happened, not when the worker got to it.
+		self.assertLessEqual(log.created_at, BackgroundJob.objects.get().created_at)
+		self.assertFalse(BackgroundJob.objects.exclude(status=BackgroundJob.Status.DONE).exists())
+
+	@override_settings(BACKGROUND_JOBS_MODE='thread')
+	def test_thread_mode_submits_job_to_pool_after_commit(self):
+		executor = mock.Mock()
+		with mock.patch('projects.jobs.get_executor', return_value=executor):
+			with self.captureOnCommitCallbacks(execute=True) as callbacks:
+				background_job = enqueue_job('tests.record', {'value': 3})
+				executor.submit.assert_not_called()
+		self.assertEqual(len(callbacks), 1)
+		executor.submit.assert_called_once_with(_run_in_thread, background_job.id, True)
+		self.assertEqual(BackgroundJob.objects.get().status, BackgroundJob.Status.PENDING)
+		self.assertEqual(_job_calls, [])
+
+	@override_settings(BACKGROUND_JOBS_MODE='thread')
+	def test_thread_mode_resubmits_failed_job_after_backoff(self):
+		with self.captureOnCommitCallbacks():
+			background_job = enqueue_job('tests.record', {'value': 4, 'fail': True})
+		run_job(background_job)
+		with mock.patch('projects.jobs.threading.Timer') as timer:
+			_resubmit_retry(background_job.id)
+		delay = timer.call_args.args[0]
+		self.assertGreater(delay, 0)
+		self.assertLessEqual(delay, retry_delay(1).total_seconds())
+		timer.return_value.start.assert_called_once_with()
+
+	@override_settings(BACKGROUND_JOBS_MODE='worker')
+	def test_failed_jobs_back_off_then_give_up(self):
+		background_job = enqueue_job('tests.record', {'value': 2, 'fail': True})
+		self.assertEqual(run_due_jobs(), 1)
+		background_job.refresh_from_db()
+		self.assertEqual((background_job.status, background_job.attempts), (BackgroundJob.Status.PENDING, 1))
+		self.assertIn('handler failed', background_job.last_error)
+		self.assertGreater(background_job.run_after, timezone.now())
+		self.assertEqual(run_due_jobs(), 0)
+
+		BackgroundJob.objects.filter(id=background_job.id).update(attempts=JOB_MAX_ATTEMPTS - 1, run_after=timezone.now())
+		run_due_jobs()
+		background_job.refresh_from_db()
+		self.assertEqual(background_job.status, BackgroundJob.Status.FAILED)
+		self.assertEqual(_job_calls, [])
@@ -0,0 +1,178 @@
+import base64
+import json
+from datetime import datetime, time, timedelta
+
+from django.apps import apps
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import ProjectEvent, ProjectFileActivityLog, TaskActivityLog
+
+
+TIMELINE_PAGE_SIZE = 50
+MAX_TIMELINE_PAGE_SIZE = 200
+BACKFILL_BATCH_SIZE = 1000
+
+ACTIVITY_TYPE_CATEGORIES = {
+    'TASKS': [ProjectEvent.Category.TASK],
+    'FILES': [ProjectEvent.Category.FILE],
+    'COMMUNICATION': [ProjectEvent.Category.COMMUNICATION],
+}
+ACTIVITY_TYPE_CATEGORIES['ALL'] = [category for categories in ACTIVITY_TYPE_CATEGORIES.values() for category in categories]
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(event):
+    payload = json.dumps([event.created_at.isoformat(), event.id])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        timestamp, event_id = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        return datetime.fromisoformat(timestamp), int(event_id)
+    except (ValueError, TypeError, UnicodeDecodeError):
+        raise InvalidCursor('Invalid timeline cursor')
+
+
+def _display_name(user):
+    if not user:
+        return 'System'
+    return user.get_full_name() or user.username
+
+
+def _task_event(log):
+    return {
+        'project_id': log.task.project_id,
+        'actor_id': log.actor_id,
+        'category': ProjectEvent.Category.TASK,
+        'label': f"{_display_name(log.actor)} {log.get_action_type_display().lower()} task \"{log.task.title}\"",
+        'payload': {'task_id': log.task_id},
+    }
+
+
+def _file_event(log):
+    return {
+        'project_id': log.project_id,
+        'actor_id': log.actor_id,
+        'category': ProjectEvent.Category.FILE,
+        'label': f"{_display_name(log.actor)} {log.get_action_type_display().lower()} \"{log.file.display_name}\"",
+        'payload': {'file_id': log.file_id},
+    }
+
+
+def _announcement_event(announcement):
+    return {
+        'project_id': announcement.project_id,
+        'actor_id': announcement.author_id,
+        'category': ProjectEvent.Category.COMMUNICATION,
+        'label': f"{_display_name(announcement.author)} posted an announcement",
+        'payload': {'announcement_id': announcement.id},
+    }
+
+
+def _message_event(message):
+    return {
+        'project_id': message.channel.project_id,
+        'actor_id': message.sender_id,
+        'category': ProjectEvent.Category.COMMUNICATION,
+        'label': f"{_display_name(message.sender)} sent a channel message",
+        'payload': {'message_id': message.id},
+    }
+
+
+def _meeting_poll_event(poll):
+    return {
+        'project_id': poll.project_id,
+        'actor_id': poll.created_by_id,
+        'category': ProjectEvent.Category.COMMUNICATION,
+        'label': f"{_display_name(poll.created_by)} created meeting poll \"{poll.title}\"",
+        'payload': {'meeting_poll_id': poll.id},
+    }
+
+
+def event_sources():
+    """source name -> (queryset of source rows, builder of ProjectEvent fields)."""
+    Announcement = apps.get_model('communication', 'Announcement')
+    Message = apps.get_model('communication', 'Message')
+    MeetingPoll = apps.get_model('communication', 'MeetingPoll')
+    return {
+        'task': (TaskActivityLog.objects.select_related('task', 'actor'), _task_event),
+        'file': (ProjectFileActivityLog.objects.select_related('file', 'actor'), _file_event),
+        'announcement': (Announcement.objects.select_related('author'), _announcement_event),
+        'message': (Message.objects.select_related('sender', 'channel'), _message_event),
+        'meeting_poll': (MeetingPoll.objects.select_related('created_by'), _meeting_poll_event),
+    }
+
+
+def _build_event(source, builder, instance):
+    return ProjectEvent(source=source, source_id=instance.id, created_at=instance.created_at, **builder(instance))
+
+
+def record_project_event(source, instance):
+    """Append the event for a newly created source row."""
+    _, builder = event_sources()[source]
+    event = _build_event(source, builder, instance)
+    ProjectEvent.objects.bulk_create([event], ignore_conflicts=True)
+
+
+def backfill_project_events(batch_size=BACKFILL_BATCH_SIZE):
+    """Create events for source rows that do not have one yet; returns the number created."""
+    created = 0
+    for source, (queryset, builder) in event_sources().items():
+        existing_ids = ProjectEvent.objects.filter(source=source).values('source_id')
+        pending = queryset.exclude(id__in=existing_ids).order_by('id')
+        batch = []
+        for instance in pending.iterator(chunk_size=batch_size):
+            batch.append(_build_event(source, builder, instance))
+            if len(batch) >= batch_size:
+                ProjectEvent.objects.bulk_create(batch, ignore_conflicts=True)
+                created += len(batch)
+                batch = []
+        if batch:
+            ProjectEvent.objects.bulk_create(batch, ignore_conflicts=True)
+            created += len(batch)
+    return created
+
+
+def _day_start(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def _timeline_entry(event):
+    return {
+        'type': event.category,
+        'timestamp': event.created_at,
+        'label': event.label,
+        'project_id': event.project_id,
+        'source': event.source,
+        'source_id': event.source_id,
+        **event.payload,
+    }
+
+
+def project_activity_page(project_ids, activity_type='ALL', start_date=None, end_date=None, cursor=None, limit=TIMELINE_PAGE_SIZE):
+    """Return ``(entries, next_cursor)`` for the newest activity across ``project_ids``.
+
+    One query on ProjectEvent, filtered by date range and keyset cursor on
+    (created_at, id), so every page costs the same however far back it is.
+    """
+    categories = ACTIVITY_TYPE_CATEGORIES.get(activity_type, ACTIVITY_TYPE_CATEGORIES['ALL'])
+    limit = max(1, min(limit, MAX_TIMELINE_PAGE_SIZE))
+
+    events = ProjectEvent.objects.filter(project_id__in=project_ids, category__in=categories)
+    if start_date:
+        events = events.filter(created_at__gte=_day_start(start_date))
+    if end_date:
+        events = events.filter(created_at__lt=_day_start(end_date) + timedelta(days=1))
+    if cursor:
+        timestamp, event_id = decode_cursor(cursor)
+        events = events.filter(Q(created_at__lt=timestamp) | Q(created_at=timestamp, id__lt=event_id))
+
+    page = list(events.order_by('-created_at', '-id')[:limit + 1])
+    next_cursor = encode_cursor(page[limit - 1]) if len(page) > limit else None
+    return [_timeline_entry(event) for event in page[:limit]], next_cursor
@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 from pathlib import Path
 import os
+import sys
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -59,6 +60,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'projects.memberships.membership_cache_middleware',
 ]
 
 
@@ -97,6 +99,58 @@ DATABASES = {
 }
 
 
+# --- Cache Configuration ---
+# Local memory by default; set CACHE_DIR to share cached entries (e.g. project
+# metrics) between worker processes through the file-based backend.
+CACHE_DIR = os.getenv('CACHE_DIR')
+if CACHE_DIR:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': CACHE_DIR,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'uniteam-default',
+        }
+    }
+
+# Seconds a cached project metrics entry may live without being invalidated.
+PROJECT_METRICS_CACHE_TIMEOUT = int(os.getenv('PROJECT_METRICS_CACHE_TIMEOUT', '300'))
+
+# --- Real-time push (Server-Sent Events) ---
+# The in-process broker only reaches clients connected to the same ASGI
+# process; set REALTIME_REDIS_URL to fan out through a Redis-compatible server.
+REALTIME_REDIS_URL = os.getenv('REALTIME_REDIS_URL')
+if REALTIME_REDIS_URL:
+    REALTIME_BROKER = {
+        'BACKEND': 'communication.realtime.RedisBroker',
+        'OPTIONS': {'url': REALTIME_REDIS_URL},
+    }
+else:
+    REALTIME_BROKER = {
+        'BACKEND': 'communication.realtime.InProcessBroker',
+        'OPTIONS': {},
+    }
+# Seconds between keep-alive comments on an idle event stream.
+REALTIME_HEARTBEAT_SECONDS = int(os.getenv('REALTIME_HEARTBEAT_SECONDS', '15'))
+
+# --- Background jobs ---
+# 'thread' runs side effects on an in-process pool once the transaction
+# commits and resubmits failed jobs to the pool after their backoff; jobs
+# still queued when the process exits wait for `manage.py run_worker`.
+# 'worker' leaves them all for `manage.py run_worker`, whose notification
+# pushes only reach event streams when REALTIME_REDIS_URL is set.
+# 'sync' runs them inside the request and is pinned for the test suite.
+BACKGROUND_JOBS_MODE = os.getenv('BACKGROUND_JOBS_MODE', 'thread')
+if sys.argv[1:2] == ['test']:
+    BACKGROUND_JOBS_MODE = 'sync'
+BACKGROUND_JOBS_THREADS = int(os.getenv('BACKGROUND_JOBS_THREADS', '4'))
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
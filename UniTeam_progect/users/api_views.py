@@ -6,7 +6,7 @@ from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import authenticate
 from .models import CustomUser, StudentProfile, LecturerProfile, AdminProfile
 from .serializers import (
-    UserSerializer, UserRegistrationSerializer,
+    USER_PROFILE_PREFETCH_LOOKUPS, UserSerializer, UserRegistrationSerializer,
     StudentProfileUpdateSerializer, LecturerProfileUpdateSerializer
 )
 
@@ -76,7 +76,7 @@ class UserViewSet(viewsets.ModelViewSet):
     API endpoint for users
     Admin-only for list/create/update/delete
     """
-    queryset = CustomUser.objects.all()
+    queryset = CustomUser.objects.prefetch_related(*USER_PROFILE_PREFETCH_LOOKUPS)
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticated]
     
@@ -1,11 +1,12 @@
 from django.conf import settings
-from django.core.mail import send_mail
 from django.utils import timezone
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 
+from projects.outbox import enqueue_emails
+
 from .models import ContactTicket, PublicAnnouncement
 from .serializers import (
     ContactTicketCreateSerializer,
@@ -34,12 +35,11 @@ def contact_submit_view(request):
     )
 
     if support_email:
-        send_mail(
-            subject=subject,
-            message=body,
+        enqueue_emails(
+            subject,
+            body,
+            [support_email],
             from_email=getattr(settings, 'DEFAULT_FROM_EMAIL', support_email),
-            recipient_list=[support_email],
-            fail_silently=True,
         )
 
     ack_subject = f"UniTeam Contact Received ({ticket.reference})"
@@ -49,12 +49,11 @@ def contact_submit_view(request):
         f"Our team will get back to you as soon as possible.\n\n"
         f"Regards,\nUniTeam Support"
     )
-    send_mail(
-        subject=ack_subject,
-        message=ack_body,
+    enqueue_emails(
+        ack_subject,
+        ack_body,
+        [ticket.email],
         from_email=getattr(settings, 'DEFAULT_FROM_EMAIL', support_email or 'noreply@uniteam.local'),
-        recipient_list=[ticket.email],
-        fail_silently=True,
     )
 
     return Response(
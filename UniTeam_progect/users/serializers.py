@@ -27,6 +27,15 @@ class AdminProfileSerializer(serializers.ModelSerializer):
         fields = ['role_title', 'responsibilities']
 
 
+# Prefetch lookups that let UserSerializer render a user queryset without per-user profile and tag queries.
+USER_PROFILE_PREFETCH_LOOKUPS = (
+    'studentprofile__skills',
+    'lecturerprofile__courses_taught',
+    'lecturerprofile__research_areas',
+    'adminprofile',
+)
+
+
 class UserSerializer(serializers.ModelSerializer):
     studentprofile = StudentProfileSerializer(read_only=True)
     lecturerprofile = LecturerProfileSerializer(read_only=True)
@@ -41,6 +50,24 @@ class UserSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'is_approved']
 
 
+class UserSummarySerializer(serializers.ModelSerializer):
+    """Compact user reference for payloads that embed users; reads no profile or tag rows."""
+    full_name = serializers.CharField(source='get_full_name', read_only=True)
+
+    class Meta:
+        model = CustomUser
+        fields = ['id', 'username', 'first_name', 'last_name', 'full_name', 'avatar', 'role']
+        read_only_fields = fields
+
+
+class UserContactSerializer(UserSummarySerializer):
+    """User summary plus email, for team and invitation screens that show how to reach someone."""
+
+    class Meta(UserSummarySerializer.Meta):
+        fields = UserSummarySerializer.Meta.fields + ['email']
+        read_only_fields = fields
+
+
 class UserRegistrationSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, style={'input_type': 'password'})
     password2 = serializers.CharField(write_only=True, style={'input_type': 'password'}, label='Confirm Password')
@@ -1,9 +1,12 @@
 from django.contrib.auth import get_user_model
+from django.core import mail
 from django.urls import reverse
 from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APITestCase
 
+from projects.models import OutboundEmail
+
 from .models import ContactTicket, PublicAnnouncement
 
 
@@ -33,6 +36,8 @@ class PublicApiTests(APITestCase):
 		self.assertEqual(ticket.email, 'alex@example.com')
 		self.assertTrue(ticket.reference.startswith('UT-'))
 		self.assertIn('ticket', response.data)
+		self.assertEqual(len(mail.outbox), 0)
+		self.assertIn('alex@example.com', OutboundEmail.objects.values_list('to_email', flat=True))
 
 	def test_news_list_only_returns_published_items(self):
 		PublicAnnouncement.objects.create(